@@ -10,25 +10,24 @@ Phase encoding test for borealis paper
 """
 
 import copy
-import numpy as np
 
 import borealis_experiments.superdarn_common_fields as scf
+from borealis_experiments.tools import phase_encoding
 from utils.experiment_prototype import ExperimentPrototype
 
-
-def phase_encode(beam_iter, sequence_num, num_pulses):
-    return np.array(
-        [
-            125.73471064,
-            60.71636783,
-            120.78349373,
-            84.34937441,
-            135.91385006,
-            -160.56231581,
-            129.70333278,
-            -61.5067707,
-        ]
-    )
+# The same phases for every sequence
+phase_encode = phase_encoding.table_phase_offset(
+    [
+        125.73471064,
+        60.71636783,
+        120.78349373,
+        84.34937441,
+        135.91385006,
+        -160.56231581,
+        129.70333278,
+        -61.5067707,
+    ]
+)
 
 
 class BorealisPaper(ExperimentPrototype):
@@ -11,8 +11,11 @@ each frequency is run on each beam before switching to the next beam.
 :author: Keith Kotyk
 """
 
+import numpy as np
+
 from utils.experiment_prototype import ExperimentPrototype
 import borealis_experiments.superdarn_common_fields as scf
+from borealis_experiments.tools import restricted_ranges
 
 
 class FullScanStepMode(ExperimentPrototype):
@@ -24,60 +27,33 @@ class FullScanStepMode(ExperimentPrototype):
         step = 500
         all_steps = list(range(bottom, top, step))
 
+        restricted = restricted_ranges.RestrictedRanges.from_options(
+            scf.config, buffer_khz=25
+        )
+
         def move_freqs(direction):
             """
-            Move frequency steps that lay in restricted bands into unrestricted bands. A 25 kHz
-            buffer is used.
+            Move frequency steps that lay in restricted bands into unrestricted bands, in
+            multiples of 25 kHz. A 25 kHz buffer is used. Steps that cannot be moved within the
+            band are left as they are.
 
             :param      direction:  The direction of which to try move the frequency. 'up' or 'down'
             :type       direction:  str
             """
-
-            for i in range(len(all_steps)):
-                for restrict in scf.options.restricted_ranges:
-                    if all_steps[i] > (restrict[0] - 25) and all_steps[i] < (
-                        restrict[1] + 25
-                    ):
-                        moved = False
-                        while not moved:
-                            if direction == "up":
-                                if all_steps[i] + 25 > top:
-                                    break
-                                elif not (
-                                    (all_steps[i] + 25) > (restrict[0] - 25)
-                                    and (all_steps[i] + 25) < (restrict[1] + 25)
-                                ):
-                                    moved = True
-                                    all_steps[i] += 25
-                                else:
-                                    all_steps[i] += 25
-
-                            if direction == "down":
-                                if all_steps[i] - 25 < bottom:
-                                    break
-                                elif not (
-                                    (all_steps[i] - 25) > (restrict[0] - 25)
-                                    and (all_steps[i] - 25) < (restrict[1] + 25)
-                                ):
-                                    moved = True
-                                    all_steps[i] -= 25
-                                else:
-                                    all_steps[i] -= 25
+            moved = restricted.nearest_allowed(
+                all_steps, direction, step_khz=25, bounds=(bottom, top)
+            )
+            for i in np.flatnonzero(~np.isnan(moved)):
+                all_steps[i] = int(moved[i])
 
         # First try to move all restricted steps up. If not, then try move them down.
         move_freqs("up")
         move_freqs("down")
         all_steps = sorted(list(set(all_steps)))
 
-        if scf.IS_FORWARD_RADAR:
-            beams_to_use = scf.STD_16_FORWARD_BEAM_ORDER
-        else:
-            beams_to_use = scf.STD_16_REVERSE_BEAM_ORDER
-
-        if scf.options.site_id in ["cly", "rkn", "inv"]:
-            num_ranges = scf.POLARDARN_NUM_RANGES
-        if scf.options.site_id in ["sas", "pgr", "lab"]:
-            num_ranges = scf.STD_NUM_RANGES
+        # The scan direction and number of ranges come from the site config
+        beams_to_use = scf.STD_BEAM_ORDER
+        num_ranges = scf.STD_NUM_RANGES
 
         rxctrfreq = txctrfreq = sum(all_steps) / len(all_steps)
 
@@ -90,7 +66,7 @@ class FullScanStepMode(ExperimentPrototype):
                 "num_ranges": num_ranges,
                 "first_range": scf.STD_FIRST_RANGE,
                 "intt": 3500,  # duration of an integration, in ms
-                "beam_angle": scf.STD_16_BEAM_ANGLE,
+                "beam_angle": scf.STD_BEAM_ANGLES,
                 "rx_beam_order": beams_to_use,
                 "tx_beam_order": beams_to_use,
                 "scanbound": [
@@ -12,16 +12,12 @@ Last scheduled 2022-02-07
 """
 
 import copy
-import numpy as np
 
 import borealis_experiments.superdarn_common_fields as scf
+from borealis_experiments.tools import phase_encoding
 from utils.experiment_prototype import ExperimentPrototype
 
 
-def phase_encode(beam_iter, sequence_num, num_pulses):
-    return np.random.uniform(-180.0, 180, num_pulses)
-
-
 class ImptTest(ExperimentPrototype):
     cpid = 3313
 
@@ -40,7 +36,10 @@ class ImptTest(ExperimentPrototype):
         }
 
         impt_slice = copy.deepcopy(default_slice)
-        impt_slice["pulse_phase_offset"] = phase_encode
+        # Seeded phases for a whole averaging period, reproducible for decoding
+        impt_slice["pulse_phase_offset"] = phase_encoding.slice_phase_offset(
+            impt_slice, seed=self.cpid
+        )
 
         super().__init__(comment_string="Reimer IMPT Experiment")
 
@@ -0,0 +1,66 @@
+#!/usr/bin/python
+
+"""
+array_factor_sweep
+~~~~~~~~~~~~~~~~~~
+Times a full site sweep of the array factor evaluator: full_fov.rx_phase_pattern and
+easy_widebeam at all 12 precomputed widebeam frequencies, 16 beams and 3600 azimuths.
+
+Usage: python3 -m borealis_experiments.benchmarks.array_factor_sweep [--repeats N]
+
+:copyright: 2026 SuperDARN Canada
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+import borealis_experiments.superdarn_common_fields as scf
+from borealis_experiments import full_fov
+from borealis_experiments.tools import array_factor as af
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeats", type=int, default=10)
+    args = parser.parse_args()
+
+    freqs_khz = sorted(scf.__widebeam_degrees__[16].keys())
+    antenna_locations = af.linear_array(16)
+    azimuths_deg = np.linspace(-90, 90, 3600)
+
+    for name, get_weights in [
+        (
+            "rx full_fov.rx_phase_pattern",
+            lambda: af.rx_pattern_weights(
+                full_fov.rx_phase_pattern,
+                freqs_khz,
+                scf.STD_BEAM_ANGLES,
+                antenna_locations,
+            ),
+        ),
+        (
+            "tx easy_widebeam",
+            lambda: af.tx_pattern_weights(
+                scf.easy_widebeam, freqs_khz, antenna_locations
+            ),
+        ),
+    ]:
+        times = []
+        for _ in range(args.repeats):
+            start = time.perf_counter()
+            weights = get_weights()
+            result = af.array_factor(
+                weights, freqs_khz, antenna_locations[:, 0], azimuths_deg
+            )
+            af.beam_metrics(result, azimuths_deg)
+            times.append(time.perf_counter() - start)
+        print(
+            f"{name}: {result.shape[0]} freqs x {result.shape[1]} beams x {result.shape[2]} "
+            f"azimuths, best {min(times) * 1e3:.1f} ms, median {np.median(times) * 1e3:.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/python
+
+"""
+beamformer
+~~~~~~~~~~
+Times the batched beamformer on one averaging period of decimated samples from 20 antennas,
+forming 1, 16 and 32 simultaneous receive beams, against forming the same beams one at a time.
+Both the 45 km and 15 km range layouts are timed.
+
+Usage: python3 -m borealis_experiments.benchmarks.beamformer [--repeats N]
+
+:copyright: 2026 SuperDARN Canada
+"""
+
+import argparse
+import math
+import time
+
+import numpy as np
+
+import borealis_experiments.superdarn_common_fields as scf
+from borealis_experiments.tools import array_factor, beamformer, timing_simulator
+
+LAYOUTS = {
+    # name: (pulse_len in us, num_ranges, output rate in Hz)
+    "45 km": (scf.PULSE_LEN_45KM, 75, 10e3 / 3),
+    "15 km": (scf.PULSE_LEN_15KM, 225, 10e3),
+}
+
+
+def _best_time(fn, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--freq", type=int, default=scf.COMMON_MODE_FREQ_1, help="kHz")
+    args = parser.parse_args()
+
+    config = scf.load_site().config
+    main_locations, intf_locations = array_factor.site_arrays(config)
+    rng = np.random.default_rng(0)
+
+    for layout, (pulse_len, num_ranges, output_rate_hz) in LAYOUTS.items():
+        sequence_us = timing_simulator.sequence_duration_us(
+            scf.SEQUENCE_7P,
+            scf.TAU_SPACING_7P,
+            pulse_len,
+            num_ranges,
+            scf.STD_FIRST_RANGE,
+        )
+        num_samples = math.ceil(sequence_us * 1e-6 * output_rate_hz)
+        num_sequences = int(scf.INTT_MS * 1e3 // sequence_us)
+        num_antennas = len(main_locations) + len(intf_locations)
+        samples = rng.standard_normal(
+            (num_antennas, num_sequences, 2 * num_samples), dtype=np.float32
+        ).view(np.complex64)
+        print(
+            f"{layout}: {num_antennas} antennas, {num_sequences} sequences of "
+            f"{num_samples} samples"
+        )
+
+        for num_beams in (1, 16, 32):
+            beam_angle = np.linspace(-24.3, 24.3, num_beams) if num_beams > 1 else [0.0]
+            main_weights = beamformer.pattern_weights(
+                None, beam_angle, args.freq, main_locations
+            )
+            intf_weights = beamformer.pattern_weights(
+                None, beam_angle, args.freq, intf_locations
+            )
+            batched = beamformer.Beamformer(
+                main_weights, intf_weights, num_samples, num_sequences
+            )
+            single = [
+                beamformer.Beamformer(
+                    main_weights[[beam]],
+                    intf_weights[[beam]],
+                    num_samples,
+                    num_sequences,
+                )
+                for beam in range(num_beams)
+            ]
+
+            batched_s = _best_time(lambda: batched.form(samples), args.repeats)
+            single_s = _best_time(
+                lambda: [bf.form(samples) for bf in single], args.repeats
+            )
+            print(
+                f"  {num_beams:>2} beams: batched {batched_s * 1e3:>7.2f} ms "
+                f"({batched_s / num_sequences * 1e6:>6.1f} us/sequence), one beam at a time "
+                f"{single_s * 1e3:>7.2f} ms, {single_s / batched_s:.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
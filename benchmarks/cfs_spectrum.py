@@ -0,0 +1,114 @@
+#!/usr/bin/python
+
+"""
+cfs_spectrum
+~~~~~~~~~~~~
+Times the clear frequency search engine on the minimum 10 ms capture: one 300 kHz wide search, as
+in tests/cfs.py, and the three CONCURRENT CFS slices of archive/cfs_scan.py searched from one
+5 MHz capture. The captures are noise plus interfering tones across every CFS range except for a
+gap in each, and the picked frequencies are checked against the tones.
+
+Each capture is searched as one combined channel, e.g. the main array summed towards boresight,
+and as 20 channels of separate antennas, whose spectra are averaged. Twenty 5 MHz channels take
+longer than the 10 ms capture itself, so wide captures should be combined before the search.
+
+Usage: python3 -m borealis_experiments.benchmarks.cfs_spectrum [--repeats N]
+
+:copyright: 2026 SuperDARN Canada
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+import borealis_experiments.superdarn_common_fields as scf
+from borealis_experiments.tools import cfs_spectrum
+
+CASES = {
+    # name: ({slice_id: cfs_range in kHz}, capture sample rate in Hz)
+    "300 kHz search": ({0: [12000, 12300]}, 5e6 / 15),
+    "cfs_scan, 3 slices": (
+        {0: [12055, 12245], 1: [11500, 11700], 2: [11000, 11100]},
+        5e6,
+    ),
+}
+
+GAP_KHZ = 12
+TONE_SPACING_KHZ = 2
+TONE_AMPLITUDE = 0.3
+
+
+def _best_time(fn, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def synthetic_capture(engine, cfs_ranges, num_samples, num_channels, rng):
+    """
+    Returns noise with tones every TONE_SPACING_KHZ across each CFS range, leaving a gap of GAP_KHZ
+    above the middle of each range, and the tone frequencies of each range.
+    """
+    time_s = np.arange(num_samples) / engine.sample_rate_hz
+    tones = np.zeros(num_samples, dtype=np.complex64)
+    tone_freqs = {}
+    for slice_id, (low, high) in cfs_ranges.items():
+        freqs = np.arange(low, high, TONE_SPACING_KHZ)
+        freqs = freqs[np.abs(freqs - (low + high) / 2 - GAP_KHZ) > GAP_KHZ / 2]
+        tone_freqs[slice_id] = freqs
+        offsets_hz = (freqs - engine.center_freq_khz) * 1e3
+        tones += TONE_AMPLITUDE * np.exp(2j * np.pi * np.outer(offsets_hz, time_s)).sum(
+            axis=0
+        )
+    noise = rng.standard_normal((num_channels, 2 * num_samples), dtype=np.float32)
+    return noise.view(np.complex64) + tones, tone_freqs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=cfs_spectrum.MIN_CFS_DURATION_MS,
+        help="Length of the capture in ms",
+    )
+    args = parser.parse_args()
+    rng = np.random.default_rng(0)
+    channel_khz = 1e3 / scf.PULSE_LEN_45KM
+
+    for name, (cfs_ranges, sample_rate_hz) in CASES.items():
+        engine = cfs_spectrum.CfsEngine(
+            cfs_ranges,
+            {slice_id: channel_khz for slice_id in cfs_ranges},
+            sample_rate_hz=sample_rate_hz,
+        )
+        num_samples = int(args.duration * 1e-3 * sample_rate_hz)
+        print(
+            f"{name}: {args.duration:g} ms at {sample_rate_hz * 1e-3:.0f} kHz, "
+            f"{engine.num_fft}-point segments, {engine.centers.size} candidate channels"
+        )
+        for num_channels in (1, 20):
+            samples, tone_freqs = synthetic_capture(
+                engine, cfs_ranges, num_samples, num_channels, rng
+            )
+            result = engine.search(samples)
+            search_s = _best_time(lambda: engine.search(samples), args.repeats)
+            picked = ", ".join(f"{freq} kHz" for freq, _ in result.values())
+            # Clear if no tone falls inside the picked channel
+            clear = all(
+                np.abs(tone_freqs[slice_id] - freq).min() > channel_khz / 2
+                for slice_id, (freq, _) in result.items()
+            )
+            print(
+                f"  {num_channels:>2} channels: {search_s * 1e3:>6.2f} ms, "
+                f"{'clear' if clear else 'NOT CLEAR'}: {picked}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/python
+
+"""
+decimation_schemes
+~~~~~~~~~~~~~~~~~~
+Reports the estimated compute cost of every registered decimation scheme and of the archived test
+schemes: complex MACs per second, output rate, intermediate buffer memory per sequence and the
+estimated GPU and CPU load for the full receive array. The CPU load is measured by running a
+polyphase reference decimator on synthetic 5 MHz data.
+
+Usage: python3 -m borealis_experiments.benchmarks.decimation_schemes [--antennas N] [--freqs N]
+
+:copyright: 2026 SuperDARN Canada
+"""
+
+import argparse
+
+from borealis_experiments.archive import test_decimation_schemes
+from borealis_experiments.tools import decimation_cost
+from borealis_experiments.tools import decimation_schemes
+
+
+def all_schemes():
+    """Returns a dictionary of {name: DecimationScheme} for every scheme to benchmark."""
+    schemes = {
+        name: decimation_schemes.decimation_scheme(name)
+        for name in decimation_schemes.SCHEMES
+    }
+    for i in range(6, 10):
+        schemes[f"archive/test_scheme_{i}"] = getattr(
+            test_decimation_schemes, f"create_test_scheme_{i}"
+        )()
+    return schemes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--antennas", type=int, default=20, help="Number of receive antennas"
+    )
+    parser.add_argument(
+        "--freqs", type=int, default=1, help="Number of receive frequencies"
+    )
+    parser.add_argument(
+        "--sequence-s",
+        type=float,
+        default=0.1,
+        help="Length of data per sequence, in seconds",
+    )
+    parser.add_argument(
+        "--gpu-macs",
+        type=float,
+        default=decimation_cost.DEFAULT_GPU_MACS_PER_S,
+        help="Sustained complex MAC rate of the GPU",
+    )
+    parser.add_argument(
+        "--no-measure",
+        action="store_true",
+        help="Skip running the CPU reference decimator",
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'scheme':<26} {'taps':>16} {'output (Hz)':>11} {'GMAC/s':>8} {'buffers (MB)':>12} "
+        f"{'GPU load':>8} {'CPU load':>8}"
+    )
+    for name, scheme in all_schemes().items():
+        cost = decimation_cost.scheme_cost(
+            scheme,
+            num_antennas=args.antennas,
+            num_freqs=args.freqs,
+            sequence_duration_s=args.sequence_s,
+        )
+        gpu_load = decimation_cost.estimated_load(cost, args.gpu_macs)
+        cpu_load = "-"
+        if not args.no_measure:
+            measured = decimation_cost.measure_throughput(
+                scheme, num_antennas=args.antennas
+            )
+            cpu_load = decimation_cost.estimated_load(cost, measured["macs_per_s"])
+            cpu_load = f"{cpu_load:.2f}"
+        taps = "/".join(str(stage["num_taps"]) for stage in cost["stages"])
+        print(
+            f"{name:<26} {taps:>16} {cost['output_rate']:>11.1f} "
+            f"{cost['macs_per_s'] / 1e9:>8.3f} {cost['buffer_bytes'] / 1e6:>12.1f} "
+            f"{gpu_load:>8.4f} {cpu_load:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
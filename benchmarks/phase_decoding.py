@@ -0,0 +1,207 @@
+#!/usr/bin/python
+
+"""
+phase_decoding
+~~~~~~~~~~~~~~
+Times the decoding of phase-encoded sequences offline, for the 7 and 8 pulse sequences and the 11
+pulse sequence of tauscan, with the 45 km and 15 km range layouts. For each, one averaging period
+of beamformed samples is synthesized with the phases of the slice's pulse_phase_offset function,
+then decoded and correlated in one batch.
+
+The echoes are the same in every sequence apart from a Doppler shift, so without phase encoding the
+self-clutter, i.e. the echoes of the other pulses of the sequence, adds the same bias to every
+sequence. The residual error is the RMS difference between the correlations and the expected ACF
+over every range and non-zero lag, relative to the RMS of the expected ACF. It is shown for the
+decoded sequences and for the same echoes sent without encoding.
+
+Usage: python3 -m borealis_experiments.benchmarks.phase_decoding [--repeats N]
+
+:copyright: 2026 SuperDARN Canada
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+import borealis_experiments.superdarn_common_fields as scf
+from borealis_experiments import tauscan
+from borealis_experiments.tools import (
+    correlator,
+    lag_tables,
+    phase_encoding,
+    timing_simulator,
+)
+
+LAYOUTS = {
+    # name: (pulse_len in us, num_ranges, output rate in Hz)
+    "45 km": (scf.PULSE_LEN_45KM, scf.STD_NUM_RANGES, 10e3 / 3),
+    "15 km": (scf.PULSE_LEN_15KM, 225, 10e3),
+}
+
+DOPPLER_HZ = 20.0
+SNR_DB = 10.0
+
+
+def _best_time(fn, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def synthesize(exp_slice, indices, phases, output_rate_hz, rng):
+    """
+    Returns beamformed samples of one beam, shape [num_sequences, 1, num_samples], with an echo of
+    every pulse from every range gate, and the expected ACF, shape [1, num_ranges, num_lags].
+    """
+    field = timing_simulator._field
+    pulse_sequence = field(exp_slice, "pulse_sequence")
+    tau_s = field(exp_slice, "tau_spacing") * 1e-6
+    sequence_s = timing_simulator.slice_sequence_us(exp_slice) * 1e-6
+    num_sequences = phases.shape[0]
+    num_samples = int(indices.max()) + 1
+    range_samples = indices[0, :, 0]
+    amplitudes = rng.standard_normal(range_samples.size) + 1j * rng.standard_normal(
+        range_samples.size
+    )
+    amplitudes /= np.sqrt(np.mean(np.abs(amplitudes) ** 2))
+
+    noise_scale = np.sqrt(10 ** (-SNR_DB / 10) / 2)
+    samples = noise_scale * (
+        rng.standard_normal((num_sequences, 1, num_samples))
+        + 1j * rng.standard_normal((num_sequences, 1, num_samples))
+    )
+    encoding = np.exp(1j * np.deg2rad(phases))
+    sequence_start_s = np.arange(num_sequences) * sequence_s
+    tau_samples = tau_s * output_rate_hz
+    for pulse, position in enumerate(pulse_sequence):
+        echo_samples = range_samples + int(round(position * tau_samples))
+        keep = echo_samples < num_samples
+        doppler = np.exp(
+            2j * np.pi * DOPPLER_HZ * (sequence_start_s + position * tau_s)
+        )
+        samples[:, 0, echo_samples[keep]] += (encoding[:, pulse] * doppler)[
+            :, np.newaxis
+        ] * amplitudes[keep]
+
+    lag_index = lag_tables.lag_index(pulse_sequence)
+    lag_s = (lag_index[1] - lag_index[0]) * tau_s
+    expected = np.abs(amplitudes[:, np.newaxis]) ** 2 * np.exp(
+        2j * np.pi * DOPPLER_HZ * lag_s
+    )
+    return samples.astype(np.complex64), expected[np.newaxis]
+
+
+def residual_error(correlations, expected, lags):
+    """Returns the RMS error of the correlations at some lags, relative to the expected RMS."""
+    error = correlations[..., lags] - expected[..., lags]
+    return np.sqrt(
+        np.mean(np.abs(error) ** 2) / np.mean(np.abs(expected[..., lags]) ** 2)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    tauscan_slice = tauscan.Tauscan().slice_dict[0]
+    field = timing_simulator._field
+    sequences = {
+        "7P": (scf.SEQUENCE_7P, scf.TAU_SPACING_7P),
+        "8P": (scf.SEQUENCE_8P, scf.TAU_SPACING_8P),
+        "tauscan 11P": (
+            field(tauscan_slice, "pulse_sequence"),
+            field(tauscan_slice, "tau_spacing"),
+        ),
+    }
+
+    for layout, (pulse_len, num_ranges, output_rate_hz) in LAYOUTS.items():
+        print(f"{layout}: {num_ranges} ranges at {output_rate_hz:.0f} Hz")
+        for name, (pulse_sequence, tau_spacing) in sequences.items():
+            exp_slice = {
+                "pulse_sequence": pulse_sequence,
+                "tau_spacing": tau_spacing,
+                "pulse_len": pulse_len,
+                "num_ranges": num_ranges,
+                "first_range": scf.STD_FIRST_RANGE,
+                "intt": scf.INTT_MS,
+                "acf": True,
+            }
+            exp_slice["pulse_phase_offset"] = phase_encoding.slice_phase_offset(
+                exp_slice, seed=args.seed
+            )
+            indices = correlator.gather_indices(
+                pulse_sequence,
+                tau_spacing,
+                pulse_len,
+                num_ranges,
+                scf.STD_FIRST_RANGE,
+                output_rate_hz=output_rate_hz,
+            )
+            lag_index = lag_tables.lag_index(pulse_sequence)
+            acf = correlator.Correlator(
+                indices, pulse_index=np.searchsorted(pulse_sequence, lag_index)
+            )
+            lags = lag_index[0] != lag_index[1]
+
+            num_sequences = exp_slice["pulse_phase_offset"].table.shape[0]
+            sequence_nums = np.arange(num_sequences)
+            num_pulses = len(pulse_sequence)
+            phases = phase_encoding.sequence_phases(
+                exp_slice["pulse_phase_offset"],
+                np.zeros(num_sequences, dtype=int),
+                sequence_nums,
+                num_pulses,
+            )
+            # The same echoes and noise, with and without encoding
+            encoded, expected = synthesize(
+                exp_slice,
+                indices,
+                phases,
+                output_rate_hz,
+                np.random.default_rng(args.seed),
+            )
+            plain, _ = synthesize(
+                exp_slice,
+                indices,
+                np.zeros_like(phases),
+                output_rate_hz,
+                np.random.default_rng(args.seed),
+            )
+
+            def decode():
+                acf.reset()
+                acf.accumulate(
+                    encoded,
+                    phases=phase_encoding.sequence_phases(
+                        exp_slice["pulse_phase_offset"],
+                        np.zeros(num_sequences, dtype=int),
+                        sequence_nums,
+                        num_pulses,
+                    ),
+                )
+                return acf.averages()["acf"]
+
+            def correlate():
+                acf.reset()
+                acf.accumulate(plain)
+                return acf.averages()["acf"]
+
+            decoded_s = _best_time(decode, args.repeats)
+            plain_s = _best_time(correlate, args.repeats)
+            print(
+                f"  {name:<12} {num_sequences:>3} sequences: decode + correlate "
+                f"{num_sequences / decoded_s:>9.0f} sequences/s, correlate only "
+                f"{num_sequences / plain_s:>9.0f} sequences/s, residual error decoded "
+                f"{residual_error(decode(), expected, lags):.3f}, unencoded "
+                f"{residual_error(correlate(), expected, lags):.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
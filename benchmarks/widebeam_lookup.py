@@ -0,0 +1,115 @@
+#!/usr/bin/python
+
+"""
+widebeam_lookup
+~~~~~~~~~~~~~~~
+Times easy_widebeam() for every frequency and antenna count in the precomputed widebeam store, for
+the sounding frequencies of the site, and for frequencies outside the store. Frequencies outside
+the store are solved by tools.widebeam_solver before timing, as they would be ahead of time on a
+radar, so their first call only reads the disk cache. They are solved into a temporary cache that
+is removed afterwards, leaving the cache read by radar runs untouched. Later lookups should take
+the same time regardless of frequency, since every pattern is built once and then returned as a
+read-only view.
+
+Usage: python3 -m borealis_experiments.benchmarks.widebeam_lookup [--calls N]
+
+:copyright: 2026 SuperDARN Canada
+"""
+
+import argparse
+import os
+import tempfile
+import timeit
+
+import numpy as np
+
+import borealis_experiments.superdarn_common_fields as scf
+from borealis_experiments.tools import widebeam_solver
+
+# Frequencies in kHz that are not in the precomputed store
+SOLVER_FREQS_KHZ = (9000, 11700, 14500, 17000)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--calls", type=int, default=100000, help="Calls per (frequency, antenna count)"
+    )
+    args = parser.parse_args()
+    # Solve into a temporary cache, so the benchmark does not add to the cache that radar runs read
+    cache_root = tempfile.TemporaryDirectory(prefix="widebeam_lookup_")
+    os.environ["BOREALIS_EXPERIMENTS_CACHE"] = cache_root.name
+
+    num_antennas = scf.config.main_antenna_count
+    antenna_locations = np.zeros((num_antennas, 3))
+    antenna_locations[:, 0] = np.arange(num_antennas) * 15.24
+
+    table_freqs = sorted({freq_khz for freq_khz, _ in scf.__widebeam_phases__})
+    groups = {
+        "table": table_freqs,
+        "sounding": sorted(scf.SOUNDING_FREQS),
+        "solver": [
+            freq
+            for freq in SOLVER_FREQS_KHZ
+            if freq not in table_freqs and freq not in scf.SOUNDING_FREQS
+        ],
+    }
+
+    # easy_widebeam() never solves, so frequencies outside the store are solved first, as they
+    # would be ahead of time with the widebeam_solver command line
+    solved_freqs = sorted(
+        {
+            freq
+            for freq in groups["sounding"] + groups["solver"]
+            if freq not in table_freqs
+        }
+    )
+    for num_tx in sorted(scf.__widebeam_degrees__):
+        if num_tx <= num_antennas and solved_freqs:
+            widebeam_solver.cached_widebeam_phases(
+                solved_freqs,
+                scf.config.num_beams * scf.config.beam_sep,
+                scf.config.site_id,
+                num_antennas=num_tx,
+            )
+
+    print(
+        f"{'group':>8} {'freq (kHz)':>10} {'source':>6} {'antennas':>8} "
+        f"{'first call (us)':>16} {'per call (ns)':>14}"
+    )
+    per_call = {}
+    for group, freqs in groups.items():
+        per_call[group] = []
+        for freq_khz in freqs:
+            for num_tx in sorted(scf.__widebeam_degrees__):
+                if num_tx > num_antennas:
+                    continue
+                tx_antennas = list(range(num_tx))
+                source = (
+                    "table"
+                    if (freq_khz, num_tx) in scf.__widebeam_phases__
+                    else "solver"
+                )
+
+                def lookup():
+                    return scf.easy_widebeam(freq_khz, tx_antennas, antenna_locations)
+
+                first_call_s = timeit.timeit(lookup, number=1)
+                call_ns = timeit.timeit(lookup, number=args.calls) / args.calls * 1e9
+                per_call[group].append(call_ns)
+                print(
+                    f"{group:>8} {freq_khz:>10} {source:>6} {num_tx:>8} "
+                    f"{first_call_s * 1e6:>16.1f} {call_ns:>14.0f}"
+                )
+
+    print()
+    for group, times in per_call.items():
+        times = np.array(times)
+        print(
+            f"{group:>8} per call: min {times.min():.0f} ns, max {times.max():.0f} ns, "
+            f"max/min {times.max() / times.min():.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -14,45 +14,10 @@ frequency from another radar to listen in on, also across the entire FOV simulta
 
 import copy
 import borealis_experiments.superdarn_common_fields as scf
-from utils import decimation_scheme as dm
+from borealis_experiments.tools import decimation_schemes
 from utils.experiment_prototype import ExperimentPrototype
 
 
-def two_stage_filter():
-    """
-    Two-stage kaiser window scheme.
-
-    Works well with the following parameters:
-    sample_rate = 5e6
-    dm_rate = [30, 50]
-    transition_width = [150e3, 25e3]
-    cutoff_hz = [10e3, 5e3]
-    ripple_db = [115, 50]
-    """
-    sample_rate = 5e6  # 5 MHz
-    dm_rate = [30, 50]  # downsampling rates after filters
-    transition_width = [150e3, 30e3]  # transition from passband to stopband
-    cutoff_hz = [10e3, 5e3]  # bandwidth for output of filter
-    ripple_db = [115, 50]  # dB between passband and stopband
-    scaling_factors = [1000.0, 10000.0]  # multiplicative factors for each filter stage
-
-    dm_rate_so_far = 1
-    stages = []
-    for i in range(2):
-        rate = sample_rate / dm_rate_so_far
-        taps = scaling_factors[i] * dm.create_firwin_filter_by_attenuation(
-            rate, transition_width[i], cutoff_hz[i], ripple_db[i]
-        )
-        stages.append(dm.DecimationStage(i, rate, dm_rate[i], taps.tolist()))
-        dm_rate_so_far *= dm_rate[i]
-
-    scheme = dm.DecimationScheme(
-        sample_rate, sample_rate / dm_rate_so_far, stages=stages
-    )
-
-    return scheme
-
-
 class ConcurrentBistatic(ExperimentPrototype):
     """
     Widebeam operating mode with optional concurrent bistatic listening.
@@ -91,7 +56,9 @@ class ConcurrentBistatic(ExperimentPrototype):
             "freq": common_freqs.get(scf.config.site_id)[0],
             "scanbound": scf.STD_SCANBOUND,
             "wait_for_first_scanbound": False,
-            "decimation_scheme": two_stage_filter(),
+            "decimation_scheme": decimation_schemes.decimation_scheme(
+                "two_stage_kaiser"
+            ),
             "align_sequences": True,  # align start of sequence to tenths of a second
         }
         slice_1 = None
@@ -16,13 +16,15 @@ import copy
 import numpy as np
 
 import borealis_experiments.superdarn_common_fields as scf
+from borealis_experiments.tools import widebeam_solver
 from utils.experiment_prototype import ExperimentPrototype
 
 
 def sixty_deg_widebeam(frequency_khz, tx_antennas, antenna_locations):
     """
     Returns phases in degrees for each antenna in the main array that will generate a wide beam pattern
-    that illuminates a 60-degree FOV. Only 16 antennas at common frequencies is supported.
+    that illuminates a 60-degree FOV. Only 16 antennas is supported. Frequencies other than the common
+    frequencies below must be solved ahead of time with tools.widebeam_solver.
     """
     antenna_spacing_m = antenna_locations[1, 0] - antenna_locations[0, 0]
     if not np.isclose(antenna_spacing_m, 15.24):
@@ -160,6 +162,22 @@ def sixty_deg_widebeam(frequency_khz, tx_antennas, antenna_locations):
             all_phases = np.concatenate((first_half, np.flip(first_half)))
             phases[tx_antennas] = np.exp(1j * np.deg2rad(all_phases))
             return phases.reshape(1, num_antennas) * 0.999999
+        if (
+            widebeam_solver.MIN_FREQ_KHZ
+            <= frequency_khz
+            <= widebeam_solver.MAX_FREQ_KHZ
+        ):
+            all_phases = widebeam_solver.stored_widebeam_phases(
+                frequency_khz, 60.0, scf.config.site_id, num_antennas=num_antennas
+            )
+            if all_phases is None:
+                raise ValueError(
+                    f"No 60-degree widebeam phases for {frequency_khz} kHz. Solve them ahead "
+                    f"of time with: python3 -m borealis_experiments.tools.widebeam_solver "
+                    f"{scf.config.site_id} 60 {frequency_khz}"
+                )
+            phases[tx_antennas] = np.exp(1j * np.deg2rad(all_phases))
+            return phases.reshape(1, num_antennas) * 0.999999
 
     # If you get this far, the number of antennas or frequency is not supported for this function.
     raise ValueError(
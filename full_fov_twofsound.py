@@ -12,268 +12,231 @@ the full FOV, and receives on all antennas. Two frequencies are used, switching
 
 import copy
 
-import numpy as np
-
-from utils.signals import get_phase_shift
 import borealis_experiments.superdarn_common_fields as scf
+from borealis_experiments.tools import rx_patterns
 from utils.experiment_prototype import ExperimentPrototype
 
+# Receive beam directions in degrees for each frequency in kHz, adjusted for the widebeam transmit pattern
+ADJUSTED_RX_BEAM_DIRECTIONS = {
+    10400: [
+        -25.0,
+        -21.2,
+        -18.3,
+        -15.5,
+        -11.4,
+        -7.7,
+        -5.0,
+        -2.1,
+        2.1,
+        5.0,
+        7.7,
+        11.4,
+        15.5,
+        18.3,
+        21.2,
+        25.0,
+    ],
+    10500: [
+        -24.8,
+        -20.7,
+        -17.9,
+        -14.8,
+        -11.8,
+        -8.6,
+        -4.9,
+        -1.9,
+        1.9,
+        4.9,
+        8.6,
+        11.8,
+        14.8,
+        17.9,
+        20.7,
+        24.8,
+    ],
+    10600: [
+        -25.0,
+        -20.7,
+        -17.8,
+        -14.9,
+        -11.9,
+        -8.5,
+        -4.8,
+        -1.9,
+        1.9,
+        4.8,
+        8.5,
+        11.9,
+        14.9,
+        17.8,
+        20.7,
+        25.0,
+    ],
+    10700: [
+        -24.5,
+        -21.4,
+        -18.1,
+        -15.3,
+        -11.5,
+        -7.7,
+        -5.1,
+        -2.1,
+        2.1,
+        5.1,
+        7.7,
+        11.5,
+        15.3,
+        18.1,
+        21.4,
+        24.5,
+    ],
+    10800: [
+        -25.0,
+        -20.9,
+        -17.8,
+        -15.3,
+        -11.6,
+        -7.8,
+        -4.8,
+        -2.1,
+        2.1,
+        4.8,
+        7.8,
+        11.6,
+        15.3,
+        17.8,
+        20.9,
+        25.0,
+    ],
+    10900: [
+        -24.9,
+        -20.9,
+        -17.7,
+        -15.3,
+        -11.7,
+        -7.8,
+        -4.7,
+        -2.0,
+        2.0,
+        4.7,
+        7.8,
+        11.7,
+        15.3,
+        17.7,
+        20.9,
+        25.0,
+    ],
+    12200: [
+        -24.4,
+        -21.5,
+        -17.7,
+        -14.2,
+        -11.5,
+        -8.2,
+        -4.8,
+        -1.8,
+        1.8,
+        4.8,
+        8.2,
+        11.5,
+        14.2,
+        17.7,
+        21.5,
+        24.4,
+    ],
+    12300: [
+        -24.2,
+        -21.5,
+        -17.5,
+        -14.4,
+        -11.5,
+        -7.9,
+        -5.0,
+        -2.1,
+        2.1,
+        5.0,
+        7.9,
+        11.5,
+        14.4,
+        17.5,
+        21.5,
+        24.2,
+    ],
+    12500: [
+        -24.3,
+        -21.4,
+        -17.8,
+        -14.1,
+        -11.4,
+        -8.2,
+        -4.9,
+        -1.8,
+        1.8,
+        4.9,
+        8.2,
+        11.4,
+        14.1,
+        17.8,
+        21.4,
+        24.3,
+    ],
+    13000: [
+        -23.9,
+        -21.5,
+        -18.4,
+        -14.8,
+        -11.4,
+        -7.8,
+        -4.6,
+        -2.4,
+        2.4,
+        4.6,
+        7.8,
+        11.4,
+        14.8,
+        18.4,
+        21.5,
+        23.9,
+    ],
+    13100: [
+        -24.5,
+        -21.0,
+        -18.4,
+        -13.7,
+        -11.1,
+        -8.5,
+        -4.7,
+        -1.5,
+        1.5,
+        4.7,
+        8.5,
+        11.1,
+        13.7,
+        18.4,
+        21.0,
+        24.5,
+    ],
+    13200: [
+        -24.8,
+        -21.6,
+        -18.4,
+        -14.0,
+        -11.7,
+        -8.4,
+        -4.6,
+        -2.2,
+        2.2,
+        4.6,
+        8.4,
+        11.7,
+        14.0,
+        18.4,
+        21.6,
+        24.8,
+    ],
+}
 
-def rx_phase_pattern(beam_angle, freq_khz, antenna_locations):
-    # Chebyshev 30-dB window
-    window = [
-        0.2910,
-        0.3173,
-        0.4557,
-        0.6018,
-        0.7424,
-        0.8637,
-        0.9528,
-        1.0000,
-        1.0000,
-        0.9528,
-        0.8637,
-        0.7424,
-        0.6018,
-        0.4557,
-        0.3173,
-        0.2910,
-    ]
-
-    adjusted_rx_beam_directions = {
-        10400: [
-            -25.0,
-            -21.2,
-            -18.3,
-            -15.5,
-            -11.4,
-            -7.7,
-            -5.0,
-            -2.1,
-            2.1,
-            5.0,
-            7.7,
-            11.4,
-            15.5,
-            18.3,
-            21.2,
-            25.0,
-        ],
-        10500: [
-            -24.8,
-            -20.7,
-            -17.9,
-            -14.8,
-            -11.8,
-            -8.6,
-            -4.9,
-            -1.9,
-            1.9,
-            4.9,
-            8.6,
-            11.8,
-            14.8,
-            17.9,
-            20.7,
-            24.8,
-        ],
-        10600: [
-            -25.0,
-            -20.7,
-            -17.8,
-            -14.9,
-            -11.9,
-            -8.5,
-            -4.8,
-            -1.9,
-            1.9,
-            4.8,
-            8.5,
-            11.9,
-            14.9,
-            17.8,
-            20.7,
-            25.0,
-        ],
-        10700: [
-            -24.5,
-            -21.4,
-            -18.1,
-            -15.3,
-            -11.5,
-            -7.7,
-            -5.1,
-            -2.1,
-            2.1,
-            5.1,
-            7.7,
-            11.5,
-            15.3,
-            18.1,
-            21.4,
-            24.5,
-        ],
-        10800: [
-            -25.0,
-            -20.9,
-            -17.8,
-            -15.3,
-            -11.6,
-            -7.8,
-            -4.8,
-            -2.1,
-            2.1,
-            4.8,
-            7.8,
-            11.6,
-            15.3,
-            17.8,
-            20.9,
-            25.0,
-        ],
-        10900: [
-            -24.9,
-            -20.9,
-            -17.7,
-            -15.3,
-            -11.7,
-            -7.8,
-            -4.7,
-            -2.0,
-            2.0,
-            4.7,
-            7.8,
-            11.7,
-            15.3,
-            17.7,
-            20.9,
-            25.0,
-        ],
-        12200: [
-            -24.4,
-            -21.5,
-            -17.7,
-            -14.2,
-            -11.5,
-            -8.2,
-            -4.8,
-            -1.8,
-            1.8,
-            4.8,
-            8.2,
-            11.5,
-            14.2,
-            17.7,
-            21.5,
-            24.4,
-        ],
-        12300: [
-            -24.2,
-            -21.5,
-            -17.5,
-            -14.4,
-            -11.5,
-            -7.9,
-            -5.0,
-            -2.1,
-            2.1,
-            5.0,
-            7.9,
-            11.5,
-            14.4,
-            17.5,
-            21.5,
-            24.2,
-        ],
-        12500: [
-            -24.3,
-            -21.4,
-            -17.8,
-            -14.1,
-            -11.4,
-            -8.2,
-            -4.9,
-            -1.8,
-            1.8,
-            4.9,
-            8.2,
-            11.4,
-            14.1,
-            17.8,
-            21.4,
-            24.3,
-        ],
-        13000: [
-            -23.9,
-            -21.5,
-            -18.4,
-            -14.8,
-            -11.4,
-            -7.8,
-            -4.6,
-            -2.4,
-            2.4,
-            4.6,
-            7.8,
-            11.4,
-            14.8,
-            18.4,
-            21.5,
-            23.9,
-        ],
-        13100: [
-            -24.5,
-            -21.0,
-            -18.4,
-            -13.7,
-            -11.1,
-            -8.5,
-            -4.7,
-            -1.5,
-            1.5,
-            4.7,
-            8.5,
-            11.1,
-            13.7,
-            18.4,
-            21.0,
-            24.5,
-        ],
-        13200: [
-            -24.8,
-            -21.6,
-            -18.4,
-            -14.0,
-            -11.7,
-            -8.4,
-            -4.6,
-            -2.2,
-            2.2,
-            4.6,
-            8.4,
-            11.7,
-            14.0,
-            18.4,
-            21.6,
-            24.8,
-        ],
-    }
-
-    shift = (
-        get_phase_shift(
-            adjusted_rx_beam_directions[int(freq_khz)],
-            [freq_khz],
-            antenna_locations[:, 0],
-        )[0]
-        * 0.9999999
-    )
-    # shift: [16, 16]  (i.e. [num_beams, num_tx_channels])
-
-    # Apply a window to the antenna data streams of the main array
-    if antenna_locations.shape[0] == 16:
-        shift = np.einsum("ij,j->ij", shift, np.array(window, dtype=np.float32))
-
-    return shift
+rx_phase_pattern = rx_patterns.windowed_rx_pattern(ADJUSTED_RX_BEAM_DIRECTIONS)
 
 
 class FullFOVTwoFSound(ExperimentPrototype):
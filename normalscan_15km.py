@@ -7,44 +7,10 @@ Standard radar operating experiment with 15km resolution. Transmits a single fre
 """
 
 import borealis_experiments.superdarn_common_fields as scf
-from utils import decimation_scheme as dm
+from borealis_experiments.tools import decimation_schemes
 from utils.experiment_prototype import ExperimentPrototype
 
 
-def filter_15km_mode():
-    sample_rate = 5e6  # 5 MHz
-    dm_rate = [25, 20]  # downsampling rates after filters
-    transition_width = [150e3, 30e3]  # transition from passband to stopband
-    cutoff_hz = [10e3, 5e3]  # bandwidth for output of filter
-    ripple_db = [115, 50]  # dB between passband and stopband
-    scaling_factors = [1000.0, 10000.0]  # multiplicative factors for each filter stage
-
-    dm_rate_so_far = 1
-    stages = []
-
-    # First stage Kaiser
-    taps = scaling_factors[0] * dm.create_firwin_filter_by_attenuation(
-        sample_rate, transition_width[0], cutoff_hz[0], ripple_db[0]
-    )
-    stages.append(dm.DecimationStage(0, sample_rate, dm_rate[0], taps.tolist()))
-    dm_rate_so_far *= dm_rate[0]
-
-    # Second stage Kaiser by num taps
-    taps = scaling_factors[1] * dm.create_firwin_filter_by_num_taps(
-        sample_rate / dm_rate_so_far, cutoff_hz[1], 41
-    )
-    stages.append(
-        dm.DecimationStage(1, sample_rate / dm_rate_so_far, dm_rate[1], taps.tolist())
-    )
-    dm_rate_so_far *= dm_rate[1]
-
-    scheme = dm.DecimationScheme(
-        sample_rate, sample_rate / dm_rate_so_far, stages=stages
-    )
-
-    return scheme
-
-
 class Normalscan15km(ExperimentPrototype):
     cpid = 3803
 
@@ -74,6 +40,8 @@ class Normalscan15km(ExperimentPrototype):
                 "xcf": True,  # cross-correlation processing
                 "acfint": True,  # interferometer acfs
                 "wait_for_first_scanbound": False,
-                "decimation_scheme": filter_15km_mode(),
+                "decimation_scheme": decimation_schemes.decimation_scheme(
+                    "two_stage_kaiser_15km"
+                ),
             }
         )
@@ -1,98 +1,110 @@
+import logging
+import math
+import os
+import threading
+from types import MappingProxyType, SimpleNamespace
+
 import numpy as np
 
 from utils.options import Options
 
-config = Options()
+logger = logging.getLogger(__name__)
+
+
+class SharedTuple(tuple):
+    """
+    Tuple of immutable values that copy.copy() and copy.deepcopy() return as-is, so that every
+    slice copied from a template shares the same constant instead of a copy of it.
+    """
+
+    __slots__ = ()
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
 
-# TODO: We should protect these values from changing, I noticed during testing that I used a
-# TODO: call to reverse() on one and it affected the rest of the testing afterwards
+# Sequences, lag tables, beam angles and frequency tables are SharedTuples (or read-only mappings
+# of them), so they cannot be changed by accident, e.g. by calling reverse(), and are shared by
+# every slice that uses them.
 
-SEQUENCE_7P = [0, 9, 12, 20, 22, 26, 27]
+SEQUENCE_7P = SharedTuple((0, 9, 12, 20, 22, 26, 27))
 TAU_SPACING_7P = 2400  # us
 
-SEQUENCE_8P = [0, 14, 22, 24, 27, 31, 42, 43]
+SEQUENCE_8P = SharedTuple((0, 14, 22, 24, 27, 31, 42, 43))
 TAU_SPACING_8P = 1500  # us
 
-STD_8P_LAG_TABLE = [
-    [0, 0],
-    [42, 43],
-    [22, 24],
-    [24, 27],
-    [27, 31],
-    [22, 27],
-    [24, 31],
-    [14, 22],
-    [22, 31],
-    [14, 24],
-    [31, 42],
-    [31, 43],
-    [14, 27],
-    [0, 14],
-    [27, 42],
-    [27, 43],
-    [14, 31],
-    [24, 42],
-    [24, 43],
-    [22, 42],
-    [22, 43],
-    [0, 22],
-    [0, 24],
-    [43, 43],
-]
+# One pulse pair per lag of SEQUENCE_8P, up to lag 24, as given by
+# tools.lag_tables.lag_table(SEQUENCE_8P, max_lag=24)
+STD_8P_LAG_TABLE = SharedTuple(
+    (
+        (0, 0),
+        (42, 43),
+        (22, 24),
+        (24, 27),
+        (27, 31),
+        (22, 27),
+        (24, 31),
+        (14, 22),
+        (22, 31),
+        (14, 24),
+        (31, 42),
+        (31, 43),
+        (14, 27),
+        (0, 14),
+        (27, 42),
+        (27, 43),
+        (14, 31),
+        (24, 42),
+        (24, 43),
+        (22, 42),
+        (22, 43),
+        (0, 22),
+        (0, 24),
+        (43, 43),
+    )
+)
 
 PULSE_LEN_45KM = 300  # us
 PULSE_LEN_15KM = 100  # us
 
 STD_FIRST_RANGE = 180  # km
-STD_NUM_RANGES = config.num_ranges
-
-STD_BEAM_ANGLES = [
-    config.beam_sep * (beam_dir - (config.num_beams - 1) / 2)
-    for beam_dir in range(config.num_beams)
-]
-if config.scan_direction == "clockwise":
-    STD_BEAM_ORDER = [i for i in range(config.num_beams)]
-elif config.scan_direction == "counterclockwise":
-    STD_BEAM_ORDER = list(reversed([i for i in range(config.num_beams)]))
-else:
-    raise ValueError(
-        "Unknown scan direction from config file: expected `clockwise` or `counterclockwise`"
-    )
-
-# Calculate integration time per beam, rounded to nearest tenth of a second
-INTT_MS = int(600 // config.num_beams) * 100
-__integration_time_s__ = INTT_MS / 1000.0
 
 # set common mode operating frequencies with a slight offset.
 __default_freqs__ = {
     "sas": {
-        "common": [10800, 13000],
-        "sounding": [9690, 10440, 11500, 12080, 13000, 14560, 15250, 16400],
+        "common": (10800, 13000),
+        "sounding": (9690, 10440, 11500, 12080, 13000, 14560, 15250, 16400),
     },
     "pgr": {
-        "common": [10900, 13150],
-        "sounding": [9730, 10480, 11120, 12120, 13040, 14600, 15300, 16440],
+        "common": (10900, 13150),
+        "sounding": (9730, 10480, 11120, 12120, 13040, 14600, 15300, 16440),
     },
     "cly": {
-        "common": [10700, 12500],
-        "sounding": [9850, 10560, 11240, 12240, 13200, 14720, 15550, 16150],
+        "common": (10700, 12500),
+        "sounding": (9850, 10560, 11240, 12240, 13200, 14720, 15550, 16150),
     },
     "rkn": {
-        "common": [10600, 12300],
-        "sounding": [9810, 10230, 11160, 12160, 13080, 14640, 15400, 16480],
+        "common": (10600, 12300),
+        "sounding": (9810, 10230, 11160, 12160, 13080, 14640, 15400, 16480),
     },
     "inv": {
-        "common": [10500, 12200],
-        "sounding": [9770, 10520, 11200, 12200, 13120, 14680, 15500, 16100],
+        "common": (10500, 12200),
+        "sounding": (9770, 10520, 11200, 12200, 13120, 14680, 15500, 16100),
     },
-    "lab": {"common": [10400, 13200], "sounding": [10600, 11250, 11950, 13150]},
-    "default": {"common": [10400, 13200], "sounding": [10600, 11250, 11950, 13150]},
+    "lab": {"common": (10400, 13200), "sounding": (10600, 11250, 11950, 13150)},
+    "default": {"common": (10400, 13200), "sounding": (10600, 11250, 11950, 13150)},
 }
-
-__site_freqs__ = __default_freqs__.get(config.site_id, __default_freqs__["default"])
-COMMON_MODE_FREQ_1 = __site_freqs__["common"][0]
-COMMON_MODE_FREQ_2 = __site_freqs__["common"][1]
-SOUNDING_FREQS = __site_freqs__["sounding"]
+__default_freqs__ = MappingProxyType(
+    {
+        site: MappingProxyType(
+            {key: SharedTuple(value) for key, value in freqs.items()}
+        )
+        for site, freqs in __default_freqs__.items()
+    }
+)
 
 
 def easy_scanbound(intt, beams):
@@ -105,23 +117,148 @@ def easy_scanbound(intt, beams):
     return [i * (intt * 1e-3) for i in range(len(beams))]
 
 
-STD_SCANBOUND = easy_scanbound(INTT_MS, STD_BEAM_ANGLES)
+# Fields that depend on the site config. These are computed on first access by __getattr__().
+__site_field_names__ = (
+    "config",
+    "STD_NUM_RANGES",
+    "STD_BEAM_ANGLES",
+    "STD_BEAM_ORDER",
+    "INTT_MS",
+    "__integration_time_s__",
+    "__site_freqs__",
+    "COMMON_MODE_FREQ_1",
+    "COMMON_MODE_FREQ_2",
+    "SOUNDING_FREQS",
+    "STD_SCANBOUND",
+)
 
 
-def easy_widebeam(frequency_khz, tx_antennas, antenna_locations):
+def site_fields(config):
     """
-    Returns phases in degrees for each antenna in the main array that will generate a wide beam pattern
-    that illuminates the full FOV. Only 8 or 16 antennas at common frequencies are supported.
+    Derives the site-dependent common fields from a site config.
+
+    :param  config: Options of the site
+
+    :returns: Dictionary of {name: value} for every name in __site_field_names__
     """
-    antenna_spacing_m = (
-        antenna_locations[1, 0] - antenna_locations[0, 0]
-    )  # difference in x-position of first two antennas
-    if not np.isclose(antenna_spacing_m, 15.24):
+    STD_BEAM_ANGLES = SharedTuple(
+        config.beam_sep * (beam_dir - (config.num_beams - 1) / 2)
+        for beam_dir in range(config.num_beams)
+    )
+    if config.scan_direction == "clockwise":
+        STD_BEAM_ORDER = [i for i in range(config.num_beams)]
+    elif config.scan_direction == "counterclockwise":
+        STD_BEAM_ORDER = list(reversed([i for i in range(config.num_beams)]))
+    else:
         raise ValueError(
-            f"Antenna spacing must be 15.24m. Given value: {antenna_spacing_m}"
+            "Unknown scan direction from config file: expected `clockwise` or `counterclockwise`"
+        )
+
+    # Calculate integration time per beam, rounded to nearest tenth of a second
+    INTT_MS = int(600 // config.num_beams) * 100
+
+    site_freqs = __default_freqs__.get(config.site_id, __default_freqs__["default"])
+    # A sounding plan written by tools.sounding_planner replaces the hand-picked frequencies, but
+    # only if the directory of plans is given by the BOREALIS_SOUNDING_PLANS environment variable
+    plan_dir = os.environ.get("BOREALIS_SOUNDING_PLANS")
+    if plan_dir:
+        # Tools are imported here and in easy_widebeam() rather than at the top, so that importing
+        # this module stays cheap for experiments that do not use them
+        from borealis_experiments.tools import restricted_ranges, sounding_planner
+
+        planned = sounding_planner.load_plan(
+            config.site_id,
+            len(site_freqs["sounding"]),
+            restricted_ranges.RestrictedRanges.from_options(config),
+            directory=plan_dir,
         )
+        if planned is None:
+            logger.warning(
+                f"No usable sounding plan for {config.site_id} in {plan_dir}, using the "
+                f"hand-picked SOUNDING_FREQS {tuple(site_freqs['sounding'])}"
+            )
+        else:
+            logger.warning(
+                f"SOUNDING_FREQS of {config.site_id} replaced by the plan in {plan_dir}: "
+                f"{tuple(site_freqs['sounding'])} -> {planned}"
+            )
+            site_freqs = MappingProxyType(
+                {**site_freqs, "sounding": SharedTuple(planned)}
+            )
+    return {
+        "config": config,
+        "STD_NUM_RANGES": config.num_ranges,
+        "STD_BEAM_ANGLES": STD_BEAM_ANGLES,
+        "STD_BEAM_ORDER": STD_BEAM_ORDER,
+        "INTT_MS": INTT_MS,
+        "__integration_time_s__": INTT_MS / 1000.0,
+        "__site_freqs__": site_freqs,
+        "COMMON_MODE_FREQ_1": site_freqs["common"][0],
+        "COMMON_MODE_FREQ_2": site_freqs["common"][1],
+        "SOUNDING_FREQS": site_freqs["sounding"],
+        "STD_SCANBOUND": easy_scanbound(INTT_MS, STD_BEAM_ANGLES),
+    }
+
+
+# Sites loaded by load_site(), keyed by site_id. None is the site of the current environment.
+__sites__ = {}
+__sites_lock__ = threading.Lock()
+
+
+def load_site(site_id=None):
+    """
+    Returns the site-dependent common fields of a site as attributes of a namespace, e.g.
+    load_site("pgr").STD_BEAM_ORDER. Each site config is only read once per process, so tooling
+    can work with several sites side by side.
 
-    cached_values_16_antennas = {
+    :param  site_id:    Three-letter site code, or None for the site of the current environment
+                        (the RADAR_ID environment variable), which the module attributes refer to.
+    """
+    site = __sites__.get(site_id)
+    if site is not None:
+        return site
+
+    with __sites_lock__:
+        site = __sites__.get(site_id)
+        if site is None:
+            if site_id is None:
+                config = Options()
+            else:
+                # Options reads the config of the site named by RADAR_ID
+                previous_radar_id = os.environ.get("RADAR_ID")
+                os.environ["RADAR_ID"] = site_id
+                try:
+                    config = Options()
+                finally:
+                    if previous_radar_id is None:
+                        del os.environ["RADAR_ID"]
+                    else:
+                        os.environ["RADAR_ID"] = previous_radar_id
+            site = SimpleNamespace(**site_fields(config))
+            __sites__[site_id] = site
+            __sites__.setdefault(config.site_id, site)
+    return site
+
+
+def __getattr__(name):
+    """
+    Loads the site config the first time a site-dependent field is accessed, then caches every
+    site-dependent field as a module attribute.
+    """
+    if name in __site_field_names__:
+        globals().update(vars(load_site()))
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__site_field_names__))
+
+
+# Phase progressions in degrees across the main array that generate a wide beam pattern
+# illuminating the full FOV, keyed by number of transmitting antennas then frequency in kHz.
+__widebeam_degrees__ = {
+    16: {
         10400: [
             0.0,
             102.96177116,
@@ -338,8 +475,8 @@ def easy_widebeam(frequency_khz, tx_antennas, antenna_locations):
             76.47696612,
             0.0,
         ],
-    }
-    cached_values_8_antennas = {
+    },
+    8: {
         10400: [
             0.0,
             25.65596691,
@@ -460,27 +597,94 @@ def easy_widebeam(frequency_khz, tx_antennas, antenna_locations):
             43.42908842,
             0.0,
         ],
+    },
+}
+
+
+def _read_only(array):
+    array.flags.writeable = False
+    return array
+
+
+# Complex weights for each entry of __widebeam_degrees__, keyed by (frequency_khz, num_antennas).
+# These are computed once at import and shared by every slice; they cannot be written to.
+__widebeam_phases__ = MappingProxyType(
+    {
+        (freq_khz, num_antennas): _read_only(
+            np.exp(1j * np.deg2rad(phases)).astype(np.complex64) * 0.999999
+        )
+        for num_antennas, table in __widebeam_degrees__.items()
+        for freq_khz, phases in table.items()
     }
+)
+
+# Full-array patterns returned by easy_widebeam(), keyed by (frequency_khz, tx_antennas, main_antenna_count)
+__widebeam_patterns__ = {}
+
+
+def easy_widebeam(frequency_khz, tx_antennas, antenna_locations):
+    """
+    Returns phases for each antenna in the main array that will generate a wide beam pattern
+    that illuminates the full FOV. Only 8 or 16 antennas are supported. Common frequencies use
+    the precomputed phases, and other frequencies within the 8-18 MHz band use phases solved ahead
+    of time with tools.widebeam_solver. Nothing is solved here, since Borealis calls this for every
+    frequency and beam change.
+
+    The returned array is a read-only view of a cached pattern, so repeated calls for the same
+    frequency and antennas do not recompute anything.
+    """
+    antenna_spacing_m = (
+        antenna_locations[1, 0] - antenna_locations[0, 0]
+    )  # difference in x-position of first two antennas
+    if not math.isclose(antenna_spacing_m, 15.24, rel_tol=1e-5, abs_tol=1e-8):
+        raise ValueError(
+            f"Antenna spacing must be 15.24m. Given value: {antenna_spacing_m}"
+        )
+
+    from borealis_experiments.tools import widebeam_solver
+
+    config = load_site().config
     num_antennas = config.main_antenna_count
-    phases = np.zeros(num_antennas, dtype=np.complex64)
-    if len(tx_antennas) == 16:
-        if frequency_khz in cached_values_16_antennas.keys():
-            phases[tx_antennas] = np.exp(
-                1j * np.deg2rad(cached_values_16_antennas[frequency_khz])
+    key = (frequency_khz, tuple(tx_antennas), num_antennas)
+    pattern = __widebeam_patterns__.get(key)
+    if pattern is None:
+        phases = __widebeam_phases__.get((frequency_khz, len(tx_antennas)))
+        if (
+            phases is None
+            and len(tx_antennas) in __widebeam_degrees__
+            and widebeam_solver.MIN_FREQ_KHZ
+            <= frequency_khz
+            <= widebeam_solver.MAX_FREQ_KHZ
+        ):
+            solved_degrees = widebeam_solver.stored_widebeam_phases(
+                frequency_khz,
+                config.num_beams * config.beam_sep,
+                config.site_id,
+                num_antennas=len(tx_antennas),
             )
-            return phases.reshape(1, num_antennas) * 0.999999
-    elif len(tx_antennas) == 8:
-        if frequency_khz in cached_values_8_antennas.keys():
-            phases[tx_antennas] = np.exp(
-                1j * np.deg2rad(cached_values_8_antennas[frequency_khz])
+            if solved_degrees is None:
+                raise ValueError(
+                    f"No widebeam phases for {frequency_khz} kHz and {len(tx_antennas)} "
+                    f"antennas. Solve them ahead of time with: python3 -m "
+                    f"borealis_experiments.tools.widebeam_solver {config.site_id} "
+                    f"{config.num_beams * config.beam_sep:g} {frequency_khz} "
+                    f"--num-antennas {len(tx_antennas)}"
+                )
+            phases = np.exp(1j * np.deg2rad(solved_degrees)).astype(np.complex64)
+            phases *= 0.999999
+        if phases is None:
+            # If you get this far, the number of antennas or frequency is not supported for this function.
+            raise ValueError(
+                f"Invalid parameters for easy_widebeam(): tx_antennas: {tx_antennas}, "
+                f"frequency_khz: {frequency_khz}, main_antenna_count: {num_antennas}.\n"
+                f"This could be accidental - if you have disconnected a TX channel in your config file, "
+                f"this will reduce the number of transmitting antennas.\nWide transmission beam patterns "
+                f"are very sensitive, so this function only accepts 8 or 16 transmitting antennas and "
+                f"frequencies within {widebeam_solver.MIN_FREQ_KHZ}-{widebeam_solver.MAX_FREQ_KHZ} kHz "
+                f"to produce predictable beam patterns."
             )
-            return phases.reshape(1, num_antennas) * 0.999999
-    # If you get this far, the number of antennas or frequency is not supported for this function.
-    raise ValueError(
-        f"Invalid parameters for easy_widebeam(): tx_antennas: {tx_antennas}, "
-        f"frequency_khz: {frequency_khz}, main_antenna_count: {num_antennas}.\n"
-        f"This could be accidental - if you have disconnected a TX channel in your config file, "
-        f"this will reduce the number of transmitting antennas.\nWide transmission beam patterns "
-        f"are very sensitive, so this function only accepts specific operating parameters to produce "
-        f"predictable beam patterns."
-    )
+        pattern = np.zeros((1, num_antennas), dtype=np.complex64)
+        pattern[0, list(tx_antennas)] = phases
+        __widebeam_patterns__[key] = _read_only(pattern)
+
+    return pattern.view()
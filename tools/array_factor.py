@@ -0,0 +1,275 @@
+#!/usr/bin/python
+
+"""
+array_factor
+~~~~~~~~~~~~
+Evaluates the array factor of tx_antenna_pattern and rx_antenna_pattern functions over a dense
+azimuth grid, for many frequencies and beams at once. This allows new antenna patterns to be
+screened offline instead of on-air.
+
+The array factor of the complex antenna weights w at azimuth theta is
+
+    AF(theta) = sum_a w_a * exp(-j * k * x_a * sin(theta))
+
+where x_a is the position of antenna a along the array. This matches weights from
+utils.signals.get_phase_shift(), which steer a beam to theta by applying a phase of
++k * x * sin(theta). All frequencies and beams are evaluated with a single batched matrix product
+of shape [num_freqs, num_beams, num_antennas] x [num_freqs, num_antennas, num_azimuths].
+
+Usage: python3 -m borealis_experiments.tools.array_factor module.function {tx,rx} freq_khz [...]
+
+:copyright: 2026 SuperDARN Canada
+"""
+
+import argparse
+import importlib
+
+import numpy as np
+
+import borealis_experiments.superdarn_common_fields as scf
+
+SPEED_OF_LIGHT = 299792458.0  # m/s
+
+
+def linear_array(num_antennas, antenna_spacing_m=15.24):
+    """
+    Returns antenna locations of a uniform linear array centred on the origin, with shape
+    [num_antennas, 3] as passed to antenna pattern functions.
+    """
+    locations = np.zeros((num_antennas, 3))
+    locations[:, 0] = (
+        np.arange(num_antennas) - (num_antennas - 1) / 2
+    ) * antenna_spacing_m
+    return locations
+
+
+def site_arrays(config, intf_offset_m=None):
+    """
+    Returns the antenna locations of the main and interferometer arrays of a site, with shapes
+    [main_antenna_count, 3] and [intf_antenna_count, 3].
+
+    :param  config:         Site config, e.g. scf.load_site().config
+    :param  intf_offset_m:  [x, y, z] position of the interferometer array centre relative to the
+                            main array centre, in metres. Defaults to the intf_offset of the
+                            site config.
+    """
+    if intf_offset_m is None:
+        intf_offset_m = getattr(config, "intf_offset", None)
+    if intf_offset_m is None:
+        raise ValueError(
+            f"Site config of {config.site_id} has no intf_offset, so intf_offset_m must be "
+            "given"
+        )
+    main_locations = linear_array(config.main_antenna_count)
+    intf_locations = linear_array(config.intf_antenna_count)
+    intf_locations += np.asarray(intf_offset_m, dtype=float)
+    return main_locations, intf_locations
+
+
+def steering_matrix(frequencies_khz, antenna_x_m, azimuths_deg):
+    """
+    Returns exp(-j * k * x * sin(theta)) with shape [num_freqs, num_antennas, num_azimuths].
+    """
+    wavenumbers = 2 * np.pi * np.asarray(frequencies_khz, dtype=np.float64) * 1e3
+    wavenumbers /= SPEED_OF_LIGHT
+    phase = np.einsum(
+        "f,a,g->fag",
+        wavenumbers,
+        np.asarray(antenna_x_m, dtype=np.float64),
+        np.sin(np.deg2rad(azimuths_deg)),
+    )
+    return np.exp(-1j * phase).astype(np.complex64)
+
+
+def array_factor(weights, frequencies_khz, antenna_x_m, azimuths_deg):
+    """
+    Computes the complex array factor for every frequency and beam.
+
+    :param  weights:            Complex antenna weights, shape [num_freqs, num_beams, num_antennas]
+    :param  frequencies_khz:    Frequency of each set of weights, in kHz
+    :param  antenna_x_m:        Position of each antenna along the array, in metres
+    :param  azimuths_deg:       Azimuths to evaluate at, in degrees from boresight
+
+    :returns: Array factor with shape [num_freqs, num_beams, num_azimuths]
+    """
+    weights = np.asarray(weights, dtype=np.complex64)
+    return np.matmul(
+        weights, steering_matrix(frequencies_khz, antenna_x_m, azimuths_deg)
+    )
+
+
+def tx_pattern_weights(
+    pattern_fn, frequencies_khz, antenna_locations, tx_antennas=None
+):
+    """
+    Calls a tx_antenna_pattern function at each frequency.
+
+    :param  pattern_fn:         Function with signature (frequency_khz, tx_antennas, antenna_locations)
+    :param  frequencies_khz:    Frequencies in kHz
+    :param  antenna_locations:  Locations of the main array antennas, shape [num_antennas, 3]
+    :param  tx_antennas:        Indices of the transmitting antennas. Defaults to all antennas.
+
+    :returns: Weights with shape [num_freqs, num_patterns, num_antennas]
+    """
+    if tx_antennas is None:
+        tx_antennas = list(range(antenna_locations.shape[0]))
+    return np.stack(
+        [
+            np.asarray(pattern_fn(freq, tx_antennas, antenna_locations))
+            for freq in frequencies_khz
+        ]
+    )
+
+
+def rx_pattern_weights(pattern_fn, frequencies_khz, beam_angles, antenna_locations):
+    """
+    Calls an rx_antenna_pattern function at each frequency.
+
+    :param  pattern_fn:         Function with signature (beam_angle, freq_khz, antenna_locations)
+    :param  frequencies_khz:    Frequencies in kHz
+    :param  beam_angles:        Beam directions passed to the function, in degrees
+    :param  antenna_locations:  Locations of the antennas, shape [num_antennas, 3]
+
+    :returns: Weights with shape [num_freqs, num_beams, num_antennas]
+    """
+    return np.stack(
+        [
+            np.asarray(pattern_fn(beam_angles, freq, antenna_locations))
+            for freq in frequencies_khz
+        ]
+    )
+
+
+def power_db(af):
+    """Returns the power of an array factor in dB, normalized to the peak of each beam."""
+    power = af.real**2 + af.imag**2
+    peak = power.max(axis=-1, keepdims=True)
+    return 10 * np.log10(np.maximum(power, 1e-30) / np.maximum(peak, 1e-30))
+
+
+def beam_metrics(af, azimuths_deg):
+    """
+    Computes the main lobe direction, -3 dB width and peak sidelobe level of each beam.
+
+    :param  af:             Array factor with shape [..., num_azimuths]
+    :param  azimuths_deg:   Evenly spaced azimuths that af was evaluated at, in degrees
+
+    :returns: Dictionary of arrays with the leading shape of af: 'peak_deg', 'width_3db_deg' and
+              'sidelobe_db'
+    """
+    azimuths_deg = np.asarray(azimuths_deg)
+    power = af.real**2 + af.imag**2
+    num_azimuths = power.shape[-1]
+    index = np.arange(num_azimuths)
+    peak = np.argmax(power, axis=-1)[..., np.newaxis]
+    peak_power = np.take_along_axis(power, peak, axis=-1)
+
+    # Edges of the -3 dB region containing the peak
+    below_half = power < peak_power / 2
+    left = np.where(below_half & (index < peak), index, -1).max(axis=-1) + 1
+    right = np.where(below_half & (index > peak), index, num_azimuths).min(axis=-1) - 1
+    step_deg = azimuths_deg[1] - azimuths_deg[0]
+
+    # First nulls on either side of the peak, where the power stops decreasing
+    rising = power[..., 1:] >= power[..., :-1]
+    left_null = np.where(~rising & (index[:-1] < peak), index[:-1] + 1, 0).max(axis=-1)
+    falling = power[..., 1:] <= power[..., :-1]
+    right_null = np.where(
+        ~falling & (index[:-1] >= peak), index[:-1], num_azimuths - 1
+    ).min(axis=-1)
+    main_lobe = (index >= left_null[..., np.newaxis]) & (
+        index <= right_null[..., np.newaxis]
+    )
+    sidelobe = np.where(main_lobe, 0.0, power).max(axis=-1) / peak_power[..., 0]
+
+    return {
+        "peak_deg": azimuths_deg[peak[..., 0]],
+        "width_3db_deg": (right - left + 1) * step_deg,
+        "sidelobe_db": 10 * np.log10(np.maximum(sidelobe, 1e-30)),
+    }
+
+
+def fov_metrics(af, azimuths_deg, fov_width_deg):
+    """
+    Computes how evenly a wide beam illuminates the FOV.
+
+    :param  af:             Array factor with shape [..., num_azimuths]
+    :param  azimuths_deg:   Evenly spaced azimuths that af was evaluated at, in degrees
+    :param  fov_width_deg:  Full width of the FOV, centred on boresight
+
+    :returns: Dictionary of arrays with the leading shape of af: 'ripple_db', the ratio of the
+              largest to smallest power within the FOV, and 'fov_fraction', the fraction of power
+              radiated into the FOV
+    """
+    power = af.real**2 + af.imag**2
+    in_fov = np.abs(np.asarray(azimuths_deg)) <= fov_width_deg / 2
+    fov_power = power[..., in_fov]
+    ripple = fov_power.max(axis=-1) / np.maximum(fov_power.min(axis=-1), 1e-30)
+    return {
+        "ripple_db": 10 * np.log10(ripple),
+        "fov_fraction": fov_power.sum(axis=-1) / power.sum(axis=-1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Print beam metrics of an antenna pattern function."
+    )
+    parser.add_argument(
+        "pattern",
+        help="Pattern function as module.function, relative to borealis_experiments, "
+        "e.g. superdarn_common_fields.easy_widebeam",
+    )
+    parser.add_argument("kind", choices=["tx", "rx"], help="Type of pattern function")
+    parser.add_argument("freqs_khz", type=float, nargs="+", help="Frequencies in kHz")
+    parser.add_argument("--num-antennas", type=int, default=16)
+    parser.add_argument("--num-azimuths", type=int, default=3600)
+    parser.add_argument(
+        "--beam-angles",
+        type=float,
+        nargs="+",
+        help="Beam angles passed to rx patterns. Defaults to the standard beam angles.",
+    )
+    parser.add_argument(
+        "--fov-width",
+        type=float,
+        help="Also report the ripple and fraction of power within a FOV of this width in degrees",
+    )
+    args = parser.parse_args()
+
+    module_name, fn_name = args.pattern.rsplit(".", 1)
+    module = importlib.import_module(f"borealis_experiments.{module_name}")
+    pattern_fn = getattr(module, fn_name)
+
+    antenna_locations = linear_array(args.num_antennas)
+    azimuths_deg = np.linspace(-90, 90, args.num_azimuths)
+    if args.kind == "tx":
+        weights = tx_pattern_weights(pattern_fn, args.freqs_khz, antenna_locations)
+    else:
+        beam_angles = args.beam_angles
+        if beam_angles is None:
+            beam_angles = scf.STD_BEAM_ANGLES
+        weights = rx_pattern_weights(
+            pattern_fn, args.freqs_khz, beam_angles, antenna_locations
+        )
+
+    af = array_factor(weights, args.freqs_khz, antenna_locations[:, 0], azimuths_deg)
+    metrics = beam_metrics(af, azimuths_deg)
+    header = f"{'freq (kHz)':>10} {'beam':>4} {'peak (deg)':>10} {'-3 dB width':>11} {'sidelobe (dB)':>13}"
+    if args.fov_width is not None:
+        metrics.update(fov_metrics(af, azimuths_deg, args.fov_width))
+        header += f" {'FOV ripple (dB)':>15} {'FOV fraction':>12}"
+    print(header)
+    for f, freq in enumerate(args.freqs_khz):
+        for b in range(af.shape[1]):
+            line = (
+                f"{freq:>10g} {b:>4} {metrics['peak_deg'][f, b]:>10.2f} "
+                f"{metrics['width_3db_deg'][f, b]:>11.2f} {metrics['sidelobe_db'][f, b]:>13.1f}"
+            )
+            if args.fov_width is not None:
+                line += f" {metrics['ripple_db'][f, b]:>15.1f} {metrics['fov_fraction'][f, b]:>12.2f}"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+beamformer
+~~~~~~~~~~
+Offline beamforming of decimated antenna samples for slices that form many receive beams at once,
+such as the full-FOV modes with rx_beam_order = [[0, ..., 15]]. The complex weights of every beam
+of an averaging period are stacked into one matrix per array, so each sequence is beamformed with
+a single matrix product
+
+    beams[beam, sample] = sum_a weights[beam, a] * samples[a, sample]
+
+written into output buffers allocated once per averaging period. The output layout,
+[num_sequences, num_beams, num_samples], is what tools.correlator expects.
+
+Weights come from the slice's rx_antenna_pattern, or steer to its beam_angle with
+utils.signals.get_phase_shift(), and are cached per pattern, frequency and set of beam angles.
+
+:copyright: 2026 SuperDARN Canada
+"""
+
+import numpy as np
+
+import borealis_experiments.superdarn_common_fields as scf
+from borealis_experiments.tools import array_factor, timing_simulator
+from utils.signals import get_phase_shift
+
+# Weight matrices already computed, keyed by pattern function, frequency and beam angles
+__pattern_weights__ = {}
+
+
+def pattern_weights(pattern_fn, beam_angle, freq_khz, antenna_locations):
+    """
+    Returns the receive weights of every beam angle of a slice for one array, as a read-only
+    complex64 array of shape [num_beams, num_antennas].
+
+    :param  pattern_fn:         rx_antenna_pattern of the slice, or None to steer to each beam
+                                angle with a phase progression
+    :param  beam_angle:         Beam directions of the slice, in degrees
+    :param  freq_khz:           Receive frequency, in kHz
+    :param  antenna_locations:  Locations of the antennas of the array, shape [num_antennas, 3]
+    """
+    key = (
+        pattern_fn,
+        freq_khz,
+        tuple(beam_angle),
+        antenna_locations.shape,
+        antenna_locations.tobytes(),
+    )
+    weights = __pattern_weights__.get(key)
+    if weights is None:
+        if pattern_fn is None:
+            weights = get_phase_shift(
+                list(beam_angle), [freq_khz], antenna_locations[:, 0]
+            )[0]
+        else:
+            weights = pattern_fn(list(beam_angle), freq_khz, antenna_locations)
+        weights = np.array(weights, dtype=np.complex64)
+        weights.setflags(write=False)
+        weights = __pattern_weights__.setdefault(key, weights)
+    return weights
+
+
+class Beamformer:
+    """
+    Beamforms sequences of an averaging period into preallocated buffers.
+
+    :param  main_weights:   Weights of the main array, shape [num_beams, num_main_antennas]
+    :param  intf_weights:   Weights of the interferometer array, shape [num_beams,
+                            num_intf_antennas], or None to only beamform the main array
+    :param  num_samples:    Number of samples per sequence
+    :param  max_sequences:  Number of sequences the buffers hold
+    """
+
+    def __init__(self, main_weights, intf_weights, num_samples, max_sequences=1):
+        self.weights = [np.ascontiguousarray(main_weights, dtype=np.complex64)]
+        if intf_weights is not None:
+            self.weights.append(np.ascontiguousarray(intf_weights, dtype=np.complex64))
+        self.num_beams = main_weights.shape[0]
+        self.num_main_antennas = main_weights.shape[1]
+        self.buffers = [
+            np.empty((max_sequences, self.num_beams, num_samples), dtype=np.complex64)
+            for _ in self.weights
+        ]
+
+    @classmethod
+    def from_slice(
+        cls, exp_slice, num_samples, beam_iter=0, max_sequences=1, intf_offset_m=None
+    ):
+        """
+        Returns a beamformer for the receive beams of one entry of a slice's rx_beam_order, over
+        the slice's receive antennas of the current site. intf_offset_m overrides the position of
+        the interferometer array given by the site config, see array_factor.site_arrays().
+        """
+        field = timing_simulator._field
+        config = scf.load_site().config
+        main_locations, intf_locations = array_factor.site_arrays(config, intf_offset_m)
+        rx_main = field(exp_slice, "rx_main_antennas")
+        rx_intf = field(exp_slice, "rx_intf_antennas")
+        if rx_main is None:
+            rx_main = range(config.main_antenna_count)
+        if rx_intf is None:
+            rx_intf = range(config.intf_antenna_count)
+
+        beams = field(exp_slice, "rx_beam_order")[beam_iter]
+        if not isinstance(beams, (list, tuple)):
+            beams = [beams]
+        pattern_fn = field(exp_slice, "rx_antenna_pattern")
+        beam_angle = field(exp_slice, "beam_angle")
+        freq_khz = field(exp_slice, "freq")
+        main_weights = pattern_weights(
+            pattern_fn, beam_angle, freq_khz, main_locations
+        )[np.ix_(beams, list(rx_main))]
+        intf_weights = None
+        if len(rx_intf) > 0:
+            intf_weights = pattern_weights(
+                pattern_fn, beam_angle, freq_khz, intf_locations
+            )[np.ix_(beams, list(rx_intf))]
+        return cls(main_weights, intf_weights, num_samples, max_sequences)
+
+    def form(self, samples):
+        """
+        Beamforms sequences of antenna samples.
+
+        :param  samples:    Samples of the main then interferometer antennas, shape
+                            [num_antennas, num_sequences, num_samples] as in antennas_iq data
+
+        :returns: List of beamformed samples per array, main first, each a view of this
+                  beamformer's buffers with shape [num_sequences, num_beams, num_samples]. They
+                  are overwritten by the next call.
+        """
+        num_sequences = samples.shape[1]
+        arrays = [samples[: self.num_main_antennas], samples[self.num_main_antennas :]]
+        outputs = []
+        for weights, array, buffer in zip(self.weights, arrays, self.buffers):
+            for sequence in range(num_sequences):
+                np.matmul(weights, array[:, sequence], out=buffer[sequence])
+            outputs.append(buffer[:num_sequences])
+        return outputs
@@ -0,0 +1,127 @@
+#!/usr/bin/python
+
+"""
+blanking
+~~~~~~~~
+Precomputes which (range, lag) correlation samples of a slice are blanked, i.e. taken while the
+receivers are off because a pulse of the sequence is being transmitted. A sample is blanked when
+the interval it covers, [t, t + 1 / output rate), overlaps the interval of any pulse,
+[p * tau_spacing, p * tau_spacing + pulse_len), as checked by tools.lag_tables.pulse_overlap(),
+which also counts the blanked range gates of candidate lag pairs.
+
+The map is a read-only boolean array of shape [num_ranges, num_lags], True where either sample of
+the lag pair is blanked, laid out like the correlations of tools.correlator. Maps are cached per
+slice signature, which matters for the 225-range 15 km modes.
+
+Usage: python3 -m borealis_experiments.tools.blanking module.Class
+
+:copyright: 2026 SuperDARN Canada
+"""
+
+import argparse
+import importlib
+
+import numpy as np
+
+from borealis_experiments.tools import (
+    correlator,
+    data_rates,
+    lag_tables,
+    timing_simulator,
+)
+
+# Blanking maps already computed, keyed by slice signature
+__blanking_maps__ = {}
+
+
+def blanking_map(
+    pulse_sequence,
+    tau_spacing,
+    pulse_len,
+    num_ranges,
+    first_range,
+    lag_table=None,
+    output_rate_hz=data_rates.DEFAULT_OUTPUT_RATE_HZ,
+):
+    """
+    Returns the blanked (range, lag) samples of a slice. Results are cached.
+
+    :param  pulse_sequence: Pulse positions in units of tau_spacing
+    :param  tau_spacing:    Multi-pulse increment, in us
+    :param  pulse_len:      Pulse length, in us
+    :param  num_ranges:     Number of range gates
+    :param  first_range:    Distance to the first range gate, in km
+    :param  lag_table:      Sequence of [p1, p2] pulse positions. Defaults to the table Borealis
+                            uses for slices without one.
+    :param  output_rate_hz: Sample rate of the correlated samples
+
+    :returns: Read-only bool array of shape [num_ranges, num_lags]
+    """
+    key = (
+        tuple(pulse_sequence),
+        tau_spacing,
+        pulse_len,
+        num_ranges,
+        first_range,
+        None if lag_table is None else tuple(tuple(pair) for pair in lag_table),
+        float(output_rate_hz),
+    )
+    blanked = __blanking_maps__.get(key)
+    if blanked is None:
+        indices = correlator.gather_indices(
+            pulse_sequence,
+            tau_spacing,
+            pulse_len,
+            num_ranges,
+            first_range,
+            lag_table,
+            output_rate_hz,
+        )
+        sample_us = 1e6 / output_rate_hz
+        blanked = lag_tables.pulse_overlap(
+            indices * sample_us, sample_us, pulse_sequence, tau_spacing, pulse_len
+        ).any(axis=0)
+        blanked.setflags(write=False)
+        blanked = __blanking_maps__.setdefault(key, blanked)
+    return blanked
+
+
+def slice_blanking_map(exp_slice):
+    """Returns the blanking map of a slice dictionary or validated slice."""
+    field = timing_simulator._field
+    return blanking_map(
+        field(exp_slice, "pulse_sequence"),
+        field(exp_slice, "tau_spacing"),
+        field(exp_slice, "pulse_len"),
+        field(exp_slice, "num_ranges"),
+        field(exp_slice, "first_range"),
+        field(exp_slice, "lag_table"),
+        data_rates.output_rate_hz(exp_slice),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Print the fraction of blanked range gates per lag of each slice."
+    )
+    parser.add_argument(
+        "experiment",
+        help="Experiment class as module.Class, relative to borealis_experiments",
+    )
+    args = parser.parse_args()
+
+    module_name, class_name = args.experiment.rsplit(".", 1)
+    module = importlib.import_module(f"borealis_experiments.{module_name}")
+    experiment = getattr(module, class_name)()
+    for slice_id, exp_slice in experiment.slice_dict.items():
+        blanked = slice_blanking_map(exp_slice)
+        fractions = blanked.mean(axis=0)
+        print(
+            f"slice {slice_id}: {blanked.shape[0]} ranges x {blanked.shape[1]} lags, "
+            f"{blanked.mean():.1%} blanked"
+        )
+        print("  per lag: " + " ".join(f"{fraction:.2f}" for fraction in fractions))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+cache
+~~~~~
+Location and helpers for the on-disk caches written by the tools in this package. Cached results
+are keyed by the parameters that produced them, so a change in parameters never reads a stale
+entry.
+
+The cache lives in ~/.cache/borealis_experiments unless the BOREALIS_EXPERIMENTS_CACHE
+environment variable is set.
+
+:copyright: 2026 SuperDARN Canada
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+
+
+def cache_dir(*subdirs):
+    """Returns the path of a cache subdirectory, creating it if it does not exist."""
+    root = os.environ.get(
+        "BOREALIS_EXPERIMENTS_CACHE",
+        os.path.join(os.path.expanduser("~"), ".cache", "borealis_experiments"),
+    )
+    path = os.path.join(root, *subdirs)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def content_key(params, length=16):
+    """
+    Returns a hex digest identifying a set of parameters.
+
+    :param  params: JSON-serializable parameters
+    :param  length: Number of hex characters to keep
+    """
+    encoded = json.dumps(params, sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.sha256(encoded).hexdigest()[:length]
+
+
+def load_json(path, default=None):
+    """Returns the contents of a JSON cache file, or default if it does not exist yet."""
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return default
+
+
+def write_json(path, contents):
+    """
+    Writes a JSON cache file atomically, so a concurrent reader never sees a partial file.
+    """
+    directory = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(contents, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_array(path):
+    """Returns a read-only memory map of a .npy cache file, or None if it does not exist yet."""
+    try:
+        return np.load(path, mmap_mode="r")
+    except FileNotFoundError:
+        return None
+
+
+def write_array(path, array):
+    """
+    Writes a .npy cache file atomically, so a concurrent reader never sees a partial file.
+    """
+    directory = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, array)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
@@ -0,0 +1,258 @@
+#!/usr/bin/python
+
+"""
+cfs_spectrum
+~~~~~~~~~~~~
+Clear frequency search for every CFS slice of an experiment from one shared capture. The power
+spectral density of the capture is estimated once with Welch's method: the samples are split into
+overlapping segments, every segment of every channel is windowed and transformed in a single FFT
+call, and the powers are averaged. The sub-band of each slice is then read from the same spectrum.
+
+The candidate frequencies of a slice are the whole kHz in its cfs_range whose channel, one
+transmit bandwidth (1 / pulse_len) wide, fits inside the range. The power of every channel is the
+integral of the spectrum over the channel, found for the candidates of all slices at once by
+interpolating the cumulative spectrum at the channel edges, and each slice gets its quietest
+channel. Channels that overlap a restricted range of the site are never candidates.
+
+Windows, bin edges and candidate channels are computed once per layout and cached, so a search is
+one FFT, one cumulative sum and one interpolation. numpy keeps its own cache of FFT plans per
+length. The command line search leaves out the restricted ranges of the current site.
+
+Usage: python3 -m borealis_experiments.tools.cfs_spectrum module.Class [--duration ms]
+
+:copyright: 2026 SuperDARN Canada
+"""
+
+import argparse
+import importlib
+import time
+
+import numpy as np
+
+import borealis_experiments.superdarn_common_fields as scf
+from borealis_experiments.tools import restricted_ranges, timing_simulator
+
+DEFAULT_SAMPLE_RATE_HZ = 5e6
+DEFAULT_RESOLUTION_KHZ = 0.5
+DEFAULT_OVERLAP = 0.5
+MIN_CFS_DURATION_MS = 10
+
+# Windows and bin edges already computed, keyed by their layout
+__welch_windows__ = {}
+__bin_edges__ = {}
+
+
+def welch_window(num_fft):
+    """
+    Returns a read-only Hann window of num_fft points, scaled so that a tone of unit amplitude has
+    unit power in the spectrum.
+    """
+    window = __welch_windows__.get(num_fft)
+    if window is None:
+        window = np.hanning(num_fft + 1)[:-1]
+        window = (window / window.sum()).astype(np.float32)
+        window.setflags(write=False)
+        window = __welch_windows__.setdefault(num_fft, window)
+    return window
+
+
+def bin_edges_khz(center_freq_khz, sample_rate_hz, num_fft):
+    """
+    Returns the read-only edges of the num_fft + 1 frequency bins of an FFT-shifted spectrum, in
+    kHz. Results are cached.
+    """
+    key = (float(center_freq_khz), float(sample_rate_hz), num_fft)
+    edges = __bin_edges__.get(key)
+    if edges is None:
+        bin_khz = sample_rate_hz * 1e-3 / num_fft
+        edges = (
+            center_freq_khz + (np.arange(num_fft + 1) - num_fft // 2 - 0.5) * bin_khz
+        )
+        edges.setflags(write=False)
+        edges = __bin_edges__.setdefault(key, edges)
+    return edges
+
+
+def welch_psd(samples, num_fft, overlap=DEFAULT_OVERLAP):
+    """
+    Returns the FFT-shifted power spectrum of samples, averaged over channels and segments.
+
+    :param  samples:    Complex samples, shape [num_samples] or [num_channels, num_samples]
+    :param  num_fft:    Length of each segment
+    :param  overlap:    Fraction of each segment shared with the next one
+
+    :returns: float array of shape [num_fft], the power in each frequency bin
+    """
+    samples = np.atleast_2d(samples)
+    if samples.shape[-1] < num_fft:
+        raise ValueError(
+            f"{samples.shape[-1]} samples are too few for segments of {num_fft}"
+        )
+    hop = max(int(num_fft * (1 - overlap)), 1)
+    segments = np.lib.stride_tricks.sliding_window_view(samples, num_fft, axis=-1)[
+        :, ::hop
+    ]
+    spectra = np.fft.fft(segments * welch_window(num_fft), axis=-1)
+    power = spectra.real**2 + spectra.imag**2
+    return np.fft.fftshift(power.mean(axis=(0, 1)))
+
+
+def channel_centers(cfs_range, channel_khz):
+    """Returns the whole kHz in cfs_range whose channel of width channel_khz fits in the range."""
+    first = np.ceil(cfs_range[0] + channel_khz / 2)
+    last = np.floor(cfs_range[1] - channel_khz / 2)
+    return np.arange(first, last + 1)
+
+
+class CfsEngine:
+    """
+    Searches the sub-bands of several CFS slices in one spectrum.
+
+    :param  cfs_ranges:         Dictionary of {slice_id: [low, high]} CFS ranges, in kHz
+    :param  channel_khz:        Dictionary of {slice_id: channel width in kHz}
+    :param  center_freq_khz:    Centre frequency of the capture. Defaults to the middle of the CFS
+                                ranges.
+    :param  sample_rate_hz:     Sample rate of the capture
+    :param  resolution_khz:     Largest width of a frequency bin
+    :param  overlap:            Fraction of each Welch segment shared with the next one
+    :param  restricted:         RestrictedRanges whose channels are not candidates
+
+    :raises ValueError:         If a CFS range is not inside the band of the capture, or has no
+                                unrestricted channel
+    """
+
+    def __init__(
+        self,
+        cfs_ranges,
+        channel_khz,
+        center_freq_khz=None,
+        sample_rate_hz=DEFAULT_SAMPLE_RATE_HZ,
+        resolution_khz=DEFAULT_RESOLUTION_KHZ,
+        overlap=DEFAULT_OVERLAP,
+        restricted=None,
+    ):
+        if center_freq_khz is None:
+            low = min(cfs_range[0] for cfs_range in cfs_ranges.values())
+            high = max(cfs_range[1] for cfs_range in cfs_ranges.values())
+            center_freq_khz = round((low + high) / 2)
+        self.center_freq_khz = center_freq_khz
+        self.sample_rate_hz = sample_rate_hz
+        self.overlap = overlap
+        self.num_fft = 1 << int(
+            np.ceil(np.log2(sample_rate_hz * 1e-3 / resolution_khz))
+        )
+        self.edges = bin_edges_khz(center_freq_khz, sample_rate_hz, self.num_fft)
+
+        self.slice_ids = list(cfs_ranges)
+        centers = []
+        widths = []
+        for slice_id in self.slice_ids:
+            cfs_range = cfs_ranges[slice_id]
+            if cfs_range[0] < self.edges[0] or cfs_range[1] > self.edges[-1]:
+                raise ValueError(
+                    f"CFS range {list(cfs_range)} of slice {slice_id} is outside the "
+                    f"{self.edges[0]:.0f}-{self.edges[-1]:.0f} kHz band of the capture"
+                )
+            slice_centers = channel_centers(cfs_range, channel_khz[slice_id])
+            if restricted is not None:
+                half_width = channel_khz[slice_id] / 2
+                slice_centers = slice_centers[
+                    restricted.is_clear(
+                        slice_centers - half_width, slice_centers + half_width
+                    )
+                ]
+            if slice_centers.size == 0:
+                raise ValueError(
+                    f"CFS range {list(cfs_range)} of slice {slice_id} has no unrestricted "
+                    f"{channel_khz[slice_id]:.2f} kHz channel"
+                )
+            centers.append(slice_centers)
+            widths.append(np.full(slice_centers.size, channel_khz[slice_id] / 2))
+        # Candidates of every slice in one array; slice i owns [offsets[i], offsets[i + 1])
+        self.offsets = np.cumsum([0] + [c.size for c in centers])
+        self.centers = np.concatenate(centers)
+        half_widths = np.concatenate(widths)
+        self.channel_edges = np.stack(
+            [self.centers - half_widths, self.centers + half_widths]
+        )
+
+    @classmethod
+    def from_experiment(cls, experiment, **kwargs):
+        """
+        Returns an engine for the slices of an experiment with a cfs_range. The channel of each
+        slice is as wide as its transmit bandwidth, 1 / pulse_len.
+        """
+        field = timing_simulator._field
+        cfs_ranges = {}
+        channel_khz = {}
+        for slice_id, exp_slice in experiment.slice_dict.items():
+            cfs_range = field(exp_slice, "cfs_range")
+            if cfs_range is not None:
+                cfs_ranges[slice_id] = cfs_range
+                channel_khz[slice_id] = 1e3 / field(exp_slice, "pulse_len")
+        if not cfs_ranges:
+            raise ValueError("Experiment has no CFS slices")
+        return cls(cfs_ranges, channel_khz, **kwargs)
+
+    def channel_powers(self, psd):
+        """Returns the power in every candidate channel, given a spectrum from welch_psd()."""
+        cumulative = np.concatenate(([0.0], np.cumsum(psd)))
+        powers = np.interp(self.channel_edges, self.edges, cumulative)
+        return powers[1] - powers[0]
+
+    def search(self, samples):
+        """
+        Finds the quietest channel of every slice.
+
+        :param  samples:    Complex samples of the shared capture, shape [num_samples] or
+                            [num_channels, num_samples]
+
+        :returns: Dictionary of {slice_id: (frequency in kHz, channel power)}
+        """
+        powers = self.channel_powers(welch_psd(samples, self.num_fft, self.overlap))
+        result = {}
+        for i, slice_id in enumerate(self.slice_ids):
+            start, end = self.offsets[i], self.offsets[i + 1]
+            best = start + int(np.argmin(powers[start:end]))
+            result[slice_id] = (int(self.centers[best]), float(powers[best]))
+        return result
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Search a synthetic noise capture for the CFS slices of an experiment."
+    )
+    parser.add_argument(
+        "experiment",
+        help="Experiment class as module.Class, relative to borealis_experiments",
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=MIN_CFS_DURATION_MS,
+        help="Length of the capture in ms",
+    )
+    parser.add_argument("--rate", type=float, default=DEFAULT_SAMPLE_RATE_HZ)
+    args = parser.parse_args()
+
+    module_name, class_name = args.experiment.rsplit(".", 1)
+    module = importlib.import_module(f"borealis_experiments.{module_name}")
+    engine = CfsEngine.from_experiment(
+        getattr(module, class_name)(),
+        sample_rate_hz=args.rate,
+        restricted=restricted_ranges.RestrictedRanges.from_options(scf.config),
+    )
+    num_samples = int(args.duration * 1e-3 * args.rate)
+    rng = np.random.default_rng(0)
+    samples = rng.standard_normal(2 * num_samples, dtype=np.float32).view(np.complex64)
+
+    start = time.perf_counter()
+    result = engine.search(samples)
+    elapsed = time.perf_counter() - start
+    for slice_id, (freq, power) in result.items():
+        print(f"slice {slice_id}: {freq} kHz, {10 * np.log10(power):.1f} dB")
+    print(f"searched in {elapsed * 1e3:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""
+correlator
+~~~~~~~~~~
+Reference correlator for the ACF, XCF and ACFINT products of a slice, computed from beamformed
+samples offline. For lag table entry [p1, p2], in units of tau_spacing, and range gate r, the
+correlation of arrays x and y over the sequences of an averaging period is
+
+    R[beam, r, lag] = mean_s conj(x[s, beam, p1 * tau + r0 + r]) * y[s, beam, p2 * tau + r0 + r]
+
+with tau and the first range r0 in output samples. ACF correlates the main array with itself,
+XCF the main array with the interferometer array, and ACFINT the interferometer array with itself.
+
+The sample index of every (range, lag) pair is computed once per pulse sequence, lag table and
+range layout and shared by all correlators that use it. Each product is then a gather and a single
+einsum over every sequence, beam, range and lag. Sequences can be added a few at a time as they
+arrive, and the averages read out at the end of the averaging period.
+
+Sequences transmitted with a pulse_phase_offset are decoded in the same einsum: the correlation of
+lag [p1, p2] in sequence s is multiplied by exp(-j * (phase[s, p2] - phase[s, p1])), which removes
+the encoding of the wanted echo and leaves the echoes of other pulses, the self-clutter, with
+random phases that average out over the sequences.
+
+:copyright: 2026 SuperDARN Canada
+"""
+
+import numpy as np
+
+from borealis_experiments.tools import data_rates, lag_tables, timing_simulator
+
+SPEED_OF_LIGHT = 299792458.0  # m/s
+
+# Gather indices already computed, keyed by pulse sequence, lag table and range layout
+__gather_indices__ = {}
+
+
+def gather_indices(
+    pulse_sequence,
+    tau_spacing,
+    pulse_len,
+    num_ranges,
+    first_range,
+    lag_table=None,
+    output_rate_hz=data_rates.DEFAULT_OUTPUT_RATE_HZ,
+):
+    """
+    Returns the sample indices that are correlated for every range and lag. Results are cached,
+    and the arrays are read-only.
+
+    :param  pulse_sequence: Pulse positions in units of tau_spacing
+    :param  tau_spacing:    Multi-pulse increment, in us
+    :param  pulse_len:      Pulse length, in us
+    :param  num_ranges:     Number of range gates
+    :param  first_range:    Distance to the first range gate, in km
+    :param  lag_table:      Sequence of [p1, p2] pulse positions. Defaults to the table Borealis
+                            uses for slices without one.
+    :param  output_rate_hz: Sample rate of the beamformed samples
+
+    :returns: int array of shape [2, num_ranges, num_lags] with the indices of the first and
+              second sample of each correlation
+    """
+    lag_index = lag_tables.lag_index(pulse_sequence, lag_table)
+    key = (
+        tuple(pulse_sequence),
+        lag_index.tobytes(),
+        tau_spacing,
+        pulse_len,
+        num_ranges,
+        first_range,
+        float(output_rate_hz),
+    )
+    indices = __gather_indices__.get(key)
+    if indices is not None:
+        return indices
+
+    samples_per_us = output_rate_hz * 1e-6
+    range_sep_km = pulse_len * 1e-6 * SPEED_OF_LIGHT / 2 / 1e3
+    range_samples = np.rint(
+        (np.arange(num_ranges) + round(first_range / range_sep_km))
+        * pulse_len
+        * samples_per_us
+    ).astype(np.int64)
+    lag_samples = np.rint(lag_index * (tau_spacing * samples_per_us)).astype(np.int64)
+    indices = lag_samples[:, np.newaxis, :] + range_samples[:, np.newaxis]
+    indices.setflags(write=False)
+    return __gather_indices__.setdefault(key, indices)
+
+
+class Correlator:
+    """
+    Accumulates the correlations of an averaging period.
+
+    :param  indices:        Gather indices from gather_indices()
+    :param  acf:            Correlate the main array with itself
+    :param  xcf:            Correlate the main array with the interferometer array
+    :param  acfint:         Correlate the interferometer array with itself
+    :param  pulse_index:    int array of shape [2, num_lags], the index in the pulse sequence of
+                            the two pulses of each lag. Required to decode phase-encoded
+                            sequences.
+    """
+
+    def __init__(self, indices, acf=True, xcf=False, acfint=False, pulse_index=None):
+        self.indices = indices
+        self.pulse_index = pulse_index
+        self.num_samples = int(indices.max()) + 1
+        self.products = [
+            name
+            for name, enabled in (("acf", acf), ("xcf", xcf), ("acfint", acfint))
+            if enabled
+        ]
+        self.reset()
+
+    @classmethod
+    def from_slice(cls, exp_slice):
+        """Returns a correlator for the lag table and enabled products of a slice."""
+        field = timing_simulator._field
+        pulse_sequence = field(exp_slice, "pulse_sequence")
+        indices = gather_indices(
+            pulse_sequence,
+            field(exp_slice, "tau_spacing"),
+            field(exp_slice, "pulse_len"),
+            field(exp_slice, "num_ranges"),
+            field(exp_slice, "first_range"),
+            field(exp_slice, "lag_table"),
+            data_rates.output_rate_hz(exp_slice),
+        )
+        return cls(
+            indices,
+            acf=field(exp_slice, "acf", False),
+            xcf=field(exp_slice, "xcf", False),
+            acfint=field(exp_slice, "acfint", False),
+            pulse_index=np.searchsorted(
+                pulse_sequence,
+                lag_tables.lag_index(pulse_sequence, field(exp_slice, "lag_table")),
+            ),
+        )
+
+    def reset(self):
+        """Clears the accumulated sums, to start a new averaging period."""
+        self.sums = {}
+        self.num_sequences = 0
+
+    def _correlate(self, samples_1, samples_2, decoding=None):
+        """Returns the sum over sequences of one product, shape [num_beams, num_ranges, num_lags]."""
+        first = samples_1[..., self.indices[0]]
+        second = samples_2[..., self.indices[1]]
+        if decoding is None:
+            return np.einsum("sbrl,sbrl->brl", first.conj(), second)
+        return np.einsum("sbrl,sbrl,sl->brl", first.conj(), second, decoding)
+
+    def decoding(self, phases):
+        """
+        Returns the factors that remove the phase encoding from the correlations of each sequence
+        and lag, shape [num_sequences, num_lags].
+
+        :param  phases: Pulse phase offsets of each sequence in degrees, shape
+                        [num_sequences, num_pulses]
+        """
+        if self.pulse_index is None:
+            raise ValueError("Decoding phase-encoded sequences needs the pulse_index")
+        phases = np.deg2rad(phases)
+        lag_phases = phases[:, self.pulse_index[1]] - phases[:, self.pulse_index[0]]
+        return np.exp(-1j * lag_phases).astype(np.complex64)
+
+    def accumulate(self, main, intf=None, phases=None):
+        """
+        Adds sequences of beamformed samples to the averaging period.
+
+        :param  main:   Main array samples, shape [num_sequences, num_beams, num_samples]
+        :param  intf:   Interferometer array samples, of the same shape. Required for XCF and
+                        ACFINT.
+        :param  phases: Pulse phase offsets the sequences were transmitted with, in degrees, of
+                        shape [num_sequences, num_pulses]. The sequences are decoded if given.
+        """
+        if main.shape[-1] < self.num_samples:
+            raise ValueError(
+                f"Sequences of {main.shape[-1]} samples are too short for the lag table and "
+                f"ranges, which need {self.num_samples}"
+            )
+        decoding = None if phases is None else self.decoding(phases)
+        pairs = {"acf": (main, main), "xcf": (main, intf), "acfint": (intf, intf)}
+        for name in self.products:
+            samples_1, samples_2 = pairs[name]
+            if samples_2 is None:
+                raise ValueError(f"{name} needs interferometer samples")
+            correlations = self._correlate(samples_1, samples_2, decoding)
+            if name in self.sums:
+                self.sums[name] += correlations
+            else:
+                self.sums[name] = correlations
+        self.num_sequences += main.shape[0]
+
+    def averages(self):
+        """
+        Returns a dictionary of {product: correlations averaged over the accumulated sequences},
+        each of shape [num_beams, num_ranges, num_lags].
+        """
+        return {
+            name: correlations / self.num_sequences
+            for name, correlations in self.sums.items()
+        }
+
+
+def correlate(exp_slice, main, intf=None, phases=None):
+    """
+    Correlates the sequences of one averaging period of a slice.
+
+    :param  exp_slice:  Slice dictionary or validated slice
+    :param  main:       Main array samples, shape [num_sequences, num_beams, num_samples]
+    :param  intf:       Interferometer array samples, of the same shape
+    :param  phases:     Pulse phase offsets of the sequences to decode, in degrees, of shape
+                        [num_sequences, num_pulses]
+
+    :returns: Dictionary of {product: correlations} for each product enabled by the slice, each of
+              shape [num_beams, num_ranges, num_lags]
+    """
+    correlator = Correlator.from_slice(exp_slice)
+    correlator.accumulate(main, intf, phases)
+    return correlator.averages()
@@ -0,0 +1,262 @@
+#!/usr/bin/python
+
+"""
+data_rates
+~~~~~~~~~~
+Computes the sequence length, sequences per averaging period and the size of each data product
+of every slice in an experiment, so disk and network capacity can be planned before a mode is
+scheduled.
+
+Sizes assume complex64 samples, stored as Borealis does:
+
+    antennas_iq:    [num_antennas, num_sequences, num_samples] per averaging period
+    bfiq:           [2 arrays (main, intf), num_sequences, num_beams, num_samples] per averaging period
+    rawacf:         [num_beams, num_ranges, num_lags] for each of the main ACF, interferometer ACF
+                    and XCF that the slice enables, per record
+
+The number of averaging periods per day comes from the duty cycle of each slice in the timing
+simulator, so scanbounds and interfacing are accounted for.
+
+Usage: python3 -m borealis_experiments.tools.data_rates [module.Class ...]
+
+:copyright: 2026 SuperDARN Canada
+"""
+
+import argparse
+import importlib
+import inspect
+import math
+import pkgutil
+from types import MappingProxyType
+
+import numpy as np
+
+import borealis_experiments.superdarn_common_fields as scf
+from borealis_experiments.tools import lag_tables, timing_simulator
+
+BYTES_PER_SAMPLE = np.dtype(np.complex64).itemsize
+SECONDS_PER_DAY = 86400
+
+# Output sample rate of the default decimation scheme, for slices that do not set one
+DEFAULT_OUTPUT_RATE_HZ = 10e3 / 3
+
+# Slice rates already computed, keyed by the signature of the fields they depend on
+__slice_rates__ = {}
+
+
+def num_lags(pulse_sequence, lag_table=None):
+    """
+    Returns the number of lags in a slice's lag table. Without one, Borealis uses every pulse pair
+    plus lag 0 and the alternate lag 0.
+    """
+    if lag_table is not None:
+        return len(lag_table)
+    return len(lag_tables.borealis_lag_table(pulse_sequence))
+
+
+def num_rx_beams(rx_beam_order):
+    """Returns the largest number of receive beams formed in one averaging period."""
+    return max(
+        len(beams) if isinstance(beams, (list, tuple)) else 1 for beams in rx_beam_order
+    )
+
+
+def output_rate_hz(exp_slice):
+    """Returns the output sample rate of a slice's decimation scheme, in Hz."""
+    scheme = timing_simulator._field(exp_slice, "decimation_scheme")
+    if scheme is None:
+        return DEFAULT_OUTPUT_RATE_HZ
+    return scheme.output_sample_rate
+
+
+def _slice_signature(exp_slice, num_antennas):
+    field = timing_simulator._field
+    lag_table = field(exp_slice, "lag_table")
+    intt = field(exp_slice, "intt")
+    return (
+        tuple(field(exp_slice, "pulse_sequence")),
+        field(exp_slice, "tau_spacing"),
+        field(exp_slice, "pulse_len"),
+        field(exp_slice, "num_ranges"),
+        field(exp_slice, "first_range"),
+        float(output_rate_hz(exp_slice)),
+        np.nan if intt is None else float(intt),
+        field(exp_slice, "intn") or np.nan,
+        None if lag_table is None else len(lag_table),
+        num_rx_beams(field(exp_slice, "rx_beam_order")),
+        sum(bool(field(exp_slice, name, False)) for name in ("acf", "xcf", "acfint")),
+        num_antennas,
+    )
+
+
+def slice_rates(exp_slice, num_antennas=None):
+    """
+    Computes the sequence length and data product sizes of a slice. Results are cached per
+    combination of the fields they depend on, so slices that share them are computed once.
+
+    :param  exp_slice:      Slice dictionary or validated slice
+    :param  num_antennas:   Number of receive antennas. Defaults to the main and interferometer
+                            antennas of the current site.
+
+    :returns: Read-only dictionary with 'sequence_us', 'num_sequences', 'aveperiod_s',
+              'num_samples' per sequence, 'num_lags', 'antennas_iq_bytes' and 'bfiq_bytes' per
+              averaging period and 'rawacf_bytes' per record
+    """
+    if num_antennas is None:
+        config = scf.load_site().config
+        num_antennas = config.main_antenna_count + config.intf_antenna_count
+    signature = _slice_signature(exp_slice, num_antennas)
+    rates = __slice_rates__.get(signature)
+    if rates is not None:
+        return rates
+
+    (
+        pulse_sequence,
+        tau_spacing,
+        pulse_len,
+        num_ranges,
+        first_range,
+        rate_hz,
+        intt_ms,
+        intn,
+        lag_table_len,
+        num_beams,
+        num_correlations,
+        num_antennas,
+    ) = signature
+    sequence_us = timing_simulator.sequence_duration_us(
+        pulse_sequence, tau_spacing, pulse_len, num_ranges, first_range
+    )
+    num_sequences = int(
+        timing_simulator.num_sequences(intt_ms * 1e-3, intn, sequence_us * 1e-6)
+    )
+    num_samples = math.ceil(sequence_us * 1e-6 * rate_hz)
+    lags = lag_table_len or num_lags(pulse_sequence)
+    rates = {
+        "sequence_us": sequence_us,
+        "num_sequences": num_sequences,
+        "aveperiod_s": num_sequences * sequence_us * 1e-6,
+        "num_samples": num_samples,
+        "num_lags": lags,
+        "antennas_iq_bytes": num_antennas
+        * num_sequences
+        * num_samples
+        * BYTES_PER_SAMPLE,
+        "bfiq_bytes": 2 * num_sequences * num_beams * num_samples * BYTES_PER_SAMPLE,
+        "rawacf_bytes": num_correlations
+        * num_beams
+        * num_ranges
+        * lags
+        * BYTES_PER_SAMPLE,
+    }
+    rates = __slice_rates__.setdefault(signature, MappingProxyType(rates))
+    return rates
+
+
+def experiment_rates(
+    experiment,
+    aveperiod_overhead_ms=timing_simulator.DEFAULT_AVEPERIOD_OVERHEAD_MS,
+    num_antennas=None,
+):
+    """
+    Computes the data rates of every slice in an experiment, including daily storage.
+
+    :param  experiment:             Built ExperimentPrototype
+    :param  aveperiod_overhead_ms:  Processing time after each averaging period, in ms
+    :param  num_antennas:           Number of receive antennas. Defaults to the current site.
+
+    :returns: Dictionary of {slice_id: dictionary} with the keys of slice_rates() plus
+              'records_per_day' and '<product>_bytes_per_day' for each data product
+    """
+    num_scans = 5
+    report = timing_simulator.sweep(
+        experiment, aveperiod_overhead_ms=aveperiod_overhead_ms, num_scans=num_scans
+    )
+    rates = {}
+    for slice_id, exp_slice in experiment.slice_dict.items():
+        slice_rate = dict(slice_rates(exp_slice, num_antennas))
+        # One record per averaging period of the slice in each run through all scans
+        records_per_day = (
+            float(report["slices"][slice_id]["num_aveperiods"])
+            / num_scans
+            * SECONDS_PER_DAY
+            / float(report["cycle_s"])
+        )
+        slice_rate["records_per_day"] = records_per_day
+        for product in ("antennas_iq", "bfiq", "rawacf"):
+            slice_rate[f"{product}_bytes_per_day"] = (
+                records_per_day * slice_rate[f"{product}_bytes"]
+            )
+        rates[slice_id] = slice_rate
+    return rates
+
+
+def top_level_experiments():
+    """
+    Returns a dictionary of {module.Class: class} for every experiment at the top level of
+    borealis_experiments.
+    """
+    package = importlib.import_module("borealis_experiments")
+    experiments = {}
+    for module_info in pkgutil.iter_modules(package.__path__):
+        if module_info.ispkg or module_info.name == "superdarn_common_fields":
+            continue
+        module_name = f"borealis_experiments.{module_info.name}"
+        module = importlib.import_module(module_name)
+        for class_name, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ == module_name and hasattr(cls, "cpid"):
+                experiments[f"{module_info.name}.{class_name}"] = cls
+    return dict(sorted(experiments.items()))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Print the sequence length and data rates of experiments."
+    )
+    parser.add_argument(
+        "experiments",
+        nargs="*",
+        help="Experiment classes as module.Class. Defaults to every top-level experiment.",
+    )
+    parser.add_argument(
+        "--overhead-ms",
+        type=float,
+        default=timing_simulator.DEFAULT_AVEPERIOD_OVERHEAD_MS,
+        help="Processing time after each averaging period, in ms",
+    )
+    args = parser.parse_args()
+
+    if args.experiments:
+        classes = {}
+        for name in args.experiments:
+            module_name, class_name = name.rsplit(".", 1)
+            module = importlib.import_module(f"borealis_experiments.{module_name}")
+            classes[name] = getattr(module, class_name)
+    else:
+        classes = top_level_experiments()
+
+    print(
+        f"{'experiment':<44} {'slice':>5} {'seq (ms)':>8} {'seqs':>5} {'rawacf (kB)':>11} "
+        f"{'bfiq (MB)':>9} {'ant iq (MB)':>11} {'records/day':>11} {'rawacf GB/day':>13} "
+        f"{'bfiq GB/day':>11} {'ant iq GB/day':>13}"
+    )
+    for name, cls in classes.items():
+        try:
+            experiment = cls()
+        except Exception as e:
+            print(f"{name:<44} could not be built: {type(e).__name__}: {e}")
+            continue
+        for slice_id, rates in experiment_rates(experiment, args.overhead_ms).items():
+            print(
+                f"{name:<44} {slice_id:>5} {rates['sequence_us'] * 1e-3:>8.2f} "
+                f"{rates['num_sequences']:>5} {rates['rawacf_bytes'] / 1e3:>11.1f} "
+                f"{rates['bfiq_bytes'] / 1e6:>9.2f} {rates['antennas_iq_bytes'] / 1e6:>11.2f} "
+                f"{rates['records_per_day']:>11.0f} "
+                f"{rates['rawacf_bytes_per_day'] / 1e9:>13.2f} "
+                f"{rates['bfiq_bytes_per_day'] / 1e9:>11.2f} "
+                f"{rates['antennas_iq_bytes_per_day'] / 1e9:>13.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
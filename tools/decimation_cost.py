@@ -0,0 +1,142 @@
+"""
+decimation_cost
+~~~~~~~~~~~~~~~
+Estimates the compute cost of a DecimationScheme before it is scheduled, and measures the real
+throughput of a CPU polyphase reference implementation on synthetic data.
+
+Costs are counted in complex multiply-accumulates (MACs): each output sample of a stage costs one
+MAC per filter tap, since a polyphase decimator only computes the samples that are kept. The
+first stage is a bandpass filter with complex taps for each receive frequency (8 real FLOPs per
+MAC), while the later stages are low-pass filters with real taps (4 real FLOPs per MAC).
+
+:copyright: 2026 SuperDARN Canada
+"""
+
+import time
+
+import numpy as np
+
+from borealis_experiments.tools import polyphase
+
+BYTES_PER_SAMPLE = np.dtype(np.complex64).itemsize
+
+# Nominal sustained complex MAC rate of the signal processing GPU, used to estimate load
+DEFAULT_GPU_MACS_PER_S = 2.5e11
+
+
+def scheme_cost(scheme, num_antennas=20, num_freqs=1, sequence_duration_s=0.1):
+    """
+    Computes the compute and memory cost of a decimation scheme.
+
+    :param  scheme:                 DecimationScheme to evaluate
+    :param  num_antennas:           Number of receive antennas (main + interferometer)
+    :param  num_freqs:              Number of receive frequencies filtered at once
+    :param  sequence_duration_s:    Length of the data processed at a time, in seconds
+
+    :returns: Dictionary with 'stages', a list of per-stage dictionaries, and totals:
+              'output_rate', 'macs_per_s_per_antenna', 'macs_per_s', 'flops_per_s' and
+              'buffer_bytes', the memory for the input and every intermediate buffer of one sequence
+    """
+    num_samples = int(np.ceil(sequence_duration_s * scheme.stages[0].input_rate))
+    buffer_bytes = num_antennas * num_samples * BYTES_PER_SAMPLE
+
+    stages = []
+    macs_per_s_per_antenna = 0.0
+    flops_per_s = 0.0
+    for stage in scheme.stages:
+        output_rate = stage.input_rate / stage.dm_rate
+        num_taps = len(stage.filter_taps)
+        num_samples = int(np.ceil(num_samples / stage.dm_rate))
+        stage_macs = output_rate * num_taps * num_freqs
+        stage_bytes = num_antennas * num_freqs * num_samples * BYTES_PER_SAMPLE
+        stages.append(
+            {
+                "stage_num": stage.stage_num,
+                "input_rate": stage.input_rate,
+                "output_rate": output_rate,
+                "dm_rate": stage.dm_rate,
+                "num_taps": num_taps,
+                "macs_per_s_per_antenna": stage_macs,
+                "buffer_bytes": stage_bytes,
+            }
+        )
+        macs_per_s_per_antenna += stage_macs
+        flops_per_s += (
+            stage_macs * num_antennas * (8 if stage is scheme.stages[0] else 4)
+        )
+        buffer_bytes += stage_bytes
+
+    return {
+        "stages": stages,
+        "output_rate": scheme.stages[-1].input_rate / scheme.stages[-1].dm_rate,
+        "macs_per_s_per_antenna": macs_per_s_per_antenna,
+        "macs_per_s": macs_per_s_per_antenna * num_antennas,
+        "flops_per_s": flops_per_s,
+        "buffer_bytes": buffer_bytes,
+    }
+
+
+def estimated_load(cost, macs_per_s):
+    """
+    Returns the fraction of a device's throughput that a scheme uses in real time.
+
+    :param  cost:       Output of scheme_cost()
+    :param  macs_per_s: Sustained complex MAC rate of the device
+    """
+    return cost["macs_per_s"] / macs_per_s
+
+
+def reference_decimate(scheme, samples):
+    """
+    Runs samples through every stage of a scheme with the CPU polyphase decimator.
+
+    :param  scheme:     DecimationScheme to apply
+    :param  samples:    Complex samples at the scheme input rate, shape [num_antennas, num_samples]
+
+    :returns: Decimated samples, shape [num_antennas, num_output_samples]
+    """
+    return polyphase.PolyphaseDecimator(scheme).process(samples)
+
+
+def synthetic_samples(num_antennas, num_samples, sample_rate, seed=0):
+    """
+    Returns complex64 noise with a tone at 1 kHz, shape [num_antennas, num_samples].
+    """
+    rng = np.random.default_rng(seed)
+    samples = rng.standard_normal((num_antennas, 2 * num_samples), dtype=np.float32)
+    samples = samples.view(np.complex64)
+    samples += np.exp(2j * np.pi * 1e3 * np.arange(num_samples) / sample_rate).astype(
+        np.complex64
+    )
+    return samples
+
+
+def measure_throughput(scheme, num_antennas=20, duration_s=0.1, repeats=3, seed=0):
+    """
+    Times the CPU polyphase reference on synthetic data at the scheme input rate.
+
+    :param  scheme:         DecimationScheme to run
+    :param  num_antennas:   Number of antennas of synthetic data
+    :param  duration_s:     Length of synthetic data, in seconds
+    :param  repeats:        Number of timed runs; the fastest is reported
+    :param  seed:           Seed for the synthetic noise
+
+    :returns: Dictionary with 'seconds', the fastest run time, 'realtime_factor', the ratio of
+              data duration to run time, and 'macs_per_s', the achieved complex MAC rate
+    """
+    input_rate = scheme.stages[0].input_rate
+    samples = synthetic_samples(
+        num_antennas, int(duration_s * input_rate), input_rate, seed=seed
+    )
+    best_s = np.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        reference_decimate(scheme, samples)
+        best_s = min(best_s, time.perf_counter() - start)
+
+    cost = scheme_cost(scheme, num_antennas=num_antennas)
+    return {
+        "seconds": best_s,
+        "realtime_factor": duration_s / best_s,
+        "macs_per_s": cost["macs_per_s"] * duration_s / best_s,
+    }
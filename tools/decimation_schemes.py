@@ -0,0 +1,177 @@
+"""
+decimation_schemes
+~~~~~~~~~~~~~~~~~~
+Registry of named decimation schemes shared by experiments. Each scheme is described by the design
+parameters of its FIR filter stages. The designed taps are kept in memory and, when the cache is
+writable, stored in a content-addressed .npy file keyed by those parameters, so experiment start-up
+reads them with a memory-mapped load instead of re-running the filter design.
+
+Each stage is a dictionary with the following keys:
+
+    dm_rate:            Downsampling rate after the filter
+    cutoff_hz:          Bandwidth of the filter output
+    scaling_factor:     Multiplicative factor applied to the taps
+    transition_width:   Transition from passband to stopband (Kaiser filters designed by attenuation)
+    ripple_db:          dB between passband and stopband (Kaiser filters designed by attenuation)
+    num_taps:           Number of taps (filters designed by number of taps)
+
+:copyright: 2026 SuperDARN Canada
+"""
+
+import os
+
+import numpy as np
+
+from borealis_experiments.tools import cache
+from utils import decimation_scheme as dm
+
+# Increment when the way taps are designed changes, so that stale cached taps are not reused
+FILTER_DESIGN_VERSION = 1
+
+SCHEMES = {
+    # Two-stage Kaiser scheme with a 3.33 kHz output rate, for 45 km range gates.
+    # Used by bistatic_test and concurrent_bistatic.
+    "two_stage_kaiser": {
+        "sample_rate": 5e6,
+        "stages": [
+            {
+                "dm_rate": 30,
+                "transition_width": 150e3,
+                "cutoff_hz": 10e3,
+                "ripple_db": 115,
+                "scaling_factor": 1000.0,
+            },
+            {
+                "dm_rate": 50,
+                "transition_width": 30e3,
+                "cutoff_hz": 5e3,
+                "ripple_db": 50,
+                "scaling_factor": 10000.0,
+            },
+        ],
+    },
+    # Two-stage scheme with a 10 kHz output rate, for 15 km range gates.
+    # Used by full_fov_15km, normalscan_15km, pgr_haarpscan and the range0 variants.
+    "two_stage_kaiser_15km": {
+        "sample_rate": 5e6,
+        "stages": [
+            {
+                "dm_rate": 25,
+                "transition_width": 150e3,
+                "cutoff_hz": 10e3,
+                "ripple_db": 115,
+                "scaling_factor": 1000.0,
+            },
+            {
+                "dm_rate": 20,
+                "cutoff_hz": 5e3,
+                "num_taps": 41,
+                "scaling_factor": 10000.0,
+            },
+        ],
+    },
+    # Wide passband, single stage scheme with a 333 kHz output rate (beware!).
+    # Same design as archive/noise_search, which keeps its own copy because it imports the older
+    # experiment_prototype package layout rather than utils.
+    "wideband_165khz": {
+        "sample_rate": 5e6,
+        "stages": [
+            {
+                "dm_rate": 15,
+                "transition_width": 100e3,
+                "cutoff_hz": 165e3,
+                "ripple_db": 200,
+                "scaling_factor": 1.0,
+            },
+        ],
+    },
+}
+
+# Memory-mapped taps that have been loaded by this process, keyed by content key
+__loaded_taps__ = {}
+
+
+def register_scheme(name, sample_rate, stages):
+    """
+    Adds a named scheme to the registry.
+
+    :param  name:           Name to look the scheme up by
+    :param  sample_rate:    Input sample rate of the first stage, in Hz
+    :param  stages:         List of stage dictionaries, as described in the module docstring
+    """
+    if name in SCHEMES:
+        raise ValueError(f"Decimation scheme {name} is already registered")
+    for i, stage in enumerate(stages):
+        if ("ripple_db" in stage) == ("num_taps" in stage):
+            raise ValueError(
+                f"Stage {i} of {name} must specify exactly one of ripple_db and num_taps"
+            )
+        if "ripple_db" in stage and "transition_width" not in stage:
+            raise ValueError(f"Stage {i} of {name} is missing transition_width")
+    SCHEMES[name] = {"sample_rate": sample_rate, "stages": stages}
+
+
+def filter_taps(rate, stage):
+    """
+    Returns the scaled taps of a filter stage as a read-only array, designing them the first time
+    these parameters are used. Taps are kept in memory, and cached on disk when the cache is
+    writable, so later runs load them with a memory-mapped read.
+
+    :param  rate:   Input sample rate of the stage, in Hz
+    :param  stage:  Stage dictionary, as described in the module docstring
+    """
+    params = dict(stage, rate=float(rate), version=FILTER_DESIGN_VERSION)
+    params.pop("dm_rate")  # does not change the filter
+    key = cache.content_key(params, length=32)
+
+    taps = __loaded_taps__.get(key)
+    if taps is not None:
+        return taps
+
+    # The disk cache is best-effort, e.g. the home directory may not be writable
+    try:
+        path = os.path.join(cache.cache_dir("filter_taps"), f"{key}.npy")
+        taps = cache.load_array(path)
+    except OSError:
+        path = None
+    if taps is None:
+        if "num_taps" in stage:
+            designed = dm.create_firwin_filter_by_num_taps(
+                rate, stage["cutoff_hz"], stage["num_taps"]
+            )
+        else:
+            designed = dm.create_firwin_filter_by_attenuation(
+                rate, stage["transition_width"], stage["cutoff_hz"], stage["ripple_db"]
+            )
+        taps = stage["scaling_factor"] * np.asarray(designed)
+        taps.setflags(write=False)
+        if path is not None:
+            try:
+                cache.write_array(path, taps)
+            except OSError:
+                pass
+
+    return __loaded_taps__.setdefault(key, taps)
+
+
+def decimation_scheme(name):
+    """
+    Builds a DecimationScheme from the registry, loading cached filter taps.
+
+    :param  name:   Name of a registered scheme, e.g. 'two_stage_kaiser'
+    """
+    if name not in SCHEMES:
+        raise ValueError(
+            f"Unknown decimation scheme {name}. Registered schemes: {sorted(SCHEMES.keys())}"
+        )
+    sample_rate = SCHEMES[name]["sample_rate"]
+
+    dm_rate_so_far = 1
+    stages = []
+    for i, stage in enumerate(SCHEMES[name]["stages"]):
+        rate = sample_rate / dm_rate_so_far
+        taps = filter_taps(rate, stage)
+        stages.append(dm.DecimationStage(i, rate, stage["dm_rate"], taps.tolist()))
+        dm_rate_so_far *= stage["dm_rate"]
+
+    return dm.DecimationScheme(sample_rate, sample_rate / dm_rate_so_far, stages=stages)
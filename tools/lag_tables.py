@@ -0,0 +1,229 @@
+"""
+lag_tables
+~~~~~~~~~~
+Creates and checks lag tables. A lag table is a sequence of [p1, p2] pulse positions, in units of
+tau_spacing, whose samples are correlated to measure lag p2 - p1. Borealis uses every pulse pair
+when a slice has no lag table, so sequences with repeated lags measure them more than once, while
+other lags are never measured.
+
+lag_analysis() finds the pairs of every lag, the lags measured more than once and the lags that are
+missing, and picks one pair per lag. When the pulse timing is known, the best pair is the one with
+the fewest range gates blanked by transmitted pulses; otherwise the first pair is used.
+lag_table() builds a table from those pairs, and lag_index() turns any table into a compact int16
+array for correlators. Results are memoized per sequence, so slices that share a sequence share
+one table.
+
+:copyright: 2026 SuperDARN Canada
+"""
+
+import collections
+import itertools
+from types import MappingProxyType
+
+import numpy as np
+
+SPEED_OF_LIGHT = 299792458.0  # m/s
+
+# Analyses and tables already computed, keyed by pulse sequence and timing
+__lag_analyses__ = {}
+__lag_tables__ = {}
+__lag_indices__ = {}
+
+
+def borealis_lag_table(pulse_sequence):
+    """
+    Returns the lag table Borealis uses for slices without one: lag 0, every pulse pair sorted by
+    lag, then the alternate lag 0 of the last pulse.
+    """
+    pulse_sequence = tuple(pulse_sequence)
+    pairs = sorted(
+        itertools.combinations(pulse_sequence, 2), key=lambda pair: pair[1] - pair[0]
+    )
+    return tuple(
+        [(pulse_sequence[0], pulse_sequence[0])]
+        + pairs
+        + [(pulse_sequence[-1], pulse_sequence[-1])]
+    )
+
+
+def pulse_overlap(starts_us, duration_us, pulse_sequence, tau_spacing, pulse_len):
+    """
+    Returns True for every interval [start, start + duration) that overlaps a transmitted pulse.
+
+    :param  starts_us:      Array of interval start times, in us from the start of the first pulse
+    :param  duration_us:    Length of every interval, in us
+    :param  pulse_sequence: Pulse positions in units of tau_spacing
+    :param  tau_spacing:    Multi-pulse increment, in us
+    :param  pulse_len:      Pulse length, in us
+    """
+    pulse_starts = np.sort(np.asarray(pulse_sequence, dtype=np.float64)) * tau_spacing
+    pulse_ends = pulse_starts + pulse_len
+    starts_us = np.asarray(starts_us, dtype=np.float64)
+    # First pulse that ends after each interval starts; only it can overlap the interval
+    index = np.searchsorted(pulse_ends, starts_us, side="right")
+    in_sequence = index < pulse_starts.size
+    next_start = pulse_starts[np.minimum(index, pulse_starts.size - 1)]
+    return in_sequence & (next_start < starts_us + duration_us)
+
+
+def _blanked_gates(
+    pairs, pulse_sequence, tau_spacing, pulse_len, num_ranges, first_range
+):
+    """
+    Returns the number of range gates at which either sample of each pair overlaps a transmitted
+    pulse, with the sample and pulse lengths both equal to pulse_len.
+    """
+    range_sep_km = pulse_len * 1e-6 * SPEED_OF_LIGHT / 2 / 1e3
+    gates_us = (np.arange(num_ranges) + round(first_range / range_sep_km)) * pulse_len
+    # [num_pairs, 2, num_ranges] sample start times
+    starts_us = np.asarray(pairs)[..., np.newaxis] * tau_spacing + gates_us
+    overlaps = pulse_overlap(
+        starts_us, pulse_len, pulse_sequence, tau_spacing, pulse_len
+    )
+    return overlaps.any(axis=1).sum(axis=-1)
+
+
+def lag_analysis(
+    pulse_sequence,
+    tau_spacing=None,
+    pulse_len=None,
+    num_ranges=75,
+    first_range=180,
+):
+    """
+    Finds the pulse pairs of every lag of a pulse sequence.
+
+    :param  pulse_sequence: Pulse positions in units of tau_spacing
+    :param  tau_spacing:    Multi-pulse increment, in us. Used with pulse_len to pick the pair with
+                            the fewest blanked range gates for each lag.
+    :param  pulse_len:      Pulse length, in us
+    :param  num_ranges:     Number of range gates checked for blanking
+    :param  first_range:    Distance to the first range gate, in km
+
+    :returns: Read-only dictionary with 'pairs', {lag: tuple of pairs}, 'duplicates', the lags
+              with more than one pair, 'missing', the lags between 1 and 'max_lag' with no pair,
+              'best', {lag: pair}, and 'blanked', {lag: blanked range gates of the best pair}
+              if the timing was given
+    """
+    pulse_sequence = tuple(pulse_sequence)
+    key = (pulse_sequence, tau_spacing, pulse_len, num_ranges, first_range)
+    analysis = __lag_analyses__.get(key)
+    if analysis is not None:
+        return analysis
+
+    pairs = collections.defaultdict(list)
+    for pair in itertools.combinations(sorted(pulse_sequence), 2):
+        pairs[pair[1] - pair[0]].append(pair)
+    pairs = {lag: tuple(pairs[lag]) for lag in sorted(pairs)}
+    max_lag = max(pairs, default=0)
+
+    best = {lag: lag_pairs[0] for lag, lag_pairs in pairs.items()}
+    blanked = None
+    if tau_spacing is not None and pulse_len is not None:
+        blanked = {}
+        for lag, lag_pairs in pairs.items():
+            counts = _blanked_gates(
+                lag_pairs,
+                pulse_sequence,
+                tau_spacing,
+                pulse_len,
+                num_ranges,
+                first_range,
+            )
+            best[lag] = lag_pairs[int(np.argmin(counts))]
+            blanked[lag] = int(counts.min())
+        blanked = MappingProxyType(blanked)
+
+    analysis = MappingProxyType(
+        {
+            "pairs": MappingProxyType(pairs),
+            "duplicates": MappingProxyType(
+                {
+                    lag: lag_pairs
+                    for lag, lag_pairs in pairs.items()
+                    if len(lag_pairs) > 1
+                }
+            ),
+            "missing": tuple(lag for lag in range(1, max_lag) if lag not in pairs),
+            "max_lag": max_lag,
+            "best": MappingProxyType(best),
+            "blanked": blanked,
+        }
+    )
+    return __lag_analyses__.setdefault(key, analysis)
+
+
+def lag_table(pulse_sequence, max_lag=None, **timing):
+    """
+    Creates a lag table with one pair per lag: lag 0, the best pair of each lag up to max_lag,
+    then the alternate lag 0 of the last pulse.
+
+    :param  pulse_sequence: Pulse positions in units of tau_spacing
+    :param  max_lag:        Largest lag to include. Defaults to every lag of the sequence.
+    :param  timing:         tau_spacing, pulse_len, num_ranges and first_range, passed to
+                            lag_analysis() to pick the best pairs
+
+    :returns: Tuple of (p1, p2) tuples
+    """
+    pulse_sequence = tuple(pulse_sequence)
+    key = (pulse_sequence, max_lag, tuple(sorted(timing.items())))
+    table = __lag_tables__.get(key)
+    if table is not None:
+        return table
+
+    best = lag_analysis(pulse_sequence, **timing)["best"]
+    table = (
+        ((pulse_sequence[0], pulse_sequence[0]),)
+        + tuple(pair for lag, pair in best.items() if max_lag is None or lag <= max_lag)
+        + ((pulse_sequence[-1], pulse_sequence[-1]),)
+    )
+    return __lag_tables__.setdefault(key, table)
+
+
+def validate_lag_table(pulse_sequence, table):
+    """
+    Checks a lag table against its pulse sequence.
+
+    :param  pulse_sequence: Pulse positions in units of tau_spacing
+    :param  table:          Sequence of [p1, p2] pulse positions
+
+    :raises ValueError:     If a pair uses a pulse that is not in the sequence, or has p2 < p1
+
+    :returns: Dictionary with 'duplicates', {lag: pairs} for lags in the table more than once,
+              and 'missing', the lags of the sequence that the table does not measure
+    """
+    pulses = set(pulse_sequence)
+    lags = collections.defaultdict(list)
+    for pair in table:
+        if pair[0] not in pulses or pair[1] not in pulses:
+            raise ValueError(
+                f"Lag {list(pair)} not valid; One of the pulses does not exist in the sequence"
+            )
+        if pair[1] < pair[0]:
+            raise ValueError(f"Lag {list(pair)} not valid; Pulses are out of order")
+        if pair[0] != pair[1]:
+            lags[pair[1] - pair[0]].append(tuple(pair))
+    return {
+        "duplicates": {lag: pairs for lag, pairs in lags.items() if len(pairs) > 1},
+        "missing": tuple(
+            lag for lag in lag_analysis(pulse_sequence)["pairs"] if lag not in lags
+        ),
+    }
+
+
+def lag_index(pulse_sequence, table=None):
+    """
+    Returns a lag table as a read-only int16 array of shape [2, num_lags], the pulse positions of
+    the first and second sample of each lag, for use by correlators. Defaults to the table Borealis
+    uses for slices without one.
+    """
+    if table is None:
+        table = borealis_lag_table(pulse_sequence)
+    key = (tuple(pulse_sequence), tuple(tuple(pair) for pair in table))
+    index = __lag_indices__.get(key)
+    if index is None:
+        validate_lag_table(pulse_sequence, table)
+        index = np.array(table, dtype=np.int16).T.copy()
+        index.setflags(write=False)
+        index = __lag_indices__.setdefault(key, index)
+    return index
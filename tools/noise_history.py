@@ -0,0 +1,362 @@
+#!/usr/bin/python
+
+"""
+noise_history
+~~~~~~~~~~~~~
+Store of the noise floor measured by a site, per frequency bin and beam, so that noise from
+noise_search and the sounding slices is kept between runs. Each site has one fixed-size ring
+buffer of records (time, frequency bin, beam, noise in dB) in a memory-mapped .npy file, and a
+small memory-mapped counter of the records written so far. Records are appended in time order, and
+once the buffer is full the oldest ones are overwritten.
+
+Records are also summed into rolling aggregates as they are appended: for every time bucket of
+BUCKET_S seconds, the running totals of power, in linear units, and of record counts of every
+(frequency bin, beam) since the oldest bucket kept. The totals over a window are then the
+difference of two rows, found with np.searchsorted() on the bucket times, so queries like "the
+quietest frequencies in the last hour" cost one row per (frequency bin, beam) however many records
+are in the window, and never parse data files. Windows are rounded out to whole buckets. Readers
+fold in the records appended since their last query, so a read-only store sees new records too.
+
+Usage: python3 -m borealis_experiments.tools.noise_history site_id [--window s] [-n N]
+
+:copyright: 2026 SuperDARN Canada
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from borealis_experiments.tools import cache
+
+DEFAULT_CAPACITY = 2**18
+DEFAULT_BIN_KHZ = 10
+# Time resolution of the rolling aggregates, in seconds
+BUCKET_S = 60
+
+RECORD_DTYPE = np.dtype(
+    [("time", "<f8"), ("freq_bin", "<i4"), ("beam", "<i2"), ("noise_db", "<f4")]
+)
+
+
+def store_dir(site_id):
+    """Returns the directory of the noise store of a site."""
+    return cache.cache_dir("noise", site_id)
+
+
+class NoiseStore:
+    """
+    Ring buffer of noise records of one site.
+
+    :param  site_id:    Three-letter site code
+    :param  writable:   Open the store for appending, creating it if it does not exist
+    :param  capacity:   Number of records kept, when creating the store
+    :param  bin_khz:    Width of a frequency bin in kHz, when creating the store
+    :param  directory:  Directory of the store. Defaults to the cache of the site.
+
+    :raises FileNotFoundError:  If the store does not exist and is not opened for writing
+    """
+
+    def __init__(
+        self,
+        site_id,
+        writable=False,
+        capacity=DEFAULT_CAPACITY,
+        bin_khz=DEFAULT_BIN_KHZ,
+        directory=None,
+    ):
+        if directory is None:
+            directory = store_dir(site_id)
+        elif writable:
+            os.makedirs(directory, exist_ok=True)
+        records_path = os.path.join(directory, "records.npy")
+        state_path = os.path.join(directory, "state.npy")
+        self.site_id = site_id
+        if writable and not os.path.exists(state_path):
+            records = np.lib.format.open_memmap(
+                records_path, mode="w+", dtype=RECORD_DTYPE, shape=(capacity,)
+            )
+            del records
+            # [records written, bin width in kHz]
+            state = np.lib.format.open_memmap(
+                state_path, mode="w+", dtype=np.float64, shape=(2,)
+            )
+            state[:] = (0, bin_khz)
+            state.flush()
+            del state
+        mode = "r+" if writable else "r"
+        self.records = np.load(records_path, mmap_mode=mode)
+        self.state = np.load(state_path, mmap_mode=mode)
+        self.capacity = self.records.shape[0]
+        self.bin_khz = float(self.state[1])
+
+        # Rolling aggregates: column of every (frequency bin, beam), and the running totals of each
+        # column up to the end of every bucket in _bucket_ids, in the first _num_rows rows
+        self._columns = {}
+        self._column_bins = np.zeros(0, dtype=np.int32)
+        self._column_beams = np.zeros(0, dtype=np.int16)
+        self._bin_index = None
+        self._bucket_ids = np.zeros(0, dtype=np.int64)
+        self._power = np.zeros((0, 0))
+        self._counts = np.zeros((0, 0), dtype=np.int64)
+        self._num_rows = 0
+        self._folded = 0
+        self._update()
+
+    @property
+    def num_written(self):
+        """Number of records appended since the store was created."""
+        return int(self.state[0])
+
+    def freq_bins(self, freqs_khz):
+        """Returns the frequency bin of each frequency."""
+        return np.rint(np.asarray(freqs_khz) / self.bin_khz).astype(np.int32)
+
+    def append(self, times, freqs_khz, beams, noise_db):
+        """
+        Appends noise records. Arguments are broadcast together.
+
+        :param  times:      Unix times in seconds, not before the last record in the store
+        :param  freqs_khz:  Frequencies in kHz
+        :param  beams:      Beam numbers
+        :param  noise_db:   Noise floor in dB
+        """
+        times, freqs_khz, beams, noise_db = np.broadcast_arrays(
+            times, freqs_khz, beams, noise_db
+        )
+        order = np.argsort(times.ravel(), kind="stable")
+        new = np.empty(order.size, dtype=RECORD_DTYPE)
+        new["time"] = times.ravel()[order]
+        new["freq_bin"] = self.freq_bins(freqs_khz.ravel()[order])
+        new["beam"] = beams.ravel()[order]
+        new["noise_db"] = noise_db.ravel()[order]
+        written = self.num_written
+        if written and new.size and new["time"][0] < self._last_time():
+            raise ValueError("Noise records must be appended in time order")
+
+        # Only the newest records fit if there are more than the capacity
+        new = new[-self.capacity :]
+        start = (written + order.size - new.size) % self.capacity
+        first = min(new.size, self.capacity - start)
+        self.records[start : start + first] = new[:first]
+        self.records[: new.size - first] = new[first:]
+        self.records.flush()
+        # The counter is updated last, so readers never see unwritten records
+        self.state[0] = written + order.size
+        self.state.flush()
+        self._update()
+
+    def _last_time(self):
+        return self.records["time"][(self.num_written - 1) % self.capacity]
+
+    def window(self, start_time, end_time=np.inf):
+        """Returns a copy of the records with start_time <= time < end_time, oldest first."""
+        written = self.num_written
+        head = written % self.capacity
+        if written <= self.capacity:
+            runs = [self.records[:written]]
+        else:
+            runs = [self.records[head:], self.records[:head]]
+        selected = []
+        for run in runs:
+            times = run["time"]
+            first, last = np.searchsorted(times, [start_time, end_time], side="left")
+            selected.append(run[first:last])
+        return np.concatenate(selected)
+
+    def _oldest_time(self):
+        written = self.num_written
+        return self.records["time"][
+            written % self.capacity if written > self.capacity else 0
+        ]
+
+    def _column_index(self, freq_bins, beams):
+        """Returns the aggregate column of every (frequency bin, beam), adding new columns."""
+        keys = freq_bins.astype(np.int64) << 16 | beams.astype(np.uint16)
+        unique, inverse = np.unique(keys, return_inverse=True)
+        for key in unique[[int(key) not in self._columns for key in unique]]:
+            self._columns[int(key)] = len(self._columns)
+            self._column_bins = np.append(self._column_bins, key >> 16)
+            self._column_beams = np.append(
+                self._column_beams, np.int16(np.uint16(key & 0xFFFF))
+            )
+            self._bin_index = None
+        columns = np.array([self._columns[int(key)] for key in unique], dtype=np.int64)
+        return columns[inverse]
+
+    def _update(self):
+        """Folds the records written since the last update into the rolling aggregates."""
+        written = self.num_written
+        if written == self._folded:
+            return
+        count = min(written - self._folded, self.capacity)
+        if count == self.capacity:
+            # Older records were overwritten before they were folded in, so start over
+            self._num_rows = 0
+        start = (written - count) % self.capacity
+        new = self.records[start : start + count]
+        if start + count > self.capacity:
+            new = np.concatenate([new, self.records[: start + count - self.capacity]])
+        self._folded = written
+
+        columns = self._column_index(new["freq_bin"], new["beam"])
+        num_columns = len(self._columns)
+        buckets, rows = np.unique(
+            np.floor(new["time"] / BUCKET_S).astype(np.int64), return_inverse=True
+        )
+        cells = rows * num_columns + columns
+        size = buckets.size * num_columns
+        power = np.bincount(
+            cells, weights=10 ** (new["noise_db"] / 10.0), minlength=size
+        ).reshape(buckets.size, num_columns)
+        counts = np.bincount(cells, minlength=size).reshape(buckets.size, num_columns)
+        power = np.cumsum(power, axis=0)
+        counts = np.cumsum(counts, axis=0)
+
+        # Drop the rows of buckets that are no longer in the ring, keeping the one before the
+        # first whole bucket, once they are most of the rows
+        num_rows = self._num_rows
+        drop = int(
+            np.searchsorted(
+                self._bucket_ids[:num_rows],
+                np.floor(self._oldest_time() / BUCKET_S),
+            )
+        )
+        if drop > num_rows // 2:
+            self._power[: num_rows - drop] = self._power[drop:num_rows]
+            self._counts[: num_rows - drop] = self._counts[drop:num_rows]
+            self._bucket_ids[: num_rows - drop] = self._bucket_ids[drop:num_rows]
+            num_rows -= drop
+
+        # Continue the running totals from the last row, merging into it if the bucket continues
+        self._reserve(num_rows + buckets.size, num_columns)
+        if num_rows:
+            power += self._power[num_rows - 1, :num_columns]
+            counts += self._counts[num_rows - 1, :num_columns]
+            if buckets[0] == self._bucket_ids[num_rows - 1]:
+                num_rows -= 1
+        self._power[num_rows : num_rows + buckets.size, :num_columns] = power
+        self._counts[num_rows : num_rows + buckets.size, :num_columns] = counts
+        self._bucket_ids[num_rows : num_rows + buckets.size] = buckets
+        self._num_rows = num_rows + buckets.size
+
+    def _reserve(self, num_rows, num_columns):
+        """Grows the aggregate arrays, doubling them, to hold num_rows rows of num_columns."""
+        rows, columns = self._power.shape
+        if num_rows <= rows and num_columns <= columns:
+            return
+        shape = (
+            max(num_rows, 2 * rows) if num_rows > rows else rows,
+            max(num_columns, 2 * columns) if num_columns > columns else columns,
+        )
+        for name in ("_power", "_counts"):
+            grown = np.zeros(shape, dtype=getattr(self, name).dtype)
+            grown[: self._num_rows, :columns] = getattr(self, name)[: self._num_rows]
+            setattr(self, name, grown)
+        bucket_ids = np.zeros(shape[0], dtype=np.int64)
+        bucket_ids[: self._num_rows] = self._bucket_ids[: self._num_rows]
+        self._bucket_ids = bucket_ids
+
+    def aggregate(self, window_s, now=None, beam=None):
+        """
+        Aggregates the noise of every frequency bin over a time window, rounded out to whole
+        buckets of BUCKET_S, from the rolling aggregates.
+
+        :param  window_s:   Length of the window in seconds, ending at now
+        :param  now:        Unix time of the end of the window. Defaults to the current time.
+        :param  beam:       Only use the records of one beam
+
+        :returns: Tuple of (frequencies in kHz, mean noise in dB, number of records) arrays, one
+                  entry per frequency bin with records in the window
+        """
+        self._update()
+        now = time.time() if now is None else now
+        first_bucket = np.floor((now - window_s) / BUCKET_S)
+        if self.num_written > self.capacity:
+            # The oldest bucket in the ring may have lost records to newer ones
+            first_bucket = max(
+                first_bucket, np.floor(self._oldest_time() / BUCKET_S) + 1
+            )
+        bucket_ids = self._bucket_ids[: self._num_rows]
+        last = int(np.searchsorted(bucket_ids, np.floor(now / BUCKET_S), side="right"))
+        first = int(np.searchsorted(bucket_ids, first_bucket, side="left"))
+        num_columns = len(self._columns)
+        if last <= first:
+            empty = np.zeros(0)
+            return empty, empty, np.zeros(0, dtype=np.int64)
+
+        power = self._power[last - 1, :num_columns]
+        counts = self._counts[last - 1, :num_columns]
+        if first > 0:
+            power = power - self._power[first - 1, :num_columns]
+            counts = counts - self._counts[first - 1, :num_columns]
+        if self._bin_index is None:
+            self._bins, self._bin_index = np.unique(
+                self._column_bins, return_inverse=True
+            )
+        bins = self._bins
+        bin_index = self._bin_index
+        if beam is not None:
+            selected = self._column_beams == beam
+            power = power[selected]
+            counts = counts[selected]
+            bin_index = bin_index[selected]
+        power = np.bincount(bin_index, weights=power, minlength=bins.size)
+        counts = np.bincount(bin_index, weights=counts, minlength=bins.size).astype(
+            np.int64
+        )
+        present = counts > 0
+        return (
+            bins[present] * self.bin_khz,
+            10 * np.log10(power[present] / counts[present]),
+            counts[present],
+        )
+
+    def quietest(self, window_s, num_freqs=10, now=None, beam=None):
+        """
+        Returns the quietest frequency bins over a time window, quietest first, as a tuple of
+        (frequencies in kHz, mean noise in dB).
+        """
+        freqs, mean_db, _ = self.aggregate(window_s, now, beam)
+        order = np.argsort(mean_db, kind="stable")[:num_freqs]
+        return freqs[order], mean_db[order]
+
+
+def open_store(site_id, **kwargs):
+    """Returns the read-only noise store of a site, or None if the site has none yet."""
+    try:
+        return NoiseStore(site_id, **kwargs)
+    except FileNotFoundError:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Print the quietest frequencies of a site over a recent time window."
+    )
+    parser.add_argument("site_id")
+    parser.add_argument(
+        "--window", type=float, default=3600, help="Length of the window in seconds"
+    )
+    parser.add_argument("--beam", type=int)
+    parser.add_argument("-n", "--num-freqs", type=int, default=10)
+    args = parser.parse_args()
+
+    store = open_store(args.site_id)
+    if store is None:
+        print(f"No noise history for {args.site_id} in {store_dir(args.site_id)}")
+        return
+    start = time.perf_counter()
+    freqs, mean_db = store.quietest(args.window, args.num_freqs, beam=args.beam)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{store.num_written} records written, {min(store.num_written, store.capacity)} kept"
+    )
+    for freq, noise in zip(freqs, mean_db):
+        print(f"  {freq:>8.0f} kHz  {noise:>6.1f} dB")
+    print(f"queried in {elapsed * 1e6:.0f} us")
+
+
+if __name__ == "__main__":
+    main()
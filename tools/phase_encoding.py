@@ -0,0 +1,103 @@
+"""
+phase_encoding
+~~~~~~~~~~~~~~
+Table-driven pulse_phase_offset functions. The phases of a whole averaging period are drawn once
+from a seeded generator into a read-only table of shape [num_sequences, num_pulses], in degrees,
+instead of on every call, and the same seed always reproduces the phases needed to decode the data.
+
+Borealis only accepts pulse_phase_offset as a function, and still calls it once per sequence. The
+table moves the random draw out of that call, which is then a row lookup, but the call itself
+remains.
+
+The table is also available as the .table attribute of the function, so offline tools can look up
+the phases of many sequences at once without calling it.
+
+:copyright: 2026 SuperDARN Canada
+"""
+
+import numpy as np
+
+from borealis_experiments.tools import timing_simulator
+
+# Random tables already drawn, keyed by (num_sequences, num_pulses, seed)
+__phase_tables__ = {}
+
+
+def phase_table(num_sequences, num_pulses, seed=0):
+    """
+    Returns a read-only table of phases drawn uniformly from [-180, 180) degrees, with shape
+    [num_sequences, num_pulses]. Tables are cached per size and seed.
+    """
+    key = (num_sequences, num_pulses, seed)
+    table = __phase_tables__.get(key)
+    if table is None:
+        rng = np.random.default_rng(seed)
+        table = rng.uniform(-180.0, 180.0, (num_sequences, num_pulses))
+        table.setflags(write=False)
+        table = __phase_tables__.setdefault(key, table)
+    return table
+
+
+def table_phase_offset(table):
+    """
+    Creates a pulse_phase_offset function that returns rows of a table.
+
+    :param  table:  Phases in degrees, shape [num_sequences, num_pulses]. Sequence n of an
+                    averaging period uses row n modulo the number of rows, so a single row gives
+                    the same phases for every sequence.
+
+    :returns: Function with signature (beam_iter, sequence_num, num_pulses) returning a read-only
+              array of num_pulses phases in degrees
+    """
+    table = np.array(table, dtype=np.float64, ndmin=2)
+    table.setflags(write=False)
+
+    def phase_encode(beam_iter, sequence_num, num_pulses):
+        return table[sequence_num % table.shape[0], :num_pulses]
+
+    phase_encode.table = table
+    return phase_encode
+
+
+def slice_phase_offset(exp_slice, seed=0):
+    """
+    Creates a pulse_phase_offset function with random phases for every sequence of an averaging
+    period of a slice, which needs its pulse sequence, timing and intt or intn.
+
+    :param  exp_slice:  Slice dictionary
+    :param  seed:       Seed of the phases, e.g. the experiment cpid
+    """
+    field = timing_simulator._field
+    intt = field(exp_slice, "intt")
+    num_sequences = int(
+        timing_simulator.num_sequences(
+            np.nan if intt is None else intt * 1e-3,
+            field(exp_slice, "intn"),
+            timing_simulator.slice_sequence_us(exp_slice) * 1e-6,
+        )
+    )
+    return table_phase_offset(
+        phase_table(num_sequences, len(field(exp_slice, "pulse_sequence")), seed)
+    )
+
+
+def sequence_phases(pulse_phase_offset, beam_iters, sequence_nums, num_pulses):
+    """
+    Returns the phases of many sequences, in degrees, with shape [num_sequences, num_pulses].
+    Functions from table_phase_offset() are looked up for every sequence at once; other functions
+    are called once per sequence.
+
+    :param  pulse_phase_offset: pulse_phase_offset function of a slice, or None for no encoding
+    :param  beam_iters:         Beam index of each sequence
+    :param  sequence_nums:      Index of each sequence within its averaging period
+    :param  num_pulses:         Number of pulses per sequence
+    """
+    sequence_nums = np.asarray(sequence_nums)
+    phases = np.zeros((sequence_nums.size, num_pulses))
+    table = getattr(pulse_phase_offset, "table", None)
+    if table is not None:
+        phases[:] = table[sequence_nums % table.shape[0], :num_pulses]
+    elif pulse_phase_offset is not None:
+        for i, (beam_iter, sequence_num) in enumerate(zip(beam_iters, sequence_nums)):
+            phases[i] = pulse_phase_offset(beam_iter, sequence_num, num_pulses)
+    return phases
@@ -0,0 +1,182 @@
+#!/usr/bin/python
+
+"""
+polyphase
+~~~~~~~~~
+Reference implementation of a DecimationScheme for offline validation of new filters. Blocks of
+raw complex samples are streamed through every DecimationStage, keeping the filter history and
+decimation phase of each stage across block boundaries, so a capture of any length can be
+processed a block at a time from a memory-mapped file.
+
+Each stage only computes the output samples that are kept. For input x, taps h and decimation
+rate D, stage output m is
+
+    y[m] = sum_k h[k] * x[m * D - k]
+
+with x = 0 before the first sample, i.e. the first ceil(N / D) samples of
+scipy.signal.upfirdn(h, x, down=D), however the input is split into blocks.
+
+Usage: python3 -m borealis_experiments.tools.polyphase input.npy output.npy --scheme name
+
+:copyright: 2026 SuperDARN Canada
+"""
+
+import argparse
+import importlib
+
+import numpy as np
+
+from borealis_experiments.tools import decimation_schemes
+
+
+class PolyphaseDecimator:
+    """
+    Streaming decimator for a DecimationScheme.
+
+    :param  scheme: DecimationScheme whose stages are applied in order
+    """
+
+    def __init__(self, scheme):
+        self.scheme = scheme
+        # Taps reversed so that each output is a dot product with a window of the input, in single
+        # precision as on the GPU
+        self.reversed_taps = []
+        for stage in scheme.stages:
+            taps = np.asarray(stage.filter_taps)[::-1]
+            dtype = np.complex64 if np.iscomplexobj(taps) else np.float32
+            self.reversed_taps.append(taps.astype(dtype))
+        self.dm_rates = [stage.dm_rate for stage in scheme.stages]
+        self.reset()
+
+    def reset(self):
+        """Clears the filter state, so that the next block is treated as the start of the data."""
+        self.histories = [None] * len(self.dm_rates)
+        # Index of the next sample to keep, relative to the start of the next block
+        self.offsets = [0] * len(self.dm_rates)
+
+    def _stage(self, i, samples):
+        taps = self.reversed_taps[i]
+        history = self.histories[i]
+        if history is None:
+            history = np.zeros(
+                samples.shape[:-1] + (taps.size - 1,),
+                dtype=np.result_type(samples, taps),
+            )
+        buffer = np.concatenate((history, samples), axis=-1)
+        self.histories[i] = buffer[..., buffer.shape[-1] - (taps.size - 1) :]
+
+        offset = self.offsets[i]
+        dm_rate = self.dm_rates[i]
+        num_samples = samples.shape[-1]
+        if offset >= num_samples:
+            self.offsets[i] = offset - num_samples
+            return buffer[..., :0]
+        windows = np.lib.stride_tricks.sliding_window_view(buffer, taps.size, axis=-1)
+        output = np.matmul(windows[..., offset:num_samples:dm_rate, :], taps)
+        self.offsets[i] = offset + output.shape[-1] * dm_rate - num_samples
+        return output
+
+    def process(self, samples):
+        """
+        Decimates the next block of samples.
+
+        :param  samples:    Complex samples at the scheme input rate, shape [..., num_samples]. Any
+                            leading dimensions (e.g. antennas) must be the same for every block.
+
+        :returns: Output samples of the last stage for this block, shape [..., num_output_samples]
+        """
+        samples = np.asarray(samples)
+        for i in range(len(self.dm_rates)):
+            samples = self._stage(i, samples)
+        return samples
+
+    def output_length(self, num_samples):
+        """Returns the number of output samples produced from num_samples input samples."""
+        for dm_rate in self.dm_rates:
+            num_samples = -(-num_samples // dm_rate)
+        return num_samples
+
+
+def decimate(scheme, samples, out=None, block_size=2**20):
+    """
+    Decimates an array of samples, which may be memory-mapped, a block at a time.
+
+    :param  scheme:     DecimationScheme to apply
+    :param  samples:    Complex samples at the scheme input rate, shape [num_antennas, num_samples]
+    :param  out:        Array of shape [num_antennas, num_output_samples] to write into, e.g. from
+                        np.lib.format.open_memmap(). A new complex64 array is allocated if None.
+    :param  block_size: Number of input samples per antenna read per block
+
+    :returns: out
+    """
+    decimator = PolyphaseDecimator(scheme)
+    num_antennas, num_samples = samples.shape
+    if out is None:
+        out = np.empty(
+            (num_antennas, decimator.output_length(num_samples)), dtype=np.complex64
+        )
+
+    written = 0
+    for start in range(0, num_samples, block_size):
+        block = decimator.process(samples[:, start : start + block_size])
+        out[:, written : written + block.shape[-1]] = block
+        written += block.shape[-1]
+    return out
+
+
+def decimate_file(scheme, input_path, output_path, block_size=2**20):
+    """
+    Decimates a capture stored as a .npy file of shape [num_antennas, num_samples] without loading
+    it whole, writing the result to a .npy file.
+
+    :param  scheme:         DecimationScheme to apply
+    :param  input_path:     Path of the input .npy file
+    :param  output_path:    Path of the output .npy file
+    :param  block_size:     Number of input samples per antenna read per block
+    """
+    samples = np.load(input_path, mmap_mode="r")
+    decimator = PolyphaseDecimator(scheme)
+    out = np.lib.format.open_memmap(
+        output_path,
+        mode="w+",
+        dtype=np.complex64,
+        shape=(samples.shape[0], decimator.output_length(samples.shape[1])),
+    )
+    decimate(scheme, samples, out, block_size)
+    out.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Decimate a capture of raw samples with a decimation scheme."
+    )
+    parser.add_argument(
+        "input_path", help=".npy file of shape [num_antennas, num_samples]"
+    )
+    parser.add_argument("output_path", help=".npy file to write")
+    scheme_group = parser.add_mutually_exclusive_group(required=True)
+    scheme_group.add_argument(
+        "--scheme",
+        choices=sorted(decimation_schemes.SCHEMES.keys()),
+        help="Registered decimation scheme",
+    )
+    scheme_group.add_argument(
+        "--scheme-function",
+        help="Function returning a DecimationScheme as module.function, relative to "
+        "borealis_experiments, e.g. archive.dm_test.two_stage_flatpass_v2",
+    )
+    parser.add_argument("--block-size", type=int, default=2**20)
+    args = parser.parse_args()
+
+    if args.scheme is not None:
+        scheme = decimation_schemes.decimation_scheme(args.scheme)
+    else:
+        module_name, fn_name = args.scheme_function.rsplit(".", 1)
+        module = importlib.import_module(f"borealis_experiments.{module_name}")
+        scheme = getattr(module, fn_name)()
+
+    decimate_file(scheme, args.input_path, args.output_path, args.block_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,503 @@
+#!/usr/bin/python
+
+"""
+raw_samples
+~~~~~~~~~~~
+Generates synthetic raw complex baseband samples for a slice of a built experiment, so that the
+processing chain can be exercised without a radar. The generator reads the pulse sequence, tau
+spacing, pulse length, frequency, tx_antenna_pattern (or tx beam directions), receive antennas and
+pulse_phase_offset of the slice, and produces one stream of samples per receive antenna containing:
+
+    targets:        ionospheric echoes of every transmitted pulse at a range and azimuth, with a
+                    mean Doppler velocity and a Gaussian Doppler spread (spectral width). Each echo
+                    is weighted by the transmit array factor towards the target, carries the phase
+                    offset of its pulse and arrives at each antenna with plane-wave phase.
+    interferers:    continuous tones at an offset from the slice frequency, from an azimuth
+    noise:          complex Gaussian noise of unit power per antenna
+
+Sequences are laid back to back, each lasting the receive window of the slice, and the beam
+advances every averaging period. Samples are written a chunk of sequences at a time into a
+memory-mapped .npy file of shape [num_antennas, num_samples], which tools.polyphase.decimate_file()
+can read directly.
+
+Noise is drawn afresh for every antenna and chunk as float32 samples, so it never repeats and is
+uncorrelated between antennas. Echoes only occupy the pulse windows, so they are computed for those
+samples alone.
+
+A slice with several frequencies (a list of freq, stepped through by freq_order) is generated for
+one of them, given by its index. Only the averaging periods at that frequency are generated.
+
+Usage: python3 -m borealis_experiments.tools.raw_samples module.Class output.npy [--seconds S]
+       [--freq-index I]
+
+:copyright: 2026 SuperDARN Canada
+"""
+
+import argparse
+import importlib
+import math
+import time
+
+import numpy as np
+
+import borealis_experiments.superdarn_common_fields as scf
+from borealis_experiments.tools import array_factor, phase_encoding, timing_simulator
+
+SPEED_OF_LIGHT = 299792458.0  # m/s
+DEFAULT_SAMPLE_RATE_HZ = 5e6
+NUM_SCATTERERS = 32  # Doppler components of each target
+
+DEFAULT_TARGETS = (
+    {
+        "range_km": 675.0,
+        "azimuth_deg": 0.0,
+        "velocity_ms": 300.0,
+        "width_ms": 50.0,
+        "snr_db": 10.0,
+    },
+    {
+        "range_km": 1350.0,
+        "azimuth_deg": -12.0,
+        "velocity_ms": -150.0,
+        "width_ms": 150.0,
+        "snr_db": 3.0,
+    },
+)
+DEFAULT_INTERFERERS = ({"freq_offset_hz": 12e3, "azimuth_deg": 25.0, "snr_db": 0.0},)
+
+
+def plane_wave(freq_khz, antenna_locations, azimuths_deg):
+    """
+    Returns the phase of a plane wave from each azimuth at each antenna, exp(-j * k * p . u), with
+    shape [num_azimuths, num_antennas]. Azimuths are measured from boresight, along +y.
+    """
+    azimuths = np.deg2rad(np.atleast_1d(azimuths_deg))
+    directions = np.stack((np.sin(azimuths), np.cos(azimuths), np.zeros_like(azimuths)))
+    wavenumber = 2 * np.pi * freq_khz * 1e3 / SPEED_OF_LIGHT
+    return np.exp(-1j * wavenumber * (np.asarray(antenna_locations) @ directions).T)
+
+
+def _select_freq(exp_slice, freq_index):
+    """
+    Returns the frequency of a slice in kHz, and the positions in its beam order that use it, or
+    None if the slice has a single frequency.
+    """
+    field = timing_simulator._field
+    freq = field(exp_slice, "freq")
+    if np.ndim(freq) == 0:
+        return freq, None
+    freqs = list(freq)
+    if freq_index is None:
+        raise ValueError(
+            f"Slice has several frequencies {freqs} kHz, a freq_index must be given"
+        )
+    if not 0 <= freq_index < len(freqs):
+        raise ValueError(
+            f"freq_index {freq_index} out of range for frequencies {freqs} kHz"
+        )
+    freq_order = field(exp_slice, "freq_order")
+    if freq_order is None:
+        raise ValueError(
+            "Slice has several frequencies but no freq_order, so the averaging periods "
+            "of each frequency are not known"
+        )
+    positions = [i for i, index in enumerate(freq_order) if index == freq_index]
+    if not positions:
+        raise ValueError(f"freq_index {freq_index} does not appear in freq_order")
+    return freqs[freq_index], positions
+
+
+class RawSampleGenerator:
+    """
+    Streams synthetic raw samples for one slice.
+
+    :param  exp_slice:          Slice dictionary or validated slice
+    :param  sample_rate_hz:     Rate of the raw samples
+    :param  targets:            Sequence of dictionaries with 'range_km', 'azimuth_deg',
+                                'velocity_ms', 'width_ms' and 'snr_db', the peak echo power
+                                relative to the noise of one antenna
+    :param  interferers:        Sequence of dictionaries with 'freq_offset_hz', 'azimuth_deg' and
+                                'snr_db'
+    :param  center_freq_khz:    Centre frequency of the baseband samples. Defaults to the slice
+                                frequency.
+    :param  blank_tx:           Zero the samples while a pulse is transmitted, as the receivers are
+                                blanked
+    :param  seed:               Seed for the noise, scatterers and interferer phases
+    :param  freq_index:         Index of the frequency to generate, for slices with a list of freq.
+                                Only the averaging periods that freq_order puts at that frequency
+                                are generated.
+    :param  intf_offset_m:      Position of the interferometer array relative to the main array,
+                                in metres. Defaults to the intf_offset of the site config.
+    """
+
+    def __init__(
+        self,
+        exp_slice,
+        sample_rate_hz=DEFAULT_SAMPLE_RATE_HZ,
+        targets=DEFAULT_TARGETS,
+        interferers=DEFAULT_INTERFERERS,
+        center_freq_khz=None,
+        blank_tx=True,
+        seed=0,
+        freq_index=None,
+        intf_offset_m=None,
+    ):
+        field = timing_simulator._field
+        config = scf.load_site().config
+        self.sample_rate_hz = sample_rate_hz
+        self.freq_khz, positions = _select_freq(exp_slice, freq_index)
+        if center_freq_khz is None:
+            center_freq_khz = self.freq_khz
+        offset_hz = (self.freq_khz - center_freq_khz) * 1e3
+        self.blank_tx = blank_tx
+        self.rng = np.random.default_rng(seed)
+
+        # Receive antennas: the main array then the interferometer array
+        main_locations, intf_locations = array_factor.site_arrays(config, intf_offset_m)
+        rx_main = field(exp_slice, "rx_main_antennas")
+        rx_intf = field(exp_slice, "rx_intf_antennas")
+        if rx_main is None:
+            rx_main = range(config.main_antenna_count)
+        if rx_intf is None:
+            rx_intf = range(config.intf_antenna_count)
+        rx_locations = np.concatenate(
+            (main_locations[list(rx_main)], intf_locations[list(rx_intf)])
+        )
+        self.num_antennas = rx_locations.shape[0]
+
+        # Sequence timing, in samples
+        us_to_samples = sample_rate_hz * 1e-6
+        pulse_sequence = field(exp_slice, "pulse_sequence")
+        tau_spacing = field(exp_slice, "tau_spacing")
+        self.num_pulses = len(pulse_sequence)
+        self.pulse_starts = np.rint(
+            np.asarray(pulse_sequence) * tau_spacing * us_to_samples
+        ).astype(np.int64)
+        self.pulse_samples = max(
+            int(round(field(exp_slice, "pulse_len") * us_to_samples)), 1
+        )
+        self.sequence_samples = math.ceil(
+            timing_simulator.slice_sequence_us(exp_slice) * us_to_samples
+        )
+        intt = field(exp_slice, "intt")
+        self.sequences_per_aveperiod = int(
+            timing_simulator.num_sequences(
+                np.nan if intt is None else intt * 1e-3,
+                field(exp_slice, "intn"),
+                self.sequence_samples / sample_rate_hz,
+            )
+        )
+        self.pulse_phase_offset = field(exp_slice, "pulse_phase_offset")
+
+        # Transmit weights of each beam in tx_beam_order. Receive-only slices are lit by another
+        # transmitter, modelled as isotropic.
+        tx_beam_order = field(exp_slice, "tx_beam_order")
+        beam_order = tx_beam_order or field(exp_slice, "rx_beam_order")
+        if positions is not None:
+            beam_order = [beam_order[i] for i in positions]
+            if tx_beam_order:
+                tx_beam_order = beam_order
+        self.num_beams = len(beam_order)
+        targets = list(targets)
+        azimuths = [target["azimuth_deg"] for target in targets]
+        if tx_beam_order:
+            tx_antennas = field(exp_slice, "tx_antennas")
+            if tx_antennas is None:
+                tx_antennas = list(range(config.main_antenna_count))
+            pattern_fn = field(exp_slice, "tx_antenna_pattern")
+            if pattern_fn is not None:
+                patterns = np.asarray(
+                    pattern_fn(self.freq_khz, tx_antennas, main_locations)
+                )
+                weights = patterns[list(tx_beam_order)]
+            else:
+                beam_angle = np.asarray(field(exp_slice, "beam_angle"))
+                weights = np.zeros(
+                    (self.num_beams, config.main_antenna_count), dtype=np.complex128
+                )
+                weights[:, tx_antennas] = plane_wave(
+                    self.freq_khz,
+                    main_locations[tx_antennas],
+                    beam_angle[list(tx_beam_order)],
+                ).conj()
+            # Normalised so that a beam of every tx antenna has unit gain in its direction
+            tx_gain = weights @ plane_wave(self.freq_khz, main_locations, azimuths).T
+            tx_gain /= len(tx_antennas)
+        else:
+            tx_gain = np.ones((self.num_beams, len(targets)))
+
+        # Targets: [num_beams, num_targets, num_antennas] complex gain, delays and Doppler
+        # components. The mean Doppler is applied per sample, the spread once per pulse.
+        wavelength = SPEED_OF_LIGHT / (self.freq_khz * 1e3)
+        snr = np.array([target["snr_db"] for target in targets])
+        self.target_gain = (
+            tx_gain[:, :, np.newaxis]
+            * (10 ** (snr / 20))[:, np.newaxis]
+            * plane_wave(self.freq_khz, rx_locations, azimuths)
+        ).astype(np.complex64)
+        self.target_delays = np.rint(
+            np.array([2 * target["range_km"] * 1e3 for target in targets])
+            / SPEED_OF_LIGHT
+            * sample_rate_hz
+        ).astype(np.int64)
+        self.target_doppler_hz = (
+            np.array([2 * target["velocity_ms"] for target in targets]) / wavelength
+            + offset_hz
+        )
+        spread_hz = (
+            np.array([2 * target["width_ms"] for target in targets]) / wavelength
+        )
+        self.scatterer_hz = (
+            self.rng.standard_normal((len(targets), NUM_SCATTERERS))
+            * spread_hz[:, np.newaxis]
+        )
+        self.scatterer_phases = self.rng.uniform(
+            0, 2 * np.pi, (len(targets), NUM_SCATTERERS)
+        )
+
+        # Interferers: [num_interferers, num_antennas] complex gain
+        interferers = list(interferers)
+        self.interferer_hz = (
+            np.array(
+                [interferer["freq_offset_hz"] for interferer in interferers]
+            ).reshape(-1)
+            + offset_hz
+        )
+        self.interferer_gain = (
+            (
+                10
+                ** (np.array([interferer["snr_db"] for interferer in interferers]) / 20)
+            ).reshape(-1, 1)
+            * np.exp(1j * self.rng.uniform(0, 2 * np.pi, (len(interferers), 1)))
+            * plane_wave(
+                self.freq_khz,
+                rx_locations,
+                [interferer["azimuth_deg"] for interferer in interferers],
+            ).reshape(len(interferers), self.num_antennas)
+        ).astype(np.complex64)
+
+        self._tones = {}
+        self.reset()
+
+    def reset(self):
+        """Restarts the stream at the first sequence."""
+        self.sequence_num = 0
+
+    def sequence_phases(self, first_sequence, num_sequences):
+        """
+        Returns the beam index and pulse phase offsets, in degrees, of a run of sequences, with
+        shapes [num_sequences] and [num_sequences, num_pulses].
+        """
+        sequences = np.arange(first_sequence, first_sequence + num_sequences)
+        beam_iters = (sequences // self.sequences_per_aveperiod) % self.num_beams
+        phases = phase_encoding.sequence_phases(
+            self.pulse_phase_offset,
+            beam_iters,
+            sequences % self.sequences_per_aveperiod,
+            self.num_pulses,
+        )
+        return beam_iters, phases
+
+    def _add_noise(self, out):
+        """Adds complex Gaussian noise of unit power to out, shape [num_antennas, num_samples]."""
+        num_samples = out.shape[-1]
+        scale = np.float32(np.sqrt(0.5))
+        for antenna in range(out.shape[0]):
+            noise = self.rng.standard_normal(2 * num_samples, dtype=np.float32)
+            noise *= scale
+            out[antenna] += noise.view(np.complex64)
+
+    def _add_targets(self, out, start_s, beam_iters, phases):
+        """Adds the echo of every pulse from every target to out, shape [ant, seq, sample]."""
+        num_sequences = out.shape[1]
+        sequence_s = self.sequence_samples / self.sample_rate_hz
+        pulse_time_s = np.arange(self.pulse_samples) / self.sample_rate_hz
+        # [num_sequences, num_pulses] start time of each pulse, and its encoding
+        pulse_start_s = (
+            start_s
+            + np.arange(num_sequences)[:, np.newaxis] * sequence_s
+            + self.pulse_starts / self.sample_rate_hz
+        )
+        encoding = np.exp(1j * np.deg2rad(phases))
+        gains = self.target_gain[
+            beam_iters
+        ]  # [num_sequences, num_targets, num_antennas]
+
+        for target, delay in enumerate(self.target_delays):
+            arrival_s = pulse_start_s + delay / self.sample_rate_hz
+            # Doppler spread, evaluated once per pulse: [num_sequences, num_pulses]
+            spread = np.exp(
+                1j
+                * (
+                    2 * np.pi * arrival_s[..., np.newaxis] * self.scatterer_hz[target]
+                    + self.scatterer_phases[target]
+                )
+            ).sum(axis=-1) / np.sqrt(NUM_SCATTERERS)
+            # Mean Doppler per sample: [num_sequences, num_pulses, pulse_samples]
+            echo = np.exp(
+                2j
+                * np.pi
+                * self.target_doppler_hz[target]
+                * (arrival_s[..., np.newaxis] + pulse_time_s)
+            )
+            echo *= (spread * encoding)[..., np.newaxis]
+            echo = echo.astype(np.complex64)
+            for pulse, pulse_start in enumerate(self.pulse_starts):
+                first = pulse_start + delay
+                last = min(first + self.pulse_samples, self.sequence_samples)
+                if first >= last:
+                    continue
+                out[:, :, first:last] += np.einsum(
+                    "sa,sn->asn",
+                    gains[:, target],
+                    echo[:, pulse, : last - first],
+                )
+
+    def _set_interferers(self, out, first_sample):
+        """
+        Writes the sum of the interfering tones to out, shape [num_antennas, num_samples]. The
+        tones of a chunk are cached, so later chunks of the same length only need their starting
+        phase.
+        """
+        num_samples = out.shape[-1]
+        tones = self._tones.get(num_samples)
+        if tones is None:
+            cycles = np.outer(
+                self.interferer_hz / self.sample_rate_hz, np.arange(num_samples)
+            )
+            tones = np.exp(2j * np.pi * np.mod(cycles, 1)).astype(np.complex64)
+            self._tones = {num_samples: tones}
+        start_phase = np.exp(
+            2j
+            * np.pi
+            * np.mod(self.interferer_hz / self.sample_rate_hz * first_sample, 1)
+        )
+        gains = (self.interferer_gain * start_phase[:, np.newaxis]).astype(np.complex64)
+        if gains.shape[0] == 0:
+            out[...] = 0
+            return
+        np.multiply(gains[0, :, np.newaxis], tones[0], out=out)
+        for gain, tone in zip(gains[1:], tones[1:]):
+            out += gain[:, np.newaxis] * tone
+
+    def generate(self, num_sequences, out=None):
+        """
+        Generates the next sequences of the stream.
+
+        :param  num_sequences:  Number of sequences to generate
+        :param  out:            Array of shape [num_antennas, num_sequences * sequence_samples] to
+                                write into, e.g. part of a memory-mapped file. A new complex64
+                                array is allocated if None.
+
+        :returns: out
+        """
+        num_samples = num_sequences * self.sequence_samples
+        if out is None:
+            out = np.empty((self.num_antennas, num_samples), dtype=np.complex64)
+        start_s = self.sequence_num * self.sequence_samples / self.sample_rate_hz
+        beam_iters, phases = self.sequence_phases(self.sequence_num, num_sequences)
+
+        self._set_interferers(out, self.sequence_num * self.sequence_samples)
+        self._add_noise(out)
+        sequences = out.reshape(self.num_antennas, num_sequences, self.sequence_samples)
+        self._add_targets(sequences, start_s, beam_iters, phases)
+        if self.blank_tx:
+            for pulse_start in self.pulse_starts:
+                sequences[:, :, pulse_start : pulse_start + self.pulse_samples] = 0
+
+        self.sequence_num += num_sequences
+        return out
+
+
+def generate_file(exp_slice, output_path, num_sequences, chunk_samples=2**22, **kwargs):
+    """
+    Writes synthetic raw samples for a slice to a .npy file, a chunk of sequences at a time.
+
+    :param  exp_slice:      Slice dictionary or validated slice
+    :param  output_path:    Path of the .npy file to write, of shape [num_antennas, num_samples]
+    :param  num_sequences:  Number of sequences to generate
+    :param  chunk_samples:  Approximate number of samples per antenna generated per chunk
+    :param  kwargs:         Passed to RawSampleGenerator
+
+    :returns: The RawSampleGenerator, which describes the layout of the samples
+    """
+    generator = RawSampleGenerator(exp_slice, **kwargs)
+    sequence_samples = generator.sequence_samples
+    out = np.lib.format.open_memmap(
+        output_path,
+        mode="w+",
+        dtype=np.complex64,
+        shape=(generator.num_antennas, num_sequences * sequence_samples),
+    )
+    chunk_sequences = max(1, chunk_samples // sequence_samples)
+    for first in range(0, num_sequences, chunk_sequences):
+        count = min(chunk_sequences, num_sequences - first)
+        generator.generate(
+            count,
+            out[:, first * sequence_samples : (first + count) * sequence_samples],
+        )
+    out.flush()
+    return generator
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate synthetic raw samples for a slice of an experiment."
+    )
+    parser.add_argument(
+        "experiment",
+        help="Experiment class as module.Class, relative to borealis_experiments",
+    )
+    parser.add_argument("output_path", help=".npy file to write")
+    parser.add_argument("--slice-id", type=int, default=0)
+    parser.add_argument(
+        "--seconds", type=float, default=1.0, help="Length of data to generate"
+    )
+    parser.add_argument(
+        "--sample-rate", type=float, default=DEFAULT_SAMPLE_RATE_HZ, help="In Hz"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--freq-index",
+        type=int,
+        default=None,
+        help="Frequency to generate, for slices with a list of freq",
+    )
+    parser.add_argument(
+        "--intf-offset",
+        type=float,
+        nargs=3,
+        default=None,
+        metavar=("X", "Y", "Z"),
+        help="Interferometer array position relative to the main array in metres, if the site "
+        "config does not give one",
+    )
+    args = parser.parse_args()
+
+    module_name, class_name = args.experiment.rsplit(".", 1)
+    module = importlib.import_module(f"borealis_experiments.{module_name}")
+    exp_slice = getattr(module, class_name)().slice_dict[args.slice_id]
+
+    sequence_s = timing_simulator.slice_sequence_us(exp_slice) * 1e-6
+    num_sequences = max(1, round(args.seconds / sequence_s))
+    start = time.perf_counter()
+    generator = generate_file(
+        exp_slice,
+        args.output_path,
+        num_sequences,
+        sample_rate_hz=args.sample_rate,
+        seed=args.seed,
+        freq_index=args.freq_index,
+        intf_offset_m=args.intf_offset,
+    )
+    seconds = time.perf_counter() - start
+    duration_s = num_sequences * generator.sequence_samples / args.sample_rate
+    print(
+        f"{generator.num_antennas} antennas, {num_sequences} sequences of "
+        f"{generator.sequence_samples} samples ({duration_s:.2f} s) in {seconds:.2f} s, "
+        f"{duration_s / seconds:.2f}x real time"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+restricted_ranges
+~~~~~~~~~~~~~~~~~
+Index of the restricted frequency ranges of a site, for checking many frequencies at once. Every
+range is widened by a buffer on both sides, then the ranges are sorted and overlapping ones merged,
+leaving two sorted arrays of interval bounds. A frequency is restricted when it lies strictly
+inside an interval, so the bounds themselves are allowed. Because the merged intervals do not
+overlap, the only interval that can contain a frequency is the last one starting below it, which
+np.searchsorted() finds for a whole array of frequencies in O(log n) each.
+
+:copyright: 2026 SuperDARN Canada
+"""
+
+import numpy as np
+
+
+class RestrictedRanges:
+    """
+    Sorted, merged intervals of restricted frequencies.
+
+    :param  ranges:     Sequence of [low, high] restricted ranges, in kHz, e.g.
+                        options.restricted_ranges
+    :param  buffer_khz: Distance to keep from every restricted range, in kHz
+    """
+
+    def __init__(self, ranges, buffer_khz=0):
+        self.buffer_khz = buffer_khz
+        ranges = np.asarray(ranges, dtype=np.float64).reshape(-1, 2)
+        ranges = ranges[np.argsort(ranges[:, 0], kind="stable")]
+        lows = []
+        highs = []
+        for low, high in zip(ranges[:, 0] - buffer_khz, ranges[:, 1] + buffer_khz):
+            if highs and low < highs[-1]:
+                highs[-1] = max(highs[-1], high)
+            else:
+                lows.append(low)
+                highs.append(high)
+        self.lows = np.array(lows)
+        self.highs = np.array(highs)
+        self.lows.setflags(write=False)
+        self.highs.setflags(write=False)
+
+    @classmethod
+    def from_options(cls, options, buffer_khz=0):
+        """Returns the index of the restricted ranges of a site's Options."""
+        return cls(options.restricted_ranges, buffer_khz)
+
+    def __len__(self):
+        return self.lows.size
+
+    def _containing(self, freqs):
+        """Returns the index of the interval that could contain each frequency, or -1 if none."""
+        return np.searchsorted(self.lows, freqs, side="right") - 1
+
+    def is_allowed(self, freqs):
+        """Returns True for every frequency, in kHz, that is not in a restricted interval."""
+        freqs = np.asarray(freqs, dtype=np.float64)
+        if len(self) == 0:
+            return np.ones(freqs.shape, dtype=bool)
+        index = self._containing(freqs)
+        safe = np.maximum(index, 0)
+        return (index < 0) | (freqs <= self.lows[safe]) | (freqs >= self.highs[safe])
+
+    def is_clear(self, lows, highs):
+        """
+        Returns True for every band [low, high], in kHz, that does not overlap a restricted
+        interval, e.g. the channel of a transmitted frequency.
+        """
+        lows = np.asarray(lows, dtype=np.float64)
+        highs = np.asarray(highs, dtype=np.float64)
+        if len(self) == 0:
+            return np.ones(np.broadcast(lows, highs).shape, dtype=bool)
+        # Intervals starting below each band's top; only the last of them can reach into the band
+        index = np.searchsorted(self.lows, highs, side="left") - 1
+        return (index < 0) | (self.highs[np.maximum(index, 0)] <= lows)
+
+    def nearest_allowed(self, freqs, direction="nearest", step_khz=None, bounds=None):
+        """
+        Returns the closest allowed frequency to each frequency. Allowed frequencies are returned
+        unchanged.
+
+        :param  freqs:      Frequencies in kHz
+        :param  direction:  'up', 'down', or 'nearest' to take whichever is closer, up on ties
+        :param  step_khz:   If given, frequencies only move in multiples of step_khz
+        :param  bounds:     [low, high] kHz that results must stay within
+
+        :returns: float array of frequencies, NaN where no allowed frequency was found
+        """
+        if direction not in ("up", "down", "nearest"):
+            raise ValueError(f"Unknown direction {direction}")
+        freqs = np.asarray(freqs, dtype=np.float64)
+        if direction == "nearest":
+            up = self.nearest_allowed(freqs, "up", step_khz, bounds)
+            down = self.nearest_allowed(freqs, "down", step_khz, bounds)
+            take_down = np.isnan(up) | (np.abs(freqs - down) < np.abs(up - freqs))
+            return np.where(take_down, down, up)
+
+        sign = 1 if direction == "up" else -1
+        moved = freqs.copy()
+        blocked = ~self.is_allowed(moved)
+        # Each pass moves past one interval, so at most one pass per interval is needed
+        for _ in range(len(self) + 1):
+            if not blocked.any():
+                break
+            index = self._containing(moved[blocked])
+            edges = self.highs[index] if sign > 0 else self.lows[index]
+            if step_khz is None:
+                moved[blocked] = edges
+            else:
+                start = freqs[blocked]
+                steps = np.ceil(np.round(sign * (edges - start) / step_khz, 9))
+                moved[blocked] = start + sign * steps * step_khz
+            blocked = ~self.is_allowed(moved)
+        if bounds is not None:
+            blocked |= (moved < bounds[0]) | (moved > bounds[1])
+        moved[blocked] = np.nan
+        return moved
@@ -0,0 +1,76 @@
+"""
+rx_patterns
+~~~~~~~~~~~
+Shared rx_antenna_pattern factory for the full-FOV modes, which form all of their receive beams at
+once from a table of adjusted beam directions per frequency, weighted by a window across the main
+array.
+
+The windowed phase matrix is computed once per frequency and set of antenna locations, then
+returned read-only from a dictionary on every later call.
+
+:copyright: 2026 SuperDARN Canada
+"""
+
+import numpy as np
+
+from utils.signals import get_phase_shift
+
+# Chebyshev 30-dB window across the 16 antennas of the main array
+CHEBYSHEV_30DB_WINDOW = (
+    0.2910,
+    0.3173,
+    0.4557,
+    0.6018,
+    0.7424,
+    0.8637,
+    0.9528,
+    1.0000,
+    1.0000,
+    0.9528,
+    0.8637,
+    0.7424,
+    0.6018,
+    0.4557,
+    0.3173,
+    0.2910,
+)
+
+
+def windowed_rx_pattern(beam_directions, window=CHEBYSHEV_30DB_WINDOW):
+    """
+    Creates an rx_antenna_pattern function that steers to a table of beam directions per frequency.
+
+    :param  beam_directions:    Dictionary of {freq_khz: [beam directions in degrees]}. The beam_angle
+                                passed to the returned function is ignored in favour of this table.
+    :param  window:             Amplitude weights applied across the array, or None for no window.
+                                Only applied to arrays with the same number of antennas as the window,
+                                so the interferometer array is left unweighted.
+
+    :returns: Function with signature (beam_angle, freq_khz, antenna_locations) returning a
+              read-only array of shape [num_beams, num_antennas]
+    """
+    if window is not None:
+        window = np.array(window, dtype=np.float32)
+    patterns = {}
+
+    def rx_phase_pattern(beam_angle, freq_khz, antenna_locations):
+        key = (freq_khz, antenna_locations.shape, antenna_locations.tobytes())
+        shift = patterns.get(key)
+        if shift is None:
+            shift = (
+                get_phase_shift(
+                    beam_directions[int(freq_khz)],
+                    [freq_khz],
+                    antenna_locations[:, 0],
+                )[0]
+                * 0.9999999
+            )
+            # Apply the window to the antenna data streams of the main array
+            if window is not None and antenna_locations.shape[0] == window.size:
+                shift = shift * window
+            shift.flags.writeable = False
+            patterns[key] = shift
+
+        return shift
+
+    return rx_phase_pattern
@@ -0,0 +1,418 @@
+#!/usr/bin/python
+
+"""
+scanbound_packer
+~~~~~~~~~~~~~~~~
+Chooses the tightest scanbound and intt for the averaging periods of a scan, given a model of
+the overhead of each sequence and averaging period, instead of a hand-tuned safety margin.
+
+Every averaging period runs in a slot of its own, consuming one scanbound, as modelled by
+tools.timing_simulator. Its intt is the largest whole number of sequences that fits in the slot
+once the averaging period overhead is removed, rounded up to the 1 ms resolution, so no time is
+lost to a partial sequence and Borealis fits exactly that number of sequences.
+
+Packing an experiment keeps its scanbounds, and so its cadence, and only tightens the intt of each
+averaging period to the shortest slot of its scan. Packings that lower the simulated duty cycle
+without removing overruns are rejected.
+
+The overhead model is a dictionary with 'aveperiod_ms', the processing time after each averaging
+period, and 'sequence_us', the dead time after each sequence. fit_overhead_model() estimates both
+from measured averaging period durations.
+
+Lookup tables of the packed scanbound for every beam count up to the number of beams of a site
+are cached on disk per site.
+
+Usage: python3 -m borealis_experiments.tools.scanbound_packer table [site_id ...]
+       python3 -m borealis_experiments.tools.scanbound_packer experiment module.Class
+
+:copyright: 2026 SuperDARN Canada
+"""
+
+import argparse
+import importlib
+import math
+
+import numpy as np
+
+import borealis_experiments.superdarn_common_fields as scf
+from borealis_experiments.tools import cache
+from borealis_experiments.tools import timing_simulator
+
+DEFAULT_OVERHEAD_MODEL = {
+    "aveperiod_ms": timing_simulator.DEFAULT_AVEPERIOD_OVERHEAD_MS,
+    "sequence_us": timing_simulator.DEFAULT_SEQUENCE_OVERHEAD_US,
+}
+
+# Scanbounds and intt are rounded down to this resolution
+RESOLUTION_MS = 1.0
+
+# Increment when packing changes, so that stale cached tables are not reused
+PACKER_VERSION = 2
+
+
+def fit_overhead_model(num_sequences, sequence_us, measured_aveperiod_ms):
+    """
+    Fits the overhead model to measured averaging periods by least squares, modelling each as
+    num_sequences * (sequence_us + sequence overhead) + averaging period overhead.
+
+    :param  num_sequences:          Number of sequences in each measured averaging period
+    :param  sequence_us:            Sequence duration without overhead of each, in us
+    :param  measured_aveperiod_ms:  Time from the start of each averaging period to the start of
+                                    the next, in ms
+
+    :returns: Overhead model dictionary
+    """
+    num_sequences = np.asarray(num_sequences, dtype=np.float64)
+    excess_ms = (
+        np.asarray(measured_aveperiod_ms)
+        - num_sequences * np.asarray(sequence_us) * 1e-3
+    )
+    design = np.stack((num_sequences, np.ones_like(num_sequences)), axis=-1)
+    (sequence_ms, aveperiod_ms), *_ = np.linalg.lstsq(design, excess_ms, rcond=None)
+    return {
+        "aveperiod_ms": max(float(aveperiod_ms), 0.0),
+        "sequence_us": max(float(sequence_ms) * 1e3, 0.0),
+    }
+
+
+def pack_slot(sequence_us, slot_ms, overhead_model=DEFAULT_OVERHEAD_MODEL):
+    """
+    Fits one averaging period into a slot.
+
+    :param  sequence_us:    Sequence duration of the averaging period, in us
+    :param  slot_ms:        Length of the slot, in ms
+    :param  overhead_model: Overhead model dictionary
+
+    :returns: intt in ms, or None if one sequence does not fit
+    """
+    sequence_ms = (sequence_us + overhead_model["sequence_us"]) * 1e-3
+    available_ms = slot_ms - overhead_model["aveperiod_ms"]
+    num_sequences = math.floor(available_ms / sequence_ms + 1e-9)
+    # Round up to the resolution, so the intt holds num_sequences whole sequences, and drop a
+    # sequence if that runs past the slot
+    while num_sequences >= 1:
+        intt_ms = (
+            math.ceil(num_sequences * sequence_ms / RESOLUTION_MS - 1e-9)
+            * RESOLUTION_MS
+        )
+        if intt_ms <= available_ms + 1e-9:
+            break
+        num_sequences -= 1
+    if num_sequences < 1:
+        return None
+    assert (
+        timing_simulator.num_sequences(intt_ms * 1e-3, np.nan, sequence_ms * 1e-3)
+        == num_sequences
+    )
+    return intt_ms
+
+
+def pack_scan(
+    sequences_us,
+    num_beams,
+    start_s=0.0,
+    duration_s=60.0,
+    overhead_model=DEFAULT_OVERHEAD_MODEL,
+):
+    """
+    Packs a scan into a window of time, with one slot per beam and averaging period.
+
+    :param  sequences_us:   Sequence duration of each averaging period run for every beam, in us
+    :param  num_beams:      Number of beams in the scan
+    :param  start_s:        Start of the window, in seconds past the minute
+    :param  duration_s:     Length of the window, in seconds
+    :param  overhead_model: Overhead model dictionary
+
+    :returns: Dictionary with 'scanbound', 'intt_ms' for each averaging period, 'spacing_s' and
+              'duty_cycle', the fraction of the window spent running sequences. None if a single
+              sequence of each averaging period does not fit in a slot.
+    """
+    num_slots = num_beams * len(sequences_us)
+    spacing_ms = (
+        math.floor(duration_s * 1e3 / num_slots / RESOLUTION_MS) * RESOLUTION_MS
+    )
+    intts_ms = [
+        pack_slot(sequence_us, spacing_ms, overhead_model)
+        for sequence_us in sequences_us
+    ]
+    if None in intts_ms:
+        return None
+    on_air_ms = 0.0
+    for sequence_us, intt_ms in zip(sequences_us, intts_ms):
+        sequence_ms = (sequence_us + overhead_model["sequence_us"]) * 1e-3
+        on_air_ms += math.floor(intt_ms / sequence_ms + 1e-9) * sequence_us * 1e-3
+    spacing_s = spacing_ms * 1e-3
+    return {
+        "scanbound": [round(start_s + i * spacing_s, 6) for i in range(num_slots)],
+        "intt_ms": intts_ms,
+        "spacing_s": spacing_s,
+        "duty_cycle": on_air_ms * num_beams / (duration_s * 1e3),
+    }
+
+
+def _scanbound(scan):
+    return next((ap["scanbound"] for ap in scan if ap["scanbound"]), None)
+
+
+def cycle_duration_s(scans):
+    """
+    Returns the time for one run through all scans: the span of the existing scanbounds, rounded up
+    to whole minutes.
+    """
+    span_s = 0.0
+    for scan in scans:
+        scanbound = _scanbound(scan)
+        if scanbound is not None:
+            span_s = max(span_s, max(scanbound))
+    return 60.0 * max(math.ceil(span_s / 60.0 + 1e-9), 1)
+
+
+def slot_ms(scans, scan_index, cycle_s):
+    """
+    Returns the shortest slot of a scan with a scanbound, in ms: the shortest time between its
+    scanbounds, and for its last bound the time to the next scan, or to the end of the cycle, but
+    no more than the longest time between its scanbounds.
+    """
+    scanbound = sorted(_scanbound(scans[scan_index]))
+    starts = sorted(
+        min(_scanbound(scan)) for scan in scans if _scanbound(scan) is not None
+    )
+    following = [start for start in starts if start > scanbound[-1]]
+    last_slot_s = (following[0] if following else cycle_s + starts[0]) - scanbound[-1]
+    spacings_s = np.diff(scanbound)
+    if spacings_s.size:
+        last_slot_s = min(last_slot_s, spacings_s.max())
+    return round(min([last_slot_s, *spacings_s]) * 1e3, 6)
+
+
+def compare_packing(experiment, packed, overhead_model=DEFAULT_OVERHEAD_MODEL):
+    """
+    Simulates an experiment with its current schedule and with a packed one.
+
+    :param  experiment:     Built ExperimentPrototype
+    :param  packed:         Output of pack_experiment(), with no None entries
+    :param  overhead_model: Overhead model dictionary
+
+    :returns: Tuple of timing_simulator.sweep() reports, before and after packing
+    """
+    before = timing_simulator.sweep(
+        experiment,
+        aveperiod_overhead_ms=overhead_model["aveperiod_ms"],
+        sequence_overhead_us=overhead_model["sequence_us"],
+    )
+    # Simulate the packed schedule by overriding the scanbound of every slice, then restore them
+    field = timing_simulator._field
+    scanbounds = {
+        slice_id: field(exp_slice, "scanbound")
+        for slice_id, exp_slice in experiment.slice_dict.items()
+    }
+
+    def set_scanbounds(values):
+        for slice_id, scanbound in values.items():
+            exp_slice = experiment.slice_dict[slice_id]
+            if isinstance(exp_slice, dict):
+                exp_slice["scanbound"] = scanbound
+            else:
+                exp_slice.scanbound = scanbound
+
+    set_scanbounds({i: result["scanbound"] for i, result in packed.items()})
+    try:
+        after = timing_simulator.sweep(
+            experiment,
+            intt_ms={i: result["intt_ms"] for i, result in packed.items()},
+            aveperiod_overhead_ms=overhead_model["aveperiod_ms"],
+            sequence_overhead_us=overhead_model["sequence_us"],
+        )
+    finally:
+        set_scanbounds(scanbounds)
+    return before, after
+
+
+def pack_experiment(experiment, cycle_s=None, overhead_model=DEFAULT_OVERHEAD_MODEL):
+    """
+    Tightens the intt of every averaging period of an experiment to the shortest slot of its scan.
+    Scanbounds are kept, so the cadence of every scan is unchanged. Scans without a scanbound have
+    no slots, and keep their intt.
+
+    :param  experiment:     Built ExperimentPrototype
+    :param  cycle_s:        Time for one run through all scans, in seconds, which ends the last
+                            slot of the last scan. Defaults to the span of the current scanbounds,
+                            rounded up to whole minutes.
+    :param  overhead_model: Overhead model dictionary
+
+    :returns: Dictionary of {slice_id: {'scanbound', 'intt_ms'}} for every slice, or None for the
+              slices of an averaging period whose slot is too short for a sequence
+    """
+    scans = timing_simulator.experiment_structure(experiment)
+    if cycle_s is None:
+        cycle_s = cycle_duration_s(scans)
+
+    packed = {}
+    for scan_index, scan in enumerate(scans):
+        scanbound = _scanbound(scan)
+        for ap in scan:
+            if scanbound is None:
+                result = {"scanbound": None, "intt_ms": ap["intt_ms"]}
+            else:
+                intt_ms = pack_slot(
+                    ap["sequence_us"],
+                    slot_ms(scans, scan_index, cycle_s),
+                    overhead_model,
+                )
+                result = None
+                if intt_ms is not None:
+                    result = {"scanbound": ap["scanbound"], "intt_ms": intt_ms}
+            for slice_id in ap["slice_ids"]:
+                packed[slice_id] = result
+    return packed
+
+
+def scanbound_table(
+    site_id,
+    pulse_sequence=scf.SEQUENCE_7P,
+    tau_spacing=scf.TAU_SPACING_7P,
+    pulse_len=scf.PULSE_LEN_45KM,
+    overhead_model=DEFAULT_OVERHEAD_MODEL,
+    duration_s=60.0,
+):
+    """
+    Returns the packed scanbound of a single-slice scan for every beam count up to the number of
+    beams of a site, cached on disk per site.
+
+    :param  site_id:        Three-letter site code
+    :param  pulse_sequence: Pulse sequence of the slice
+    :param  tau_spacing:    Multi-pulse increment, in us
+    :param  pulse_len:      Pulse length, in us
+    :param  overhead_model: Overhead model dictionary
+    :param  duration_s:     Length of one scan, in seconds
+
+    :returns: Dictionary of {num_beams: pack_scan() result}
+    """
+    site = scf.load_site(site_id)
+    params = {
+        "site_id": site_id,
+        "pulse_sequence": list(pulse_sequence),
+        "tau_spacing": tau_spacing,
+        "pulse_len": pulse_len,
+        "num_ranges": site.STD_NUM_RANGES,
+        "first_range": scf.STD_FIRST_RANGE,
+        "overhead_model": dict(overhead_model),
+        "duration_s": duration_s,
+        "version": PACKER_VERSION,
+    }
+    path = f"{cache.cache_dir('scanbound')}/{site_id}_{cache.content_key(params)}.json"
+    contents = cache.load_json(path, default=None)
+    if contents is None:
+        sequence_us = timing_simulator.sequence_duration_us(
+            pulse_sequence,
+            tau_spacing,
+            pulse_len,
+            site.STD_NUM_RANGES,
+            scf.STD_FIRST_RANGE,
+        )
+        table = {
+            str(num_beams): pack_scan(
+                [sequence_us], num_beams, 0.0, duration_s, overhead_model
+            )
+            for num_beams in range(1, len(site.STD_BEAM_ORDER) + 1)
+        }
+        contents = {"params": params, "table": table}
+        cache.write_json(path, contents)
+    # JSON keys are strings, so they are sorted as beam counts here
+    return dict(sorted((int(key), value) for key, value in contents["table"].items()))
+
+
+def _print_experiment(experiment_name, cycle_s, overhead_model):
+    module_name, class_name = experiment_name.rsplit(".", 1)
+    module = importlib.import_module(f"borealis_experiments.{module_name}")
+    experiment = getattr(module, class_name)()
+
+    packed = pack_experiment(experiment, cycle_s, overhead_model)
+    for slice_id, result in sorted(packed.items()):
+        if result is None:
+            print(f"slice {slice_id}: a sequence does not fit in the packed slot")
+            return
+    before, after = compare_packing(experiment, packed, overhead_model)
+    summary = (
+        f"duty cycle {before['duty_cycle']:.3f} -> {after['duty_cycle']:.3f}, "
+        f"overruns {before['num_overruns']} -> {after['num_overruns']}"
+    )
+    if (
+        after["duty_cycle"] < before["duty_cycle"]
+        and after["num_overruns"] >= before["num_overruns"]
+    ):
+        print(f"Packing rejected, it lowers the duty cycle: {summary}")
+        return
+    if after["duty_cycle"] < before["duty_cycle"]:
+        print("Packing lowers the duty cycle, but removes overruns")
+
+    for slice_id, result in sorted(packed.items()):
+        print(f"slice {slice_id}: intt {result['intt_ms']:g} ms")
+        if result["scanbound"] is not None:
+            print(f"    scanbound {result['scanbound']}")
+    print(f"\n{summary}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Pack scanbounds and intt to maximize duty cycle."
+    )
+    parser.add_argument(
+        "--overhead-ms",
+        type=float,
+        default=DEFAULT_OVERHEAD_MODEL["aveperiod_ms"],
+        help="Processing time after each averaging period, in ms",
+    )
+    parser.add_argument(
+        "--sequence-overhead-us",
+        type=float,
+        default=DEFAULT_OVERHEAD_MODEL["sequence_us"],
+        help="Dead time after each sequence, in us",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    table_parser = subparsers.add_parser(
+        "table", help="Print the lookup table of every beam count for sites"
+    )
+    table_parser.add_argument(
+        "site_ids",
+        nargs="*",
+        default=[site for site in scf.__default_freqs__ if site != "default"],
+    )
+    experiment_parser = subparsers.add_parser(
+        "experiment", help="Pack the scans of an experiment"
+    )
+    experiment_parser.add_argument(
+        "experiment",
+        help="Experiment class as module.Class, relative to borealis_experiments",
+    )
+    experiment_parser.add_argument(
+        "--cycle-s",
+        type=float,
+        help="Time for all scans, in seconds. Defaults to the span of the current "
+        "scanbounds, rounded up to whole minutes.",
+    )
+    args = parser.parse_args()
+
+    overhead_model = {
+        "aveperiod_ms": args.overhead_ms,
+        "sequence_us": args.sequence_overhead_us,
+    }
+    if args.command == "experiment":
+        _print_experiment(args.experiment, args.cycle_s, overhead_model)
+        return
+
+    print(
+        f"{'site':>4} {'beams':>5} {'spacing (s)':>11} {'intt (ms)':>9} {'duty cycle':>10}"
+    )
+    for site_id in args.site_ids:
+        for num_beams, packed in scanbound_table(
+            site_id, overhead_model=overhead_model
+        ).items():
+            print(
+                f"{site_id:>4} {num_beams:>5} {packed['spacing_s']:>11.3f} "
+                f"{packed['intt_ms'][0]:>9g} {packed['duty_cycle']:>10.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+#!/usr/bin/python
+
+"""
+sequence_search
+~~~~~~~~~~~~~~~
+Searches for multi-pulse sequences of up to 12 pulses with few missing lags. A sequence is held as
+a bitset with bit p set for a pulse at position p (in units of tau_spacing), so the set of lags it
+measures is the OR of the bitset shifted right by each pulse position, and counting lags is a
+popcount.
+
+Candidates are ranked by
+
+    score = MISSING_WEIGHT * missing lags + GAP_WEIGHT * lags after the first missing lag
+            + LENGTH_WEIGHT * length + BLANKING_WEIGHT * blanked
+
+where missing lags are the lags between 1 and the maximum length of the search with no pulse pair,
+the length is the position of the last pulse, and blanked is the fraction of (range, lag) samples
+of the best pair of each lag that overlap a transmitted pulse, which depends on pulse_len and
+tau_spacing. The gap term favours sequences whose low lags are all measured. Small searches are
+enumerated exhaustively; larger ones are annealed from many random starts. Either way the work is
+spread over a process pool. Results are added to a JSON catalog, keyed by sequence and timing.
+
+Usage: python3 -m borealis_experiments.tools.sequence_search num_pulses max_length [--tau us]
+
+:copyright: 2026 SuperDARN Canada
+"""
+
+import argparse
+import concurrent.futures
+import itertools
+import math
+import os
+import random
+
+from borealis_experiments.tools import cache, lag_tables, timing_simulator
+
+MAX_PULSES = 12
+MISSING_WEIGHT = 1.0
+GAP_WEIGHT = 0.25
+LENGTH_WEIGHT = 0.25
+BLANKING_WEIGHT = 10.0
+
+# Largest number of sequences enumerated instead of annealed
+MAX_ENUMERATED = 2_000_000
+
+
+def lag_bits(pulse_sequence):
+    """Returns a bitset with bit l set for every lag l >= 0 measured by a pulse sequence."""
+    mask = 0
+    for position in pulse_sequence:
+        mask |= 1 << position
+    lags = 0
+    for position in pulse_sequence:
+        lags |= mask >> position
+    return lags
+
+
+def coverage(pulse_sequence, max_length=None):
+    """
+    Returns a dictionary with the 'length' of a pulse sequence, its 'distinct_lags',
+    'missing_lags' between 1 and max_length (defaults to the length), 'first_missing_lag'
+    (max_length + 1 if none are missing) and 'repeated_lags', the number of pulse pairs beyond one
+    per lag.
+    """
+    length = max(pulse_sequence)
+    max_length = max(max_length or length, length)
+    lags = lag_bits(pulse_sequence)
+    distinct = lags.bit_count() - 1
+    missing = ~lags & ((1 << (max_length + 1)) - 2)
+    return {
+        "length": length,
+        "distinct_lags": distinct,
+        "missing_lags": max_length - distinct,
+        "first_missing_lag": (
+            (missing & -missing).bit_length() - 1 if missing else max_length + 1
+        ),
+        "repeated_lags": math.comb(len(pulse_sequence), 2) - distinct,
+    }
+
+
+def _cost(pulse_sequence, max_length):
+    """Score of a sequence without blanking, which is only evaluated for the best candidates."""
+    length = max(pulse_sequence)
+    lags = lag_bits(pulse_sequence)
+    missing = ~lags & ((1 << (max_length + 1)) - 2)
+    first_missing = (missing & -missing).bit_length() - 1 if missing else max_length + 1
+    return (
+        MISSING_WEIGHT * (max_length + 1 - lags.bit_count())
+        + GAP_WEIGHT * (max_length + 1 - first_missing)
+        + LENGTH_WEIGHT * length
+    )
+
+
+def _canonical(pulse_sequence):
+    """Returns the sequence or its mirror image, whichever sorts first."""
+    length = max(pulse_sequence)
+    mirror = tuple(sorted(length - position for position in pulse_sequence))
+    return min(tuple(sorted(pulse_sequence)), mirror)
+
+
+def _keep(best, pulse_sequence, cost, num_results):
+    """Adds a candidate to a dictionary of the best num_results candidates."""
+    if len(best) >= num_results and cost >= max(best.values()):
+        return
+    best[_canonical(pulse_sequence)] = cost
+    if len(best) > num_results:
+        del best[max(best, key=best.get)]
+
+
+def _enumerate(task):
+    """Tries every sequence whose second pulse is at a given position."""
+    num_pulses, max_length, second, num_results = task
+    best = {}
+    for rest in itertools.combinations(
+        range(second + 1, max_length + 1), num_pulses - 2
+    ):
+        pulse_sequence = (0, second) + rest
+        _keep(best, pulse_sequence, _cost(pulse_sequence, max_length), num_results)
+    return best
+
+
+def _anneal(task):
+    """Anneals from a random sequence, moving one pulse at a time."""
+    num_pulses, max_length, seed, iterations, num_results = task
+    rng = random.Random(seed)
+    positions = [0] + sorted(rng.sample(range(1, max_length + 1), num_pulses - 1))
+    cost = _cost(positions, max_length)
+    best = {}
+    start_temperature, end_temperature = 2.0, 0.05
+    for iteration in range(iterations):
+        temperature = start_temperature * (end_temperature / start_temperature) ** (
+            iteration / iterations
+        )
+        index = rng.randrange(1, num_pulses)
+        new_position = rng.randrange(1, max_length + 1)
+        if new_position in positions:
+            continue
+        candidate = positions.copy()
+        candidate[index] = new_position
+        candidate_cost = _cost(candidate, max_length)
+        if candidate_cost <= cost or rng.random() < math.exp(
+            (cost - candidate_cost) / temperature
+        ):
+            positions, cost = candidate, candidate_cost
+            _keep(best, positions, cost, num_results)
+    return best
+
+
+def search(
+    num_pulses,
+    max_length,
+    tau_spacing,
+    pulse_len,
+    num_ranges=75,
+    first_range=180,
+    num_results=10,
+    chains=None,
+    iterations=20000,
+    num_workers=None,
+    seed=0,
+):
+    """
+    Searches for the best pulse sequences of a number of pulses.
+
+    :param  num_pulses:     Number of pulses, at most MAX_PULSES
+    :param  max_length:     Largest position of the last pulse, in units of tau_spacing
+    :param  tau_spacing:    Multi-pulse increment, in us
+    :param  pulse_len:      Pulse length, in us
+    :param  num_ranges:     Number of range gates, for blanking and the sequence duration
+    :param  first_range:    Distance to the first range gate, in km
+    :param  num_results:    Number of candidates to return
+    :param  chains:         Number of annealing chains. Defaults to 4 per worker.
+    :param  iterations:     Number of moves per annealing chain
+    :param  num_workers:    Number of worker processes. Defaults to the number of CPUs.
+    :param  seed:           Seed of the first annealing chain
+
+    :returns: List of candidate dictionaries, best first, with the 'sequence', 'score',
+              'blanked_fraction' and 'sequence_us' plus the keys of coverage()
+    """
+    if not 2 <= num_pulses <= MAX_PULSES:
+        raise ValueError(f"num_pulses must be between 2 and {MAX_PULSES}")
+    if max_length < num_pulses - 1:
+        raise ValueError(f"{num_pulses} pulses do not fit in a length of {max_length}")
+    num_workers = num_workers or os.cpu_count()
+    # Keep extra candidates per task, as blanking can change their order
+    task_results = 4 * num_results
+
+    if math.comb(max_length, num_pulses - 1) <= MAX_ENUMERATED:
+        worker = _enumerate
+        tasks = [
+            (num_pulses, max_length, second, task_results)
+            for second in range(1, max_length - num_pulses + 3)
+        ]
+    else:
+        worker = _anneal
+        tasks = [
+            (num_pulses, max_length, seed + chain, iterations, task_results)
+            for chain in range(chains or 4 * num_workers)
+        ]
+
+    candidates = {}
+    with concurrent.futures.ProcessPoolExecutor(max_workers=num_workers) as executor:
+        for best in executor.map(worker, tasks):
+            for pulse_sequence, cost in best.items():
+                _keep(candidates, pulse_sequence, cost, task_results)
+
+    results = []
+    for pulse_sequence, cost in candidates.items():
+        analysis = lag_tables.lag_analysis(
+            pulse_sequence, tau_spacing, pulse_len, num_ranges, first_range
+        )
+        blanked_fraction = sum(analysis["blanked"].values()) / (
+            len(analysis["blanked"]) * num_ranges
+        )
+        results.append(
+            {
+                "sequence": list(pulse_sequence),
+                "score": cost + BLANKING_WEIGHT * blanked_fraction,
+                "blanked_fraction": blanked_fraction,
+                "sequence_us": timing_simulator.sequence_duration_us(
+                    pulse_sequence, tau_spacing, pulse_len, num_ranges, first_range
+                ),
+                **coverage(pulse_sequence, max_length),
+            }
+        )
+    results.sort(key=lambda result: (result["score"], result["sequence"]))
+    return results[:num_results]
+
+
+def catalog_path():
+    """Returns the path of the default sequence catalog."""
+    return os.path.join(cache.cache_dir("sequences"), "catalog.json")
+
+
+def write_catalog(results, tau_spacing, pulse_len, path=None):
+    """
+    Adds search results to a catalog, a JSON dictionary of {"sequence@tau_spacing/pulse_len":
+    candidate}. Existing entries for the same sequence and timing are replaced.
+
+    :returns: The updated catalog
+    """
+    path = path or catalog_path()
+    catalog = cache.load_json(path, default={})
+    for result in results:
+        sequence = ",".join(str(position) for position in result["sequence"])
+        catalog[f"{sequence}@{tau_spacing}/{pulse_len}"] = {
+            **result,
+            "tau_spacing": tau_spacing,
+            "pulse_len": pulse_len,
+        }
+    cache.write_json(path, catalog)
+    return catalog
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Search for pulse sequences with few missing lags."
+    )
+    parser.add_argument("num_pulses", type=int)
+    parser.add_argument(
+        "max_length", type=int, help="Largest last pulse position, in tau"
+    )
+    parser.add_argument("--tau", type=int, default=2400, help="tau_spacing in us")
+    parser.add_argument("--pulse-len", type=int, default=300, help="In us")
+    parser.add_argument("--num-ranges", type=int, default=75)
+    parser.add_argument("--first-range", type=float, default=180, help="In km")
+    parser.add_argument("-n", "--num-results", type=int, default=10)
+    parser.add_argument("--chains", type=int)
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--catalog", help="Catalog file. Defaults to the cache.")
+    args = parser.parse_args()
+
+    results = search(
+        args.num_pulses,
+        args.max_length,
+        args.tau,
+        args.pulse_len,
+        args.num_ranges,
+        args.first_range,
+        args.num_results,
+        args.chains,
+        args.iterations,
+        args.jobs,
+        args.seed,
+    )
+    write_catalog(results, args.tau, args.pulse_len, args.catalog)
+
+    print(
+        f"{'sequence':<44} {'score':>6} {'length':>6} {'missing':>7} {'first':>5} "
+        f"{'repeated':>8} {'blanked':>7} {'seq (ms)':>8}"
+    )
+    for result in results:
+        sequence = ",".join(str(position) for position in result["sequence"])
+        print(
+            f"{sequence:<44} {result['score']:>6.2f} {result['length']:>6} "
+            f"{result['missing_lags']:>7} {result['first_missing_lag']:>5} "
+            f"{result['repeated_lags']:>8} {result['blanked_fraction']:>7.3f} "
+            f"{result['sequence_us'] * 1e-3:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
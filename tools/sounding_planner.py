@@ -0,0 +1,208 @@
+#!/usr/bin/python
+
+"""
+sounding_planner
+~~~~~~~~~~~~~~~~
+Picks the sounding frequencies of a site. The band is split into one sub-band per frequency, so
+the frequencies stay spread across the band for ionospheric coverage, and every candidate, on a
+grid of whole kHz, is scored by
+
+    score = noise in dB + SPREAD_WEIGHT_DB * distance from the centre of its sub-band / half width
+
+where the noise is the mean over a recent window of the site's noise history, from
+tools.noise_history, interpolated to the candidate. Candidates whose channel, 1 / pulse_len wide,
+overlaps a buffered restricted range are dropped. All candidates are scored at once, and the best
+of each sub-band is found by sorting on (sub-band, score).
+
+Plans are written as per-site JSON files to the cache. superdarn_common_fields only uses them in
+place of the hand-picked SOUNDING_FREQS when the BOREALIS_SOUNDING_PLANS environment variable names
+the directory of plans, and logs the replacement. A plan is only used if it has as many frequencies
+as the hand-picked set, which the sounding experiments schedule around, and if every frequency is
+still clear of the site's restricted ranges.
+
+Usage: python3 -m borealis_experiments.tools.sounding_planner site_id [--window s]
+
+:copyright: 2026 SuperDARN Canada
+"""
+
+import argparse
+import os
+
+import numpy as np
+
+import borealis_experiments.superdarn_common_fields as scf
+from borealis_experiments.tools import cache, noise_history, restricted_ranges
+
+DEFAULT_CHANNEL_KHZ = 1e3 / 300  # Bandwidth of a 300 us pulse
+DEFAULT_BUFFER_KHZ = 25
+DEFAULT_WINDOW_S = 24 * 3600
+SPREAD_WEIGHT_DB = 3.0
+
+
+def plan_path(site_id, directory=None):
+    """
+    Returns the path of the sounding plan of a site, in directory or by default in the cache,
+    which is created if needed.
+    """
+    return os.path.join(directory or cache.cache_dir("sounding"), f"{site_id}.json")
+
+
+def noise_profile(freqs, noise_freqs=None, noise_db=None):
+    """
+    Returns the noise in dB at each frequency, interpolated from a noise history of
+    (noise_freqs, noise_db), or zeros without one.
+    """
+    freqs = np.asarray(freqs, dtype=np.float64)
+    if noise_freqs is None or len(noise_freqs) == 0:
+        return np.zeros(freqs.shape)
+    order = np.argsort(noise_freqs)
+    return np.interp(freqs, np.asarray(noise_freqs)[order], np.asarray(noise_db)[order])
+
+
+def plan(
+    num_freqs,
+    band,
+    restricted,
+    noise_freqs=None,
+    noise_db=None,
+    channel_khz=DEFAULT_CHANNEL_KHZ,
+):
+    """
+    Picks sounding frequencies.
+
+    :param  num_freqs:      Number of frequencies
+    :param  band:           [low, high] kHz to spread the frequencies over
+    :param  restricted:     RestrictedRanges, including any buffer, whose channels are avoided
+    :param  noise_freqs:    Frequencies of the noise history, in kHz
+    :param  noise_db:       Noise at each frequency of the noise history, in dB
+    :param  channel_khz:    Width of a sounding channel, in kHz
+
+    :raises ValueError:     If a sub-band has no clear channel
+
+    :returns: Tuple of num_freqs int frequencies in kHz, ascending
+    """
+    half_width = channel_khz / 2
+    freqs = np.arange(np.ceil(band[0] + half_width), np.floor(band[1] - half_width) + 1)
+    freqs = freqs[restricted.is_clear(freqs - half_width, freqs + half_width)]
+
+    edges = np.linspace(band[0], band[1], num_freqs + 1)
+    sub_band = np.clip(
+        np.searchsorted(edges, freqs, side="right") - 1, 0, num_freqs - 1
+    )
+    centers = (edges[:-1] + edges[1:]) / 2
+    sub_band_half_width = (band[1] - band[0]) / num_freqs / 2
+    scores = (
+        noise_profile(freqs, noise_freqs, noise_db)
+        + SPREAD_WEIGHT_DB * np.abs(freqs - centers[sub_band]) / sub_band_half_width
+    )
+
+    order = np.lexsort((scores, sub_band))
+    firsts = np.flatnonzero(np.diff(sub_band[order], prepend=-1))
+    if firsts.size < num_freqs:
+        missing = sorted(set(range(num_freqs)) - set(sub_band[order][firsts]))
+        raise ValueError(
+            f"No clear channel in sub-bands {missing} of {list(band)} kHz; "
+            "use fewer frequencies or a wider band"
+        )
+    return tuple(int(freq) for freq in freqs[order[firsts]])
+
+
+def write_plan(site_id, freqs, directory=None, **params):
+    """Writes the sounding plan of a site, with the parameters that produced it."""
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    cache.write_json(
+        plan_path(site_id, directory),
+        {"site_id": site_id, "sounding": list(freqs), "params": params},
+    )
+
+
+def load_plan(site_id, num_freqs, restricted, directory):
+    """
+    Returns the planned sounding frequencies of a site, or None if there is no usable plan.
+
+    :param  site_id:    Three-letter site code
+    :param  num_freqs:  Number of frequencies the plan must have
+    :param  restricted: RestrictedRanges that every planned frequency must be clear of
+    :param  directory:  Directory of the plans
+    """
+    contents = cache.load_json(plan_path(site_id, directory))
+    if contents is None:
+        return None
+    freqs = contents.get("sounding", [])
+    if len(freqs) != num_freqs or not restricted.is_allowed(freqs).all():
+        return None
+    return tuple(freqs)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Plan the sounding frequencies of a site and write them to its cache."
+    )
+    parser.add_argument("site_id")
+    parser.add_argument(
+        "--num-freqs",
+        type=int,
+        help="Defaults to the number of hand-picked sounding frequencies",
+    )
+    parser.add_argument(
+        "--band",
+        type=float,
+        nargs=2,
+        help="kHz. Defaults to the span of the hand-picked sounding frequencies",
+    )
+    parser.add_argument("--buffer", type=float, default=DEFAULT_BUFFER_KHZ, help="kHz")
+    parser.add_argument(
+        "--window",
+        type=float,
+        default=DEFAULT_WINDOW_S,
+        help="Seconds of noise history to use",
+    )
+    parser.add_argument(
+        "--output",
+        help="Directory to write the plan to. Defaults to the cache.",
+    )
+    parser.add_argument(
+        "--noise",
+        help=".npy file of shape [2, N] with frequencies in kHz and noise in dB, used "
+        "instead of the noise history",
+    )
+    args = parser.parse_args()
+
+    site = scf.load_site(args.site_id)
+    hand_picked = scf.__default_freqs__.get(
+        args.site_id, scf.__default_freqs__["default"]
+    )["sounding"]
+    num_freqs = args.num_freqs or len(hand_picked)
+    band = args.band or (min(hand_picked), max(hand_picked))
+    restricted = restricted_ranges.RestrictedRanges.from_options(
+        site.config, buffer_khz=args.buffer
+    )
+    noise_freqs = noise_db = None
+    if args.noise:
+        noise_freqs, noise_db = np.load(args.noise)
+    else:
+        store = noise_history.open_store(args.site_id)
+        if store is not None:
+            noise_freqs, noise_db, _ = store.aggregate(args.window)
+
+    freqs = plan(num_freqs, band, restricted, noise_freqs, noise_db)
+    write_plan(
+        args.site_id,
+        freqs,
+        args.output,
+        band=list(band),
+        buffer_khz=args.buffer,
+        noise=args.noise,
+        window_s=args.window,
+        noise_bins=0 if noise_freqs is None else len(noise_freqs),
+    )
+    print(f"hand-picked: {', '.join(str(freq) for freq in hand_picked)}")
+    print(f"planned:     {', '.join(str(freq) for freq in freqs)}")
+    path = plan_path(args.site_id, args.output)
+    print(f"written to {path}")
+    print(f"set BOREALIS_SOUNDING_PLANS={os.path.dirname(path)} to use it")
+
+
+if __name__ == "__main__":
+    main()
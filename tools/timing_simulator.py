@@ -0,0 +1,440 @@
+#!/usr/bin/python
+
+"""
+timing_simulator
+~~~~~~~~~~~~~~~~
+Discrete-event simulation of the schedule of a built experiment, to check offline that its
+averaging periods fit within their scanbounds once processing overhead is added.
+
+The model follows the way Borealis runs an experiment:
+
+    - Slices that are SCAN interfaced form separate scans, which run one after the other.
+    - Within a scan, AVEPERIOD interfaced slices form separate averaging periods, which run one
+      after the other for each beam. Each averaging period consumes one scanbound. SEQUENCE interfaced slices share an averaging period, with
+      their pulse sequences run one after the other; CONCURRENT slices transmit at the same time.
+    - A sequence lasts until the last range gate of the last pulse has been received. An averaging
+      period runs as many whole sequences as fit in intt, or in the time left before the next
+      scanbound if that is shorter, or runs intn sequences.
+    - Every averaging period is followed by a processing overhead before the next one can start.
+    - Scanbounds are seconds past the minute. A scan aligns its scanbounds to the minute in which
+      its first scanbound is due, counting a start of up to 30 s after it as late and otherwise
+      waiting for the next minute.
+
+An averaging period overruns when the previous one, plus overhead, has not finished by its
+scanbound; it then starts late. Idle time is spent waiting for a scanbound.
+
+All events are expanded once, and the schedule recurrence is evaluated for many parameter
+combinations at once as numpy arrays, so thousands of combinations can be swept quickly.
+
+Usage: python3 -m borealis_experiments.tools.timing_simulator module.Class [--scans N]
+       [--overhead-ms MS [MS ...]]
+
+:copyright: 2026 SuperDARN Canada
+"""
+
+import argparse
+import importlib
+
+import numpy as np
+
+SPEED_OF_LIGHT = 299792458.0  # m/s
+
+# Default time between averaging periods, for processing and setting up the next one
+DEFAULT_AVEPERIOD_OVERHEAD_MS = 50.0
+# Default dead time between sequences
+DEFAULT_SEQUENCE_OVERHEAD_US = 0.0
+
+
+def _field(exp_slice, name, default=None):
+    """Returns a field of a slice, which may be a dictionary or a validated slice object."""
+    if isinstance(exp_slice, dict):
+        return exp_slice.get(name, default)
+    return getattr(exp_slice, name, default)
+
+
+def sequence_duration_us(
+    pulse_sequence, tau_spacing, pulse_len, num_ranges, first_range
+):
+    """
+    Returns the duration of one pulse sequence in microseconds: the time up to the last pulse, plus
+    the time to receive every range gate of the last pulse.
+
+    :param  pulse_sequence: Pulse positions in multiples of tau_spacing
+    :param  tau_spacing:    Multi-pulse increment, in us
+    :param  pulse_len:      Pulse length, in us. Also the length of a range gate.
+    :param  num_ranges:     Number of range gates
+    :param  first_range:    Distance to the first range gate, in km
+    """
+    first_range_us = 2 * first_range * 1e3 / SPEED_OF_LIGHT * 1e6
+    return max(pulse_sequence) * tau_spacing + first_range_us + num_ranges * pulse_len
+
+
+def slice_sequence_us(exp_slice):
+    """Returns the sequence duration of a slice in microseconds."""
+    return sequence_duration_us(
+        _field(exp_slice, "pulse_sequence"),
+        _field(exp_slice, "tau_spacing"),
+        _field(exp_slice, "pulse_len"),
+        _field(exp_slice, "num_ranges"),
+        _field(exp_slice, "first_range"),
+    )
+
+
+def num_sequences(intt_s, intn, sequence_s):
+    """
+    Returns the number of sequences in an averaging period: as many whole sequences as fit in
+    intt_s (at least one), or intn where intt_s is NaN. Arguments are broadcast together.
+    """
+    fitted = np.maximum(np.floor(np.nan_to_num(intt_s) / sequence_s + 1e-9), 1)
+    return np.where(np.isnan(intt_s), intn, fitted)
+
+
+def _groups(slice_ids, interface, joining):
+    """Returns lists of slice IDs that are connected by interfacing types in joining."""
+    parent = {slice_id: slice_id for slice_id in slice_ids}
+
+    def root(slice_id):
+        while parent[slice_id] != slice_id:
+            slice_id = parent[slice_id]
+        return slice_id
+
+    for (a, b), interface_type in interface.items():
+        if interface_type in joining:
+            parent[root(a)] = root(b)
+    groups = {}
+    for slice_id in sorted(slice_ids):
+        groups.setdefault(root(slice_id), []).append(slice_id)
+    return sorted(groups.values())
+
+
+def experiment_structure(experiment):
+    """
+    Breaks an experiment into scans and averaging periods.
+
+    :param  experiment: Built ExperimentPrototype
+
+    :returns: List of scans, each a list of averaging periods, each a dictionary with 'slice_ids',
+              'sequence_us' (without overhead), 'intt_ms', 'intn', 'num_beams' and 'scanbound'
+    """
+    slice_dict = experiment.slice_dict
+    interface = experiment.interface
+    scans = []
+    for scan_ids in _groups(
+        slice_dict, interface, ("AVEPERIOD", "SEQUENCE", "CONCURRENT")
+    ):
+        scan_interface = {
+            key: value
+            for key, value in interface.items()
+            if key[0] in scan_ids and key[1] in scan_ids
+        }
+        aveperiods = []
+        for aveperiod_ids in _groups(
+            scan_ids, scan_interface, ("SEQUENCE", "CONCURRENT")
+        ):
+            # CONCURRENT slices share a sequence, SEQUENCE interfaced ones run in turn
+            sequence_us = sum(
+                max(slice_sequence_us(slice_dict[i]) for i in concurrent_ids)
+                for concurrent_ids in _groups(
+                    aveperiod_ids, scan_interface, ("CONCURRENT",)
+                )
+            )
+            first = slice_dict[aveperiod_ids[0]]
+            intt_ms = _field(first, "intt")
+            aveperiods.append(
+                {
+                    "slice_ids": aveperiod_ids,
+                    "sequence_us": sequence_us,
+                    "intt_ms": np.nan if intt_ms is None else float(intt_ms),
+                    "intn": _field(first, "intn") or np.nan,
+                    "num_beams": len(_field(first, "rx_beam_order")),
+                    "scanbound": _field(first, "scanbound"),
+                }
+            )
+        scans.append(aveperiods)
+    return scans
+
+
+def run_order(scan):
+    """
+    Returns the index of the averaging period of every slot of a full run through a scan: for each
+    beam in turn, every averaging period with that beam, so AVEPERIOD interfaced slices alternate.
+    """
+    num_beams = max(ap["num_beams"] for ap in scan)
+    return [
+        i
+        for beam in range(num_beams)
+        for i, ap in enumerate(scan)
+        if beam < ap["num_beams"]
+    ]
+
+
+def expand_events(scans, num_scans):
+    """
+    Lists every averaging period of the experiment in the order they run. Each averaging period of
+    a scan with a scanbound consumes one bound, so a scan ends after one averaging period per
+    bound, and the next run of the scan continues the run order where it stopped. A run order
+    longer than the scanbound, e.g. several AVEPERIOD slices or a long beam order, takes several
+    scans to complete.
+
+    :param  scans:      Output of experiment_structure()
+    :param  num_scans:  Number of times to run through all scans
+
+    :returns: Dictionary of arrays with one entry per averaging period: 'aveperiod', the index into
+              the flattened list of averaging periods, 'bound_s', the scanbound in seconds past the
+              minute (NaN for none), 'next_bound_s', the next scanbound in the same scan (NaN for
+              none), 'scan_start', whether it is the first of its scan, and 'run_start', whether
+              it is the first of a run through all scans
+    """
+    aveperiod = []
+    bound_s = []
+    next_bound_s = []
+    scan_start = []
+    run_firsts = []
+    orders = [run_order(scan) for scan in scans]
+    # Position in the run order of each scan, carried from one run of the scan to the next
+    positions = [0] * len(scans)
+    for _ in range(num_scans):
+        index = 0
+        run_firsts.append(len(aveperiod))
+        for scan_index, scan in enumerate(scans):
+            order = orders[scan_index]
+            scanbound = next(
+                (ap["scanbound"] for ap in scan if ap["scanbound"] is not None), None
+            )
+            num_slots = len(order)
+            if scanbound is not None:
+                num_slots = min(num_slots, len(scanbound))
+            first = positions[scan_index]
+            positions[scan_index] = (first + num_slots) % len(order)
+            for slot in range(num_slots):
+                aveperiod.append(index + order[(first + slot) % len(order)])
+                if scanbound is None:
+                    bound_s.append(np.nan)
+                    next_bound_s.append(np.nan)
+                else:
+                    bound_s.append(scanbound[slot])
+                    next_bound_s.append(
+                        scanbound[slot + 1] if slot + 1 < num_slots else np.nan
+                    )
+            scan_start += [True] + [False] * (num_slots - 1)
+            index += len(scan)
+    return {
+        "aveperiod": np.array(aveperiod),
+        "bound_s": np.array(bound_s, dtype=np.float64),
+        "next_bound_s": np.array(next_bound_s, dtype=np.float64),
+        "scan_start": np.array(scan_start),
+        "run_start": np.isin(np.arange(len(aveperiod)), run_firsts),
+    }
+
+
+def simulate(sequence_s, intt_s, intn, events, overhead_s, truncate_at_scanbound=True):
+    """
+    Runs the schedule recurrence for many parameter combinations at once.
+
+    :param  sequence_s:             Sequence duration of each event, shape [..., num_events]
+    :param  intt_s:                 Integration time of each event, or NaN to use intn, shape
+                                    [..., num_events]
+    :param  intn:                   Number of sequences of each event where intt_s is NaN, shape [num_events]
+    :param  events:                 Output of expand_events()
+    :param  overhead_s:             Processing time after each averaging period, broadcastable to
+                                    sequence_s[..., 0]
+    :param  truncate_at_scanbound:  If True, an averaging period stops starting sequences that would
+                                    end after the next scanbound of its scan, as well as after intt
+
+    :returns: Dictionary of arrays of shape [..., num_events]: 'start_s', 'duration_s', 'late_s',
+              the time an event started after its scanbound, and 'wait_s', the idle time before it
+    """
+    sequence_s, intt_s = np.broadcast_arrays(
+        np.asarray(sequence_s, dtype=np.float64), np.asarray(intt_s, dtype=np.float64)
+    )
+    shape = sequence_s.shape
+    overhead_s = np.broadcast_to(np.asarray(overhead_s, dtype=np.float64), shape[:-1])
+    start_s = np.empty(shape)
+    duration_s = np.empty(shape)
+    late_s = np.zeros(shape)
+    wait_s = np.zeros(shape)
+
+    ready_s = np.zeros(shape[:-1])
+    minute_s = np.zeros(shape[:-1])
+    for event in range(shape[-1]):
+        bound = events["bound_s"][event]
+        if np.isnan(bound):
+            start = ready_s
+        else:
+            if events["scan_start"][event]:
+                # Align to the minute in which this scanbound is due
+                lateness = np.mod(ready_s - bound, 60.0)
+                minute_s = ready_s - bound - lateness
+                minute_s = np.where(lateness >= 30.0, minute_s + 60.0, minute_s)
+            bound_time = minute_s + bound
+            start = np.maximum(ready_s, bound_time)
+            late_s[..., event] = np.maximum(ready_s - bound_time, 0.0)
+            wait_s[..., event] = start - ready_s
+
+        available_s = intt_s[..., event]
+        next_bound = events["next_bound_s"][event]
+        if truncate_at_scanbound and not np.isnan(next_bound):
+            available_s = np.fmin(available_s, minute_s + next_bound - start)
+        duration = sequence_s[..., event] * num_sequences(
+            available_s, intn[event], sequence_s[..., event]
+        )
+        start_s[..., event] = start
+        duration_s[..., event] = duration
+        ready_s = start + duration + overhead_s
+
+    return {
+        "start_s": start_s,
+        "duration_s": duration_s,
+        "late_s": late_s,
+        "wait_s": wait_s,
+    }
+
+
+def sweep(
+    experiment,
+    intt_ms=None,
+    aveperiod_overhead_ms=DEFAULT_AVEPERIOD_OVERHEAD_MS,
+    sequence_overhead_us=DEFAULT_SEQUENCE_OVERHEAD_US,
+    num_scans=10,
+    truncate_at_scanbound=True,
+):
+    """
+    Simulates an experiment for many combinations of integration time and overhead at once.
+
+    :param  experiment:             Built ExperimentPrototype
+    :param  intt_ms:                Dictionary of {slice_id: intt in ms} overriding the intt of the
+                                    averaging periods containing those slices. Values may be arrays.
+    :param  aveperiod_overhead_ms:  Processing time after each averaging period, in ms. May be an array.
+    :param  sequence_overhead_us:   Dead time after each sequence, in us. May be an array.
+    :param  num_scans:              Number of times to run through all scans
+    :param  truncate_at_scanbound:  See simulate()
+
+    :returns: Dictionary of arrays with the broadcast shape of the parameters: 'duty_cycle', the
+              fraction of time spent running sequences, 'idle_s', 'num_overruns', 'overrun_s',
+              'num_aveperiods', 'total_s' and 'cycle_s', the average time of one run through all
+              scans. 'slices' holds the same keys per slice ID, except total_s and cycle_s.
+    """
+    scans = experiment_structure(experiment)
+    aveperiods = [ap for scan in scans for ap in scan]
+    events = expand_events(scans, num_scans)
+    intt_ms = intt_ms or {}
+
+    # Parameters of each averaging period, with the parameter dimensions first
+    intts_ms = [
+        next((intt_ms[i] for i in ap["slice_ids"] if i in intt_ms), ap["intt_ms"])
+        for ap in aveperiods
+    ]
+    sequences_us = [
+        ap["sequence_us"] + np.asarray(sequence_overhead_us) for ap in aveperiods
+    ]
+    params = np.broadcast_arrays(
+        *intts_ms,
+        *sequences_us,
+        np.asarray(aveperiod_overhead_ms, dtype=np.float64),
+    )
+    num_aveperiods = len(aveperiods)
+    intt_s = np.stack(params[:num_aveperiods], axis=-1) * 1e-3
+    sequence_s = np.stack(params[num_aveperiods:-1], axis=-1) * 1e-6
+    overhead_s = params[-1] * 1e-3
+    intn = np.array([ap["intn"] for ap in aveperiods], dtype=np.float64)
+
+    index = events["aveperiod"]
+    result = simulate(
+        sequence_s[..., index],
+        intt_s[..., index],
+        intn[index],
+        events,
+        overhead_s,
+        truncate_at_scanbound,
+    )
+    total_s = (
+        result["start_s"][..., -1]
+        + result["duration_s"][..., -1]
+        + overhead_s
+        - result["start_s"][..., 0]
+    )
+    late = result["late_s"] > 1e-9
+
+    def summary(mask):
+        return {
+            "duty_cycle": (result["duration_s"] * mask).sum(axis=-1) / total_s,
+            "idle_s": (result["wait_s"] * mask).sum(axis=-1),
+            "num_overruns": (late & mask).sum(axis=-1),
+            "overrun_s": (result["late_s"] * mask).sum(axis=-1),
+            "num_aveperiods": np.broadcast_to(mask, late.shape).sum(axis=-1),
+        }
+
+    report = summary(np.ones(index.shape, dtype=bool))
+    report["total_s"] = total_s
+    # Average time from the start of one run through all scans to the next
+    run_starts = np.flatnonzero(events["run_start"])
+    report["cycle_s"] = total_s / num_scans
+    if run_starts.size > 1:
+        report["cycle_s"] = (
+            result["start_s"][..., run_starts[-1]] - result["start_s"][..., 0]
+        ) / (run_starts.size - 1)
+    report["slices"] = {}
+    for i, ap in enumerate(aveperiods):
+        for slice_id in ap["slice_ids"]:
+            report["slices"][slice_id] = summary(index == i)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Simulate the timing of an experiment's schedule."
+    )
+    parser.add_argument(
+        "experiment",
+        help="Experiment class as module.Class, relative to borealis_experiments, "
+        "e.g. normalsound.NormalSound",
+    )
+    parser.add_argument("--scans", type=int, default=10, help="Number of scan cycles")
+    parser.add_argument(
+        "--overhead-ms",
+        type=float,
+        nargs="+",
+        default=[DEFAULT_AVEPERIOD_OVERHEAD_MS],
+        help="Processing time after each averaging period, in ms. Several values are swept.",
+    )
+    parser.add_argument(
+        "--no-truncate",
+        action="store_true",
+        help="Let averaging periods run their full intt past the next scanbound",
+    )
+    parser.add_argument(
+        "--sequence-overhead-us",
+        type=float,
+        default=DEFAULT_SEQUENCE_OVERHEAD_US,
+        help="Dead time after each sequence, in us",
+    )
+    args = parser.parse_args()
+
+    module_name, class_name = args.experiment.rsplit(".", 1)
+    module = importlib.import_module(f"borealis_experiments.{module_name}")
+    experiment = getattr(module, class_name)()
+
+    overheads_ms = np.array(args.overhead_ms)
+    report = sweep(
+        experiment,
+        aveperiod_overhead_ms=overheads_ms,
+        sequence_overhead_us=args.sequence_overhead_us,
+        num_scans=args.scans,
+        truncate_at_scanbound=not args.no_truncate,
+    )
+    print(
+        f"{'overhead (ms)':>13} {'slice':>5} {'duty cycle':>10} {'idle (s)':>9} "
+        f"{'overruns':>8} {'overrun (s)':>11}"
+    )
+    for i, overhead_ms in enumerate(overheads_ms):
+        rows = [("all", report)] + sorted(report["slices"].items())
+        for name, stats in rows:
+            print(
+                f"{overhead_ms:>13g} {name:>5} {stats['duty_cycle'][i]:>10.3f} "
+                f"{stats['idle_s'][i]:>9.2f} {stats['num_overruns'][i]:>8} "
+                f"{stats['overrun_s'][i]:>11.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/python
+
+"""
+validation_runner
+~~~~~~~~~~~~~~~~~
+Runs the experiment validation cases in borealis_experiments.tests in parallel. Every class in
+tests/*.py that declares an error_message() classmethod is a case: building the experiment must
+raise the exception type it returns, with a message matching its regex.
+
+Cases are spread across a process pool. Each worker reads the site config once when it starts,
+instead of once per case, and the wall time of every case is reported so that slow validations
+stand out.
+
+Usage: python3 -m borealis_experiments.tools.validation_runner [-j N] [-k pattern] [--slowest N]
+
+:copyright: 2026 SuperDARN Canada
+"""
+
+import argparse
+import concurrent.futures
+import importlib
+import inspect
+import os
+import pkgutil
+import re
+import sys
+import time
+
+TESTS_PACKAGE = "borealis_experiments.tests"
+
+
+def discover_cases(package=TESTS_PACKAGE):
+    """
+    Finds every validation case in a package of test modules.
+
+    :param  package:    Name of the package to search
+
+    :returns: Tuple of (cases, errors). cases is a list of (module_name, class_name) for every
+              class defined in a module of the package with an error_message() method. errors is a
+              dictionary of {module_name: message} for modules that could not be imported.
+    """
+    package_path = importlib.import_module(package).__path__
+    cases = []
+    errors = {}
+    for module_info in sorted(pkgutil.iter_modules(package_path), key=lambda m: m.name):
+        module_name = f"{package}.{module_info.name}"
+        try:
+            module = importlib.import_module(module_name)
+        except Exception as e:
+            errors[module_name] = f"{type(e).__name__}: {e}"
+            continue
+        for class_name, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ == module_name and hasattr(cls, "error_message"):
+                cases.append((module_name, class_name))
+    return cases, errors
+
+
+def _init_worker():
+    """Reads the site config once per worker process, so that cases do not pay for it."""
+    import borealis_experiments.superdarn_common_fields as scf
+
+    scf.load_site()
+
+
+def run_case(case):
+    """
+    Builds the experiment of one validation case and checks the exception it raises.
+
+    :param  case:   Tuple of (module_name, class_name)
+
+    :returns: Dictionary with 'case', 'passed', 'seconds' and 'detail', a description of the
+              failure if the case did not pass
+    """
+    module_name, class_name = case
+    cls = getattr(importlib.import_module(module_name), class_name)
+    expected_exception, expected_regex = cls.error_message()
+
+    start = time.perf_counter()
+    raised = None
+    try:
+        experiment = cls()
+        # Checks that span slices, e.g. interfacing, are made when the scans are built
+        build_scans = getattr(experiment, "build_scans", None)
+        if build_scans is not None:
+            build_scans()
+    except Exception as e:
+        raised = e
+    seconds = time.perf_counter() - start
+
+    if raised is None:
+        detail = f"{expected_exception.__name__} not raised"
+    elif not isinstance(raised, expected_exception):
+        detail = f"raised {type(raised).__name__}: {raised}"
+    elif re.search(expected_regex, str(raised)) is None:
+        detail = f'"{expected_regex}" does not match "{raised}"'
+    else:
+        detail = None
+    return {
+        "case": case,
+        "passed": detail is None,
+        "seconds": seconds,
+        "detail": detail,
+    }
+
+
+def run_cases(cases, num_workers=None):
+    """
+    Runs validation cases across a process pool.
+
+    :param  cases:          List of (module_name, class_name)
+    :param  num_workers:    Number of worker processes. Defaults to the number of CPUs.
+
+    :returns: List of run_case() results, in the order of cases
+    """
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=num_workers, initializer=_init_worker
+    ) as executor:
+        return list(executor.map(run_case, cases, chunksize=4))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run the experiment validation cases in parallel."
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of worker processes",
+    )
+    parser.add_argument(
+        "-k", "--pattern", help="Only run cases whose module.class matches this regex"
+    )
+    parser.add_argument(
+        "--slowest", type=int, default=10, help="Number of slowest cases to list"
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    cases, errors = discover_cases()
+    if args.pattern is not None:
+        cases = [case for case in cases if re.search(args.pattern, ".".join(case))]
+    results = run_cases(cases, args.jobs)
+    wall_s = time.perf_counter() - start
+
+    failed = [result for result in results if not result["passed"]]
+    for result in failed:
+        print(f"FAIL {'.'.join(result['case'])}: {result['detail']}")
+    for module_name, message in errors.items():
+        print(f"ERROR {module_name}: {message}")
+
+    print(f"\nSlowest {min(args.slowest, len(results))} cases:")
+    for result in sorted(results, key=lambda r: r["seconds"], reverse=True)[
+        : args.slowest
+    ]:
+        print(f"{result['seconds'] * 1e3:>10.1f} ms  {'.'.join(result['case'])}")
+
+    total_s = sum(result["seconds"] for result in results)
+    print(
+        f"\n{len(results) - len(failed)} passed, {len(failed)} failed, {len(errors)} errors "
+        f"in {wall_s:.2f} s ({total_s:.2f} s of case time, {args.jobs} workers)"
+    )
+    sys.exit(1 if failed or errors else 0)
+
+
+if __name__ == "__main__":
+    main()
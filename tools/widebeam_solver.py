@@ -0,0 +1,260 @@
+#!/usr/bin/python
+
+"""
+widebeam_solver
+~~~~~~~~~~~~~~~
+Solves for the phase progression across a uniform linear array that produces a wide transmit
+beam of a given width, for any frequency in the 8-18 MHz band. This is used when the operating
+frequency is not one of the frequencies in the precomputed widebeam tables, e.g. after a clear
+frequency search.
+
+The phases are symmetric about the centre of the array, as in the precomputed tables. With
+symmetric phases the array factor is
+
+    AF(theta) = 2 * sum_h exp(j * phi_h) * cos(k * x_h * sin(theta))
+
+for the antennas h on one half of the array, so all frequencies and random restarts are fit at once
+with batched matrix products and Adam gradient descent. The loss is the variance of the power
+pattern inside the FOV plus the fraction of power radiated outside of it.
+
+Solutions are cached on disk per site, so each frequency is only solved once. A solve takes a
+fraction of a second, too long for the antenna pattern functions that Borealis calls on every
+frequency and beam change, so frequencies are solved ahead of time with the command line, and
+easy_widebeam() and sixty_deg_widebeam() only read the cache with stored_widebeam_phases().
+
+Usage: python3 -m borealis_experiments.tools.widebeam_solver site_id fov_width_deg freq_khz [...]
+
+:copyright: 2026 SuperDARN Canada
+"""
+
+import argparse
+
+import numpy as np
+
+from borealis_experiments.tools import cache
+
+SPEED_OF_LIGHT = 299792458.0  # m/s
+
+MIN_FREQ_KHZ = 8000
+MAX_FREQ_KHZ = 18000
+
+# Increment when the solver changes, so that stale cached solutions are not reused
+SOLVER_VERSION = 1
+
+
+def _array_factor_basis(frequencies_khz, num_antennas, antenna_spacing_m, azimuths):
+    """
+    Returns the cosine basis of a symmetric array, with shape [num_freqs, num_antennas // 2, num_azimuths]
+    """
+    half = num_antennas // 2
+    # x-positions of the antennas on one half of the array, relative to the array centre
+    x_m = (np.arange(half) - (num_antennas - 1) / 2) * antenna_spacing_m
+    wavenumbers = 2 * np.pi * np.asarray(frequencies_khz) * 1e3 / SPEED_OF_LIGHT
+    return np.cos(np.einsum("f,h,g->fhg", wavenumbers, x_m, np.sin(azimuths)))
+
+
+def _loss_and_gradient(phases, basis, in_fov, out_weight):
+    """
+    Computes the loss and its gradient with respect to phases for every frequency and restart.
+
+    :param  phases:     Half-array phases in radians, shape [num_freqs, num_restarts, num_antennas // 2]
+    :param  basis:      Output of _array_factor_basis()
+    :param  in_fov:     Boolean mask of the azimuths inside the FOV
+    :param  out_weight: Weight of the out-of-FOV power term relative to the flatness term
+    """
+    weights = np.exp(1j * phases)
+    array_factor = 2 * np.matmul(weights, basis)  # [freqs, restarts, azimuths]
+    power = array_factor.real**2 + array_factor.imag**2
+
+    num_in = np.count_nonzero(in_fov)
+    num_out = in_fov.size - num_in
+    mean_in = power[..., in_fov].mean(axis=-1, keepdims=True)
+    mean_out = power[..., ~in_fov].mean(axis=-1, keepdims=True)
+    ripple = power[..., in_fov] / mean_in - 1
+
+    loss = (ripple**2).mean(axis=-1) + out_weight * (mean_out / mean_in)[..., 0]
+
+    # d(loss)/d(power) for each azimuth
+    dloss_dpower = np.empty_like(power)
+    ripple_term = (ripple * (ripple + 1)).sum(axis=-1, keepdims=True)
+    dloss_dpower[..., in_fov] = 2 * ripple / (num_in * mean_in) - (
+        2 * ripple_term / (num_in**2 * mean_in)
+        + out_weight * mean_out / (num_in * mean_in**2)
+    )
+    dloss_dpower[..., ~in_fov] = out_weight / (num_out * mean_in)
+
+    # d(power)/d(phi_h) = -4 Im(conj(AF) * w_h * C_h)
+    projected = np.matmul(dloss_dpower * array_factor.conj(), basis.swapaxes(-1, -2))
+    gradient = -4 * np.imag(weights * projected)
+    return loss, gradient
+
+
+def solve_widebeam_phases(
+    frequencies_khz,
+    fov_width_deg,
+    num_antennas=16,
+    antenna_spacing_m=15.24,
+    num_restarts=16,
+    num_iterations=2000,
+    transition_deg=6.0,
+    out_weight=0.5,
+    seed=0,
+):
+    """
+    Solves for widebeam phases at all frequencies in one batch.
+
+    :param  frequencies_khz:    Frequencies to solve for, in kHz
+    :param  fov_width_deg:      Full width of the beam to illuminate, in degrees
+    :param  num_antennas:       Number of transmitting antennas. Must be even.
+    :param  antenna_spacing_m:  Spacing between adjacent antennas, in metres
+    :param  num_restarts:       Number of starting points to fit for each frequency
+    :param  num_iterations:     Number of gradient descent steps
+    :param  transition_deg:     Width of the region at each edge of the FOV that is excluded from the loss
+    :param  out_weight:         Weight of out-of-FOV power relative to in-FOV flatness
+    :param  seed:               Seed for the random starting points
+
+    :returns: Phases in degrees within [0, 360), shape [num_freqs, num_antennas]. The first antenna
+              always has phase 0.
+    """
+    frequencies_khz = np.atleast_1d(np.asarray(frequencies_khz, dtype=np.float64))
+    if frequencies_khz.ndim != 1:
+        raise ValueError("frequencies_khz must be a scalar or 1-dimensional")
+    out_of_band = (frequencies_khz < MIN_FREQ_KHZ) | (frequencies_khz > MAX_FREQ_KHZ)
+    if np.any(out_of_band):
+        raise ValueError(
+            f"Frequencies {frequencies_khz[out_of_band].tolist()} kHz are outside of the "
+            f"{MIN_FREQ_KHZ}-{MAX_FREQ_KHZ} kHz band supported by the widebeam solver"
+        )
+    if num_antennas % 2 != 0 or num_antennas < 2:
+        raise ValueError(
+            f"num_antennas must be even and positive. Given value: {num_antennas}"
+        )
+
+    half = num_antennas // 2
+    azimuths_deg = np.arange(-90.0, 90.25, 0.5)
+    edge_deg = fov_width_deg / 2
+    in_fov = np.abs(azimuths_deg) <= edge_deg - transition_deg / 2
+    scored = in_fov | (np.abs(azimuths_deg) >= edge_deg + transition_deg / 2)
+    basis = _array_factor_basis(
+        frequencies_khz, num_antennas, antenna_spacing_m, np.deg2rad(azimuths_deg)
+    )[..., scored]
+    in_fov = in_fov[scored]
+
+    # Start from random phases, plus a quadratic phase progression which defocuses the array so
+    # that the edge antennas steer to the edge of the FOV.
+    rng = np.random.default_rng(seed)
+    num_freqs = frequencies_khz.size
+    phases = rng.uniform(0, 2 * np.pi, size=(num_freqs, num_restarts, half))
+    x_m = (np.arange(half) - (num_antennas - 1) / 2) * antenna_spacing_m
+    wavenumbers = 2 * np.pi * frequencies_khz * 1e3 / SPEED_OF_LIGHT
+    curvature = wavenumbers * np.sin(np.deg2rad(edge_deg)) / (2 * np.abs(x_m[0]))
+    phases[:, 0, :] = np.outer(curvature, x_m**2)
+
+    # Adam gradient descent, on every frequency and restart at once
+    learning_rate, beta1, beta2, epsilon = 0.05, 0.9, 0.999, 1e-8
+    first_moment = np.zeros_like(phases)
+    second_moment = np.zeros_like(phases)
+    for step in range(1, num_iterations + 1):
+        _, gradient = _loss_and_gradient(phases, basis, in_fov, out_weight)
+        first_moment = beta1 * first_moment + (1 - beta1) * gradient
+        second_moment = beta2 * second_moment + (1 - beta2) * gradient**2
+        phases -= (
+            learning_rate
+            * (first_moment / (1 - beta1**step))
+            / (np.sqrt(second_moment / (1 - beta2**step)) + epsilon)
+        )
+
+    loss, _ = _loss_and_gradient(phases, basis, in_fov, out_weight)
+    best = phases[np.arange(num_freqs), np.argmin(loss, axis=1)]
+    full = np.concatenate((best, best[:, ::-1]), axis=1)
+    return np.rad2deg(np.mod(full - full[:, :1], 2 * np.pi))
+
+
+def _cache_path(fov_width_deg, site_id, num_antennas, antenna_spacing_m):
+    """Returns the parameters and path of the on-disk cache of a site and array."""
+    params = {
+        "site_id": site_id,
+        "fov_width_deg": round(float(fov_width_deg), 6),
+        "num_antennas": int(num_antennas),
+        "antenna_spacing_m": round(float(antenna_spacing_m), 6),
+        "version": SOLVER_VERSION,
+    }
+    path = f"{cache.cache_dir('widebeam')}/{site_id}_{cache.content_key(params)}.json"
+    return params, path
+
+
+def cached_widebeam_phases(
+    frequencies_khz, fov_width_deg, site_id, num_antennas=16, antenna_spacing_m=15.24
+):
+    """
+    Returns widebeam phases in degrees for each frequency, solving only for frequencies that are
+    not already in the on-disk cache for this site. All missing frequencies are solved in one batch.
+
+    :param  frequencies_khz:    Frequencies in kHz
+    :param  fov_width_deg:      Full width of the beam to illuminate, in degrees
+    :param  site_id:            Three-letter site code that the cache is kept for
+    :param  num_antennas:       Number of transmitting antennas
+    :param  antenna_spacing_m:  Spacing between adjacent antennas, in metres
+
+    :returns: Phases in degrees, shape [num_freqs, num_antennas]
+    """
+    frequencies_khz = np.atleast_1d(frequencies_khz)
+    params, path = _cache_path(fov_width_deg, site_id, num_antennas, antenna_spacing_m)
+    contents = cache.load_json(path, default={"params": params, "phases": {}})
+
+    keys = [f"{float(freq):g}" for freq in frequencies_khz]
+    missing = sorted({key for key in keys if key not in contents["phases"]}, key=float)
+    if missing:
+        solved = solve_widebeam_phases(
+            [float(key) for key in missing],
+            fov_width_deg,
+            num_antennas=num_antennas,
+            antenna_spacing_m=antenna_spacing_m,
+        )
+        # Re-read in case another process has added frequencies in the meantime
+        contents = cache.load_json(path, default=contents)
+        contents["phases"].update(
+            {key: phases.tolist() for key, phases in zip(missing, solved)}
+        )
+        cache.write_json(path, contents)
+
+    return np.array([contents["phases"][key] for key in keys])
+
+
+def stored_widebeam_phases(
+    frequency_khz, fov_width_deg, site_id, num_antennas=16, antenna_spacing_m=15.24
+):
+    """
+    Returns the widebeam phases in degrees of one frequency from the on-disk cache, or None if
+    they have not been solved yet. Never solves, so it is safe to call from antenna pattern
+    functions, which Borealis calls for every frequency and beam change. Solve ahead of time with
+    the command line, or cached_widebeam_phases().
+    """
+    try:
+        _, path = _cache_path(fov_width_deg, site_id, num_antennas, antenna_spacing_m)
+    except OSError:
+        return None
+    phases = cache.load_json(path, default={"phases": {}})["phases"]
+    stored = phases.get(f"{float(frequency_khz):g}")
+    return None if stored is None else np.array(stored)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Solve widebeam phases and add them to the on-disk cache."
+    )
+    parser.add_argument("site_id", help="Three-letter site code, e.g. sas")
+    parser.add_argument("fov_width_deg", type=float, help="Full width of the beam")
+    parser.add_argument("freqs_khz", type=float, nargs="+", help="Frequencies in kHz")
+    parser.add_argument("--num-antennas", type=int, default=16)
+    args = parser.parse_args()
+
+    phases = cached_widebeam_phases(
+        args.freqs_khz, args.fov_width_deg, args.site_id, args.num_antennas
+    )
+    for freq, row in zip(args.freqs_khz, phases):
+        print(f"{freq:g}: {np.round(row, 2).tolist()}")
+
+
+if __name__ == "__main__":
+    main()